@@ -0,0 +1,77 @@
+import re
+import time
+from contextlib import contextmanager
+from functools import cached_property
+from metrics import STAGE_SECONDS
+from readability import text_statistics
+
+SENTENCE_BOUNDARY = re.compile(r"[.!?]")
+
+
+class AnalysisContext:
+    """
+    Per-request view of one resume text shared by every analyzer.
+    Derived forms (lowercased text, sentence spans, readability counts, keyword hits, spaCy Doc,
+    TF-IDF vector) are computed on first access and memoized, and time spent in each stage is recorded.
+    """
+
+    def __init__(self, text, nlp=None, vectorizer=None, matcher=None, word_boundary=False):
+        self.text = text
+        self.nlp = nlp
+        self.vectorizer = vectorizer
+        self.matcher = matcher
+        self.word_boundary = word_boundary
+        self.timings = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Accumulate wall time (ms) spent inside the block under `name` and report it to STAGE_SECONDS."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed * 1000
+            STAGE_SECONDS.observe(elapsed, stage=name)
+
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def sentence_spans(self):
+        """(start, end) offsets of the segments between sentence punctuation."""
+        spans = []
+        start = 0
+        for m in SENTENCE_BOUNDARY.finditer(self.text):
+            spans.append((start, m.start()))
+            start = m.end()
+        spans.append((start, len(self.text)))
+        return spans
+
+    @cached_property
+    def text_stats(self):
+        """Word, sentence and syllable counts behind the readability scores."""
+        with self.stage('readability_counts'):
+            return text_statistics(self.text)
+
+    @cached_property
+    def keyword_hits(self):
+        if self.matcher is None:
+            raise RuntimeError("AnalysisContext has no keyword matcher")
+        with self.stage('keyword_scan'):
+            return self.matcher.scan(self.lower, word_boundary=self.word_boundary)
+
+    @cached_property
+    def doc(self):
+        if self.nlp is None:
+            raise RuntimeError("spaCy model not loaded. Run: python -m spacy download en_core_web_sm")
+        with self.stage('spacy_parse'):
+            return self.nlp(self.text)
+
+    @cached_property
+    def tfidf(self):
+        if self.vectorizer is None:
+            raise RuntimeError("AnalysisContext has no TF-IDF vectorizer")
+        with self.stage('tfidf_transform'):
+            return self.vectorizer.transform([self.text])
@@ -0,0 +1,104 @@
+import os
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.metrics.pairwise import cosine_similarity
+from utils import (
+    ANALYSIS_CACHE, NLP_ENGINE, analysis_cache_key, build_analysis_context, build_resume_report,
+    category_skill_match, extract_keyword_entities, extract_named_entities,
+)
+
+# Worker processes for the per-resume analyzers (keyword scan, timeline, readability, ...)
+BATCH_WORKERS = int(os.environ.get('RESUME_ANALYZER_BATCH_WORKERS', os.cpu_count() or 1))
+# Upper bound on spaCy processes; small batches stay in-process to avoid start-up cost
+SPACY_PROCESSES = int(os.environ.get('RESUME_ANALYZER_SPACY_PROCESSES', os.cpu_count() or 1))
+SPACY_DOCS_PER_PROCESS = 32
+SPACY_BATCH_SIZE = 16
+
+_executor = None
+
+
+def get_batch_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=BATCH_WORKERS)
+    return _executor
+
+
+def score_batch(model, texts, category):
+    """
+    Vectorize every resume once and score them all against the category profile.
+    Args:
+        model: ResumeBenchmarkModel
+        texts: List of resume texts
+        category: Target category
+    Returns:
+        list: Cosine similarity per resume (0.0 for unknown categories)
+    """
+    cat_vec = model.category_profiles.get(category)
+    if cat_vec is None or not texts:
+        return [0.0] * len(texts)
+    tfidf = model.vectorizer.transform(texts)
+    return cosine_similarity(tfidf, cat_vec)[:, 0].tolist()
+
+
+def parse_batch(texts):
+    """
+    Run spaCy NER over the batch with nlp.pipe, fanning out to several processes for large batches.
+    Returns:
+        list: extract_named_entities result per resume
+    """
+    n_process = max(1, min(SPACY_PROCESSES, len(texts) // SPACY_DOCS_PER_PROCESS))
+    docs = NLP_ENGINE.pipe(texts, n_process=n_process, batch_size=SPACY_BATCH_SIZE)
+    return [extract_named_entities(doc) for doc in docs]
+
+
+def analyze_prepared_resume(text, category, similarity, top_skills, named_entities):
+    """
+    Process-pool task: finish one resume's analysis from the batch-computed model parts.
+    """
+    ctx = build_analysis_context(text)
+    comparison = {"similarity": similarity, **category_skill_match(category, ctx)}
+    with ctx.stage('entities'):
+        entities = {**extract_keyword_entities(ctx), **named_entities}
+    return build_resume_report(ctx, category, comparison, top_skills, entities)
+
+
+async def analyze_batch(model, texts, category):
+    """
+    Analyze many resumes against one category, yielding (index, report) as each one completes.
+    TF-IDF scoring and spaCy parsing are batched in a worker thread; the remaining analyzers
+    run on the process pool so throughput scales with the number of cores.
+    """
+    # Previously analyzed resumes are answered from the result cache straight away
+    keys = [analysis_cache_key(text, category, model) for text in texts]
+    pending = []
+    for i, key in enumerate(keys):
+        cached = ANALYSIS_CACHE.get(key)
+        if cached is None:
+            pending.append(i)
+        else:
+            yield i, {**cached, "stage_timings_ms": {}}
+    if not pending:
+        return
+    pending_texts = [texts[i] for i in pending]
+
+    loop = asyncio.get_running_loop()
+    similarities = await loop.run_in_executor(None, score_batch, model, pending_texts, category)
+    top_skills = await loop.run_in_executor(None, model.get_category_skills, category)
+    named_entities = await loop.run_in_executor(None, parse_batch, pending_texts)
+
+    executor = get_batch_executor()
+
+    async def run(j):
+        i = pending[j]
+        try:
+            report = await loop.run_in_executor(
+                executor, analyze_prepared_resume, texts[i], category, similarities[j], top_skills, named_entities[j]
+            )
+            ANALYSIS_CACHE.set(keys[i], report)
+        except Exception as e:
+            report = {"error": str(e)}
+        return i, report
+
+    for next_done in asyncio.as_completed([run(j) for j in range(len(pending))]):
+        yield await next_done
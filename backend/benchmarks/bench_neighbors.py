@@ -0,0 +1,112 @@
+"""
+Recall vs. latency of the /similar_resumes/ index: exact blocked scan vs. random-projection LSH.
+
+The dataset has under a thousand resumes, so a large corpus is synthesized in vector space: each
+synthetic resume mixes the term vectors of two real resumes and drops a random share of the terms.
+Queries are synthesized the same way and are not part of the corpus. Recall@k is measured against
+the exact top k. Run from the backend directory:
+    python -m benchmarks.bench_neighbors --scale 100000 --lsh 8x12,16x12,16x14 --probes 0,2,4
+    python -m benchmarks.bench_neighbors --vectors hashing --svd 128
+"""
+import time
+import argparse
+import statistics
+import numpy as np
+import pandas as pd
+from scipy.sparse import diags
+from sklearn.preprocessing import normalize
+from utils import DATASET_PATH, TFIDF_PARAMS, get_benchmark_model
+from neighbors import HASHING_FEATURES, NeighborIndex, RandomProjectionLSH, ResumeEncoder
+
+# Share of a synthetic resume's terms that are dropped
+TERM_DROPOUT = 0.3
+
+
+def synthesize(base, base_codes, n, rng):
+    """n synthetic rows, each a random mix of two base rows with TERM_DROPOUT of its terms removed."""
+    first, second = rng.integers(0, base.shape[0], n), rng.integers(0, base.shape[0], n)
+    weight = rng.uniform(0.5, 1.0, n)
+    rows = diags(weight) @ base[first] + diags(1 - weight) @ base[second]
+    rows = rows.tocsr()
+    rows.data *= rng.random(rows.nnz) >= TERM_DROPOUT
+    rows.eliminate_zeros()
+    return normalize(rows), base_codes[first]
+
+
+def time_queries(index, queries, top_k, probes):
+    durations, results, scored = [], [], []
+    for i in range(queries.shape[0]):
+        start = time.perf_counter()
+        ids, _, n_scored = index.query(queries[i:i + 1], top_k, probes=probes)
+        durations.append((time.perf_counter() - start) * 1000)
+        results.append(ids)
+        scored.append(n_scored)
+    return durations, results, scored
+
+
+def recall(results, truth, top_k):
+    return statistics.mean(len(np.intersect1d(r, t[:top_k])) / min(top_k, len(t)) for r, t in zip(results, truth))
+
+
+def report(name, durations, results, scored, truth, top_k, build_ms=None):
+    ordered = sorted(durations)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    build = f"{build_ms:9.0f}" if build_ms is not None else f"{'-':>9}"
+    print(f"{name:<18} {build} {statistics.mean(durations):9.3f} {p95:9.3f} {statistics.mean(scored):10.0f}"
+          f" {recall(results, truth, top_k):9.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=100000, help='synthetic corpus size')
+    parser.add_argument('--queries', type=int, default=200, help='number of timed queries')
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--vectors', choices=['tfidf', 'hashing'], default='tfidf')
+    parser.add_argument('--svd', type=int, default=0, help='TruncatedSVD components (0: sparse vectors)')
+    parser.add_argument('--lsh', default='8x12,16x12,16x14,32x14', help='comma-separated TABLESxBITS configs')
+    parser.add_argument('--probes', default='0,2,4', help='comma-separated extra buckets probed per table')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    model = get_benchmark_model()
+    df = pd.read_csv(DATASET_PATH).drop_duplicates('Resume')
+    settings = {"vectors": args.vectors, "svd_components": args.svd, "method": 'exact', "seed": args.seed,
+                "n_features": HASHING_FEATURES, "stop_words": TFIDF_PARAMS.get('stop_words'),
+                "ngram_range": list(TFIDF_PARAMS.get('ngram_range', (1, 1)))}
+    encoder = ResumeEncoder.create(settings, model.vectorizer)
+    base = encoder.vectorizer.transform(df['Resume'].astype(str).tolist())
+    categories = list(dict.fromkeys(df['Category']))
+    base_codes = np.asarray([categories.index(c) for c in df['Category']], dtype=np.int16)
+
+    start = time.perf_counter()
+    term_vectors, doc_categories = synthesize(base, base_codes, args.scale, rng)
+    query_terms, _ = synthesize(base, base_codes, args.queries, rng)
+    if args.svd:
+        encoder.fit_svd(term_vectors, args.svd, args.seed)
+    vectors, queries = encoder.project(term_vectors), encoder.project(query_terms)
+    kind = f"dense {vectors.shape[1]}-d" if args.svd else f"sparse {vectors.shape[1]}-d, {vectors.nnz / vectors.shape[0]:.0f} nnz/row"
+    print(f"{args.scale} synthetic resumes from {base.shape[0]} distinct ones ({args.vectors}, {kind}),"
+          f" built in {(time.perf_counter() - start) * 1000:.0f} ms; {args.queries} queries, top {args.top_k}")
+
+    index = NeighborIndex(settings, encoder, vectors, doc_categories, categories)
+    # Ground truth from the batched exact scan (blocked matrix-matrix products)
+    start = time.perf_counter()
+    truth = np.vstack([index.exact(queries[i:i + 64], args.top_k)[0] for i in range(0, args.queries, 64)])
+    batched_ms = (time.perf_counter() - start) * 1000
+    print(f"batched exact scan: {batched_ms / args.queries:.3f} ms per query\n")
+
+    print(f"{'index':<18} {'build ms':>9} {'mean ms':>9} {'p95 ms':>9} {'scored':>10} {'recall':>9}")
+    report('exact', *time_queries(index, queries, args.top_k, 0), truth, args.top_k)
+    for config in args.lsh.split(','):
+        tables, bits = (int(v) for v in config.lower().split('x'))
+        start = time.perf_counter()
+        index.lsh = RandomProjectionLSH.build(vectors, tables, bits, args.seed)
+        build_ms = (time.perf_counter() - start) * 1000
+        for probes in (int(p) for p in args.probes.split(',')):
+            report(f"lsh {tables}x{bits} +{probes}", *time_queries(index, queries, args.top_k, probes), truth,
+                   args.top_k, build_ms)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Parity check and microbenchmark: single-pass readability/ATS analyzer vs. the textstat-based original.
+
+Every distinct dataset resume is analyzed by both implementations; the full reports (Flesch scores included)
+must be identical. Run from the backend directory:
+    python -m benchmarks.bench_readability --limit 500
+Exits with status 1 if any report differs.
+
+Without the NLTK cmudict corpus, textstat tries to download it on every call and the original
+analyzer reports no scores; the new engine falls back to pyphen for every word, so in that case
+textstat is run in the same pyphen-only mode and the parity check covers that path.
+"""
+import sys
+import time
+import argparse
+import statistics
+import pandas as pd
+import nltk
+import textstat
+from textstat.backend.counts import _count_syllables
+from utils import (DATASET_PATH, BUZZWORDS, SECTION_HEADERS, KEYWORD_MATCHER, PASSIVE_VOICE_PATTERN,
+                   analyze_readability_ats, build_analysis_context, curated_category_skills)
+
+
+def legacy_analyze_readability_ats(text, curated_skills, ctx):
+    """The implementation this analyzer replaced, kept verbatim as the reference."""
+    hits = ctx.keyword_hits
+    report = {}
+    try:
+        report['flesch_reading_ease'] = textstat.flesch_reading_ease(text)
+        report['flesch_kincaid_grade'] = textstat.flesch_kincaid_grade(text)
+    except Exception as e:
+        report['flesch_reading_ease'] = None
+        report['flesch_kincaid_grade'] = None
+        report['readability_error'] = str(e)
+    buzzword_counts = {bw: hits.count(bw) for bw in BUZZWORDS if bw in hits}
+    report['buzzword_counts'] = buzzword_counts
+    report['buzzword_flag'] = any(count > 2 for count in buzzword_counts.values())
+    passive_phrases = []
+    for sent in (ctx.text[start:end] for start, end in ctx.sentence_spans):
+        if PASSIVE_VOICE_PATTERN.search(sent):
+            passive_phrases.append(sent.strip())
+    report['passive_voice_count'] = len(passive_phrases)
+    report['passive_voice_examples'] = passive_phrases[:3]
+    found_headers = [h for h in SECTION_HEADERS if h in hits]
+    report['section_headers_found'] = found_headers
+    report['section_headers_missing'] = [h for h in SECTION_HEADERS if h not in found_headers]
+    if curated_skills:
+        keyword_freq = {
+            k: hits.count(k.lower()) if k.lower() in KEYWORD_MATCHER else ctx.lower.count(k.lower())
+            for k in curated_skills
+        }
+        report['ats_keyword_frequency'] = keyword_freq
+        report['ats_missing_keywords'] = [k for k, v in keyword_freq.items() if v == 0]
+    else:
+        report['ats_keyword_frequency'] = {}
+        report['ats_missing_keywords'] = []
+    return report
+
+
+def single_pass_analyze_readability_ats(text, curated_skills, ctx):
+    return analyze_readability_ats(text, None, curated_skills, ctx=ctx)
+
+
+def syllable_source():
+    try:
+        nltk.data.find('corpora/cmudict')
+        return 'cmudict'
+    except LookupError:
+        # Same fallback as the new engine: every word is hyphenated by pyphen
+        _count_syllables.get_cmudict = lambda lang: None
+        return 'pyphen'
+
+
+def time_calls(fn, workload):
+    durations = []
+    results = []
+    for text, skills in workload:
+        # Fresh contexts so neither side reuses the other's derived forms (the keyword scan is warmed
+        # up front, since both implementations read the same hits)
+        ctx = build_analysis_context(text)
+        ctx.keyword_hits
+        start = time.perf_counter()
+        results.append(fn(text, skills, ctx))
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations, results
+
+
+def summarize(name, durations):
+    ordered = sorted(durations)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{name:<8} total {sum(durations):9.1f} ms | mean {statistics.mean(durations):7.3f} ms"
+          f" | p50 {statistics.median(durations):7.3f} ms | p95 {p95:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--limit', type=int, default=500, help='number of resumes from the dataset')
+    args = parser.parse_args()
+
+    # textstat memoizes whole texts, so duplicate resumes would time its cache rather than its engine
+    df = pd.read_csv(DATASET_PATH).drop_duplicates('Resume').head(args.limit)
+    workload = [(text, curated_category_skills(category))
+                for text, category in zip(df['Resume'].astype(str), df['Category'])]
+    print(f"{len(workload)} resumes, syllables from {syllable_source()}")
+
+    legacy_ms, legacy_reports = time_calls(legacy_analyze_readability_ats, workload)
+    # Cold: first pass fills the syllable cache; warm: repeat traffic
+    cold_ms, reports = time_calls(single_pass_analyze_readability_ats, workload)
+    warm_ms, _ = time_calls(single_pass_analyze_readability_ats, workload)
+    summarize('legacy', legacy_ms)
+    summarize('cold', cold_ms)
+    summarize('warm', warm_ms)
+    print(f"speedup: {sum(legacy_ms) / max(sum(cold_ms), 1e-9):.1f}x cold, "
+          f"{sum(legacy_ms) / max(sum(warm_ms), 1e-9):.1f}x warm")
+
+    mismatches = [i for i, (a, b) in enumerate(zip(legacy_reports, reports)) if a != b]
+    print(f"identical reports for {len(workload) - len(mismatches)}/{len(workload)} resumes")
+    for i in mismatches[:5]:
+        diff = {k: (legacy_reports[i].get(k), reports[i].get(k))
+                for k in set(legacy_reports[i]) | set(reports[i]) if legacy_reports[i].get(k) != reports[i].get(k)}
+        print(f"  resume {i}: {diff}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
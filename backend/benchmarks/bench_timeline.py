@@ -0,0 +1,113 @@
+"""
+Microbenchmark: fast timeline engine vs. the original dateparser-only implementation.
+
+Run from the backend directory:
+    python -m benchmarks.bench_timeline --limit 200
+"""
+import re
+import time
+import argparse
+import statistics
+import pandas as pd
+import dateparser
+from utils import DATASET_PATH, NLP_ENGINE
+from timeline import check_timeline_consistency
+
+# Used when the spaCy model is not installed: pull date-like spans straight out of the text
+DATE_CANDIDATE = re.compile(
+    r"(?i)\b(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*[\s.,'-]*\d{2,4}"
+    r"|\d{1,2}/\d{4}|(?:19|20)\d{2})"
+    r"(?:\s*(?:-|–|—|to|till)\s*(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*[\s.,'-]*\d{2,4}"
+    r"|\d{1,2}/\d{4}|(?:19|20)\d{2}|present|current|till date|date))?"
+)
+
+
+def legacy_check_timeline_consistency(dates, gap_threshold_months=6):
+    """The implementation this engine replaced, kept verbatim as the reference."""
+    parsed = []
+    for d in dates:
+        if '-' in d and len(d.split('-')) == 2:
+            start, end = d.split('-')
+            start_dt = dateparser.parse(start.strip())
+            end_dt = dateparser.parse(end.strip())
+            if start_dt and end_dt:
+                parsed.append((start_dt, end_dt, d))
+        else:
+            dt = dateparser.parse(d)
+            if dt:
+                parsed.append((dt, dt, d))
+    parsed = sorted(parsed, key=lambda x: x[0])
+    issues = []
+    gaps = []
+    overlaps = []
+    for i in range(1, len(parsed)):
+        prev_end = parsed[i-1][1]
+        curr_start = parsed[i][0]
+        gap_months = (curr_start.year - prev_end.year) * 12 + (curr_start.month - prev_end.month)
+        if gap_months > gap_threshold_months:
+            gaps.append({'between': (parsed[i-1][2], parsed[i][2]), 'gap_months': gap_months})
+            issues.append(f"Gap of {gap_months} months between '{parsed[i-1][2]}' and '{parsed[i][2]}'")
+        if curr_start < prev_end:
+            overlaps.append({'between': (parsed[i-1][2], parsed[i][2]), 'overlap': (prev_end - curr_start).days})
+            issues.append(f"Overlap between '{parsed[i-1][2]}' and '{parsed[i][2]}'")
+    return {
+        'gaps': gaps,
+        'overlaps': overlaps,
+        'parsed_dates': [(str(s), str(e), label) for s, e, label in parsed],
+        'issues': issues
+    }
+
+
+def load_workload(limit):
+    """DATE strings per resume from the dataset (spaCy NER when available, regex spans otherwise)."""
+    resumes = pd.read_csv(DATASET_PATH)['Resume'].astype(str).tolist()[:limit]
+    if NLP_ENGINE.available:
+        return 'spacy', [[e.text for e in doc.ents if e.label_ == 'DATE'] for doc in NLP_ENGINE.pipe(resumes)]
+    return 'regex', [DATE_CANDIDATE.findall(text) for text in resumes]
+
+
+def time_calls(fn, workload):
+    durations = []
+    results = []
+    for dates in workload:
+        start = time.perf_counter()
+        results.append(fn(dates))
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations, results
+
+
+def summarize(name, durations):
+    ordered = sorted(durations)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{name:<8} total {sum(durations):9.1f} ms | mean {statistics.mean(durations):7.3f} ms"
+          f" | p50 {statistics.median(durations):7.3f} ms | p95 {p95:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--limit', type=int, default=200, help='number of resumes from the dataset')
+    args = parser.parse_args()
+
+    source, workload = load_workload(args.limit)
+    n_dates = sum(len(d) for d in workload)
+    print(f"{len(workload)} resumes, {n_dates} date strings ({source} extraction)")
+
+    legacy_ms, legacy_results = time_calls(legacy_check_timeline_consistency, workload)
+    # Cold: first pass populates the fragment memo; warm: repeat traffic
+    cold_ms, fast_results = time_calls(check_timeline_consistency, workload)
+    warm_ms, _ = time_calls(check_timeline_consistency, workload)
+    summarize('legacy', legacy_ms)
+    summarize('cold', cold_ms)
+    summarize('warm', warm_ms)
+    print(f"speedup: {sum(legacy_ms) / max(sum(cold_ms), 1e-9):.1f}x cold, "
+          f"{sum(legacy_ms) / max(sum(warm_ms), 1e-9):.1f}x warm")
+
+    legacy_parsed = sum(len(r['parsed_dates']) for r in legacy_results)
+    fast_parsed = sum(len(r['parsed_dates']) for r in fast_results)
+    identical = sum(a == b for a, b in zip(legacy_results, fast_results))
+    print(f"parsed dates: legacy {legacy_parsed}, fast {fast_parsed}; "
+          f"identical reports for {identical}/{len(workload)} resumes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Microbenchmark: sparse word-frequency engine vs. the per-endpoint join/findall/Counter code it replaced.
+
+Run from the backend directory:
+    python -m benchmarks.bench_word_frequency --scale 10
+"""
+import re
+import time
+import argparse
+from collections import Counter
+import pandas as pd
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from utils import DATASET_PATH
+from word_frequency import TermFrequencyMatrix
+
+
+def legacy_word_frequencies(df):
+    """The original EDA code paths: corpus top 20, top 20 per category, heatmap counts for the top 5 categories."""
+    def content_counter(texts):
+        words = re.findall(r"\b\w+\b", " ".join(texts).lower())
+        return Counter(w for w in words if w not in ENGLISH_STOP_WORDS and len(w) > 2)
+
+    resumes = df['Resume'].astype(str)
+    corpus = content_counter(resumes.tolist())
+    per_category = {cat: content_counter(resumes[df['Category'] == cat].tolist()).most_common(20)
+                    for cat in df['Category'].unique()}
+    heatmap_words = [w for w, _ in corpus.most_common(10)]
+    heatmap = [[content_counter(resumes[df['Category'] == cat].tolist()).get(w, 0) for w in heatmap_words]
+               for cat in df['Category'].value_counts().index[:5]]
+    return corpus.most_common(20), per_category, heatmap
+
+
+def engine_word_frequencies(df):
+    matrix = TermFrequencyMatrix()
+    for category, resume in zip(df['Category'], df['Resume'].astype(str)):
+        matrix.add_document(resume.lower(), category)
+    per_category = {cat: matrix.top_k(20, cat) for cat in df['Category'].unique()}
+    heatmap_words = [w for w, _ in matrix.top_k(10)]
+    heatmap = [matrix.counts_of(heatmap_words, cat) for cat in df['Category'].value_counts().index[:5]]
+    return matrix.top_k(20), per_category, heatmap
+
+
+def timed(fn, df):
+    start = time.perf_counter()
+    result = fn(df)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=1, help='replicate the dataset this many times')
+    args = parser.parse_args()
+
+    df = pd.read_csv(DATASET_PATH)
+    df = pd.concat([df] * args.scale, ignore_index=True)
+    print(f"{len(df)} resumes")
+    legacy_ms, legacy = timed(legacy_word_frequencies, df)
+    engine_ms, engine = timed(engine_word_frequencies, df)
+    print(f"legacy {legacy_ms:9.1f} ms")
+    print(f"engine {engine_ms:9.1f} ms")
+    print(f"speedup: {legacy_ms / max(engine_ms, 1e-9):.1f}x; identical output: {legacy == engine}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Memory and startup time of the multi-worker launch modes:
+    preload  gunicorn -c gunicorn.conf.py main:app (warm-up in the master, workers forked afterwards)
+    uvicorn  uvicorn main:app --workers N (every worker imports the app and warms up on its own)
+
+Each server is started on a free local port and polled on /readyz until N distinct workers report ready.
+After some traffic, per-process memory is read from /proc/<pid>/smaps_rollup: RSS counts shared pages in
+full in every process, PSS splits them between their sharers (so the PSS sum is the real footprint), and
+private memory is what a process holds alone. Linux only. Run from the backend directory:
+    python -m benchmarks.bench_workers --workers 4 --requests 200
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import subprocess
+import urllib.error
+import urllib.request
+import pandas as pd
+from utils import DATASET_PATH
+
+SMAPS_FIELDS = ('Rss', 'Pss', 'Private_Clean', 'Private_Dirty')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def launch_command(mode, port, workers):
+    if mode == 'preload':
+        return [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'main:app'], {
+            'RESUME_ANALYZER_BIND': f'127.0.0.1:{port}', 'RESUME_ANALYZER_WORKERS': str(workers)}
+    return [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1', '--port', str(port),
+            '--workers', str(workers)], {}
+
+
+def get_json(url, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b'null')
+
+
+def wait_until_ready(base_url, workers, timeout):
+    """Poll /readyz on fresh connections until `workers` distinct pids answered 200; returns (pids, seconds)."""
+    start = time.perf_counter()
+    ready = set()
+    while time.perf_counter() - start < timeout:
+        try:
+            status, body = get_json(f"{base_url}/readyz")
+            if status == 200:
+                ready.add(body['pid'])
+                if len(ready) >= workers:
+                    return sorted(ready), time.perf_counter() - start
+        except (OSError, ValueError):
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{len(ready)}/{workers} workers ready after {timeout}s")
+
+
+def send_traffic(base_url, texts, n_requests):
+    for i in range(n_requests):
+        text = texts[i % len(texts)]
+        get_json(f"{base_url}/rank_categories/", {'text': text})
+        get_json(f"{base_url}/similar_resumes/", {'text': text, 'top_k': 5})
+        get_json(f"{base_url}/search_resumes/", {'query': 'python AND sql'})
+
+
+def memory_mb(pid):
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(':')
+            if name in SMAPS_FIELDS:
+                values[name] = int(rest.split()[0]) / 1024
+    return {'rss': values['Rss'], 'pss': values['Pss'], 'private': values['Private_Clean'] + values['Private_Dirty']}
+
+
+def run(mode, workers, n_requests, texts, timeout):
+    port = free_port()
+    command, env = launch_command(mode, port, workers)
+    server = subprocess.Popen(command, env={**os.environ, **env}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        pids, ready_s = wait_until_ready(base_url, workers, timeout)
+        send_traffic(base_url, texts, n_requests)
+        rows = [('master', memory_mb(server.pid))] + [(f"worker {pid}", memory_mb(pid)) for pid in pids]
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+    print(f"\n{mode}: {workers} workers ready in {ready_s:.1f}s")
+    print(f"{'process':<16} {'RSS MB':>9} {'PSS MB':>9} {'private MB':>11}")
+    for name, mem in rows:
+        print(f"{name:<16} {mem['rss']:9.1f} {mem['pss']:9.1f} {mem['private']:11.1f}")
+    worker_rows = [mem for name, mem in rows if name != 'master']
+    print(f"{'worker mean':<16} {sum(m['rss'] for m in worker_rows) / len(worker_rows):9.1f}"
+          f" {sum(m['pss'] for m in worker_rows) / len(worker_rows):9.1f}"
+          f" {sum(m['private'] for m in worker_rows) / len(worker_rows):11.1f}")
+    print(f"{'total':<16} {sum(m['rss'] for _, m in rows):9.1f} {sum(m['pss'] for _, m in rows):9.1f}"
+          f" {sum(m['private'] for _, m in rows):11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=200, help='rounds of traffic before measuring')
+    parser.add_argument('--modes', default='preload,uvicorn')
+    parser.add_argument('--timeout', type=float, default=600, help='seconds to wait for readiness')
+    args = parser.parse_args()
+    texts = pd.read_csv(DATASET_PATH)['Resume'].astype(str).drop_duplicates().head(50).tolist()
+    for mode in args.modes.split(','):
+        run(mode, args.workers, args.requests, texts, args.timeout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+"""
+Benchmark suite: analyzer microbenchmarks, endpoint latency, batch throughput and peak memory,
+using resumes from the dataset as the workload and checked against a stored baseline.
+
+Run from the backend directory:
+    python -m benchmarks.suite                    # run, then compare with benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline    # run and store the results as the new baseline
+    python -m benchmarks.suite --only micro,batch --limit 50
+
+Exits with status 1 when any metric regresses by more than --threshold. Baselines are only
+comparable on the machine (and dependency set) that recorded them; regenerate after hardware changes.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from fastapi.testclient import TestClient
+from benchmarks.bench_timeline import DATE_CANDIDATE
+from batch import score_batch
+from timeline import check_timeline_consistency
+import utils
+from utils import (
+    DATASET_PATH, JD_REGISTRY, NLP_ENGINE, ResumeBenchmarkModel, analyze_readability_ats, build_analysis_context,
+    curated_category_skills, extract_resume_entities, get_benchmark_model, match_category_skills_semantic,
+    register_jd, scan_keywords,
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+SECTIONS = ('micro', 'endpoints', 'batch', 'memory')
+# Regressions smaller than this are treated as timer noise regardless of the relative change
+MIN_DELTA = {'ms': 0.05, 'MB': 1.0, 'items/s': 0.0}
+
+
+def load_workload(limit):
+    df = pd.read_csv(DATASET_PATH).sample(frac=1.0, random_state=0)
+    df = df.drop_duplicates('Resume').head(limit)
+    return list(zip(df['Resume'].astype(str), df['Category']))
+
+
+def clear_result_caches():
+    # Every measurement should do the real work, not replay a cached result
+    for cache in (utils.TEXT_CACHE, utils.ENTITY_CACHE, utils.ANALYSIS_CACHE):
+        cache.clear()
+
+
+def metric(value, unit, better='lower'):
+    return {"value": round(float(value), 4), "unit": unit, "better": better}
+
+
+def latency_metrics(name, durations_ms):
+    ordered = sorted(durations_ms)
+    return {
+        f"{name}.mean_ms": metric(statistics.mean(ordered), 'ms'),
+        f"{name}.p95_ms": metric(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 'ms'),
+    }
+
+
+def time_each(fn, items):
+    fn(items[0])  # warm-up: lazy imports and compiled patterns are not part of per-call latency
+    durations = []
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def bench_micro(workload, model, skipped):
+    results = {}
+    results.update(latency_metrics('compare_resume', time_each(lambda w: model.compare_resume(w[0], w[1]), workload)))
+    results.update(latency_metrics('scan_keywords', time_each(lambda w: scan_keywords(w[0]), workload)))
+    results.update(latency_metrics('analyze_readability_ats', time_each(
+        lambda w: analyze_readability_ats(w[0], category=w[1], curated_skills=curated_category_skills(w[1]),
+                                          ctx=build_analysis_context(w[0], model)),
+        workload,
+    )))
+    results.update(latency_metrics('match_category_skills_semantic', time_each(
+        lambda w: match_category_skills_semantic(w[1], w[0].lower()), workload)))
+    dates = [DATE_CANDIDATE.findall(text) for text, _ in workload]
+    results.update(latency_metrics('check_timeline_consistency', time_each(check_timeline_consistency, dates)))
+    if NLP_ENGINE.available:
+        clear_result_caches()
+        results.update(latency_metrics('extract_resume_entities', time_each(lambda w: extract_resume_entities(w[0]), workload)))
+    else:
+        skipped.append('extract_resume_entities (spaCy model not installed)')
+    index = model.resume_index
+    queries = ['python AND django NOT php', '"machine learning" OR "deep learning"', 'java AND (spring OR hibernate)']
+    results.update(latency_metrics('search_resumes', time_each(index.search, queries * 20)))
+    return results
+
+
+def bench_endpoints(workload, concurrency, n_requests, skipped):
+    import main
+    from serving import warm_up
+    # As a preloading server does before forking workers; the app answers 503 until this has run
+    warm_up()
+    client = TestClient(main.app)
+    texts = [text for text, _ in workload]
+    jd_id = register_jd(texts[0], title='benchmark')['id']
+    endpoints = {
+        'dataset_summary': lambda i: client.get('/dataset_summary/'),
+        'resume_length_histogram': lambda i: client.get('/resume_length_histogram/'),
+        'category_skill_frequency': lambda i: client.get('/category_skill_frequency/', params={'category': workload[i % len(workload)][1]}),
+        'skill_category_heatmap': lambda i: client.get('/skill_category_heatmap/'),
+        'rank_categories': lambda i: client.post('/rank_categories/', json={'text': texts[i % len(texts)]}),
+        'search_resumes': lambda i: client.post('/search_resumes/', json={'query': 'python AND sql'}),
+        'similar_resumes': lambda i: client.post('/similar_resumes/', json={'text': texts[i % len(texts)]}),
+        'match': lambda i: client.post('/match/', json={'jd_id': jd_id, 'text': texts[i % len(texts)]}),
+    }
+    if NLP_ENGINE.available:
+        endpoints['analyze_resume'] = lambda i: client.post(
+            '/analyze_resume/', json={'text': texts[i % len(texts)], 'category': workload[i % len(workload)][1]})
+    else:
+        skipped.append('endpoint analyze_resume (spaCy model not installed)')
+
+    results = {}
+    try:
+        for name, call in endpoints.items():
+            results.update(bench_endpoint(name, call, concurrency, n_requests))
+    finally:
+        JD_REGISTRY.remove(jd_id)
+    return results
+
+
+def bench_endpoint(name, call, concurrency, n_requests):
+    clear_result_caches()
+    call(0)  # warm-up: lazy loads and first-request costs are not part of steady-state latency
+
+    def timed(i):
+        start = time.perf_counter()
+        response = call(i)
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code >= 400:
+            raise RuntimeError(f"{name}: HTTP {response.status_code} {response.text[:200]}")
+        return elapsed
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        durations = list(pool.map(timed, range(n_requests)))
+    wall = time.perf_counter() - start
+    results = latency_metrics(f"endpoint.{name}", durations)
+    results[f"endpoint.{name}.throughput"] = metric(n_requests / wall, 'items/s', better='higher')
+    return results
+
+
+def bench_batch(workload, model):
+    texts = [text for text, _ in workload]
+    results = {}
+    start = time.perf_counter()
+    model.rank_categories(texts, top_k=5)
+    results['batch.rank_categories.throughput'] = metric(len(texts) / (time.perf_counter() - start), 'items/s', 'higher')
+    start = time.perf_counter()
+    score_batch(model, texts, workload[0][1])
+    results['batch.score_batch.throughput'] = metric(len(texts) / (time.perf_counter() - start), 'items/s', 'higher')
+    return results
+
+
+def peak_memory_mb(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def bench_memory(workload, model):
+    def analyze_workload():
+        for text, category in workload:
+            ctx = build_analysis_context(text, model)
+            model.compare_resume(text, category, ctx=ctx)
+            analyze_readability_ats(text, category=category, ctx=ctx)
+
+    results = {}
+    results['memory.analyze_workload.peak_mb'] = metric(peak_memory_mb(analyze_workload), 'MB')
+    cache_dir = tempfile.mkdtemp(prefix='bench-model-')
+    try:
+        start = time.perf_counter()
+        results['memory.cold_model_build.peak_mb'] = metric(
+            peak_memory_mb(lambda: ResumeBenchmarkModel(cache_dir=cache_dir)), 'MB')
+        results['cold_model_build_ms'] = metric((time.perf_counter() - start) * 1000, 'ms')
+        start = time.perf_counter()
+        ResumeBenchmarkModel(cache_dir=cache_dir)
+        results['warm_model_load_ms'] = metric((time.perf_counter() - start) * 1000, 'ms')
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return results
+
+
+def best_of(runs):
+    """Keep each metric's best value across repeated runs, which filters out scheduler noise."""
+    best = {}
+    for run in runs:
+        for name, m in run.items():
+            kept = best.get(name)
+            if kept is None or (m['value'] < kept['value'] if m['better'] == 'lower' else m['value'] > kept['value']):
+                best[name] = m
+    return best
+
+
+def compare(results, baseline, threshold):
+    """
+    Print each metric next to its baseline value.
+    Returns:
+        list: Names of metrics that regressed past the threshold
+    """
+    regressions = []
+    print(f"\n{'metric':<48} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, current in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<48} {'-':>12} {current['value']:>12.4f}    (new)")
+            continue
+        old, new = base['value'], current['value']
+        change = (new - old) / old if old else 0.0
+        worse = change > threshold if current['better'] == 'lower' else change < -threshold
+        if worse and abs(new - old) < MIN_DELTA.get(current['unit'], 0.0):
+            worse = False
+        flag = '  REGRESSION' if worse else ''
+        print(f"{name:<48} {old:>12.4f} {new:>12.4f} {change:>+8.1%}{flag}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--limit', type=int, default=100, help='number of distinct resumes in the workload')
+    parser.add_argument('--concurrency', type=int, default=4, help='concurrent clients for endpoint latency')
+    parser.add_argument('--requests', type=int, default=50, help='requests per endpoint')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of the timing sections; the best value is kept')
+    parser.add_argument('--only', default=','.join(SECTIONS), help=f"comma-separated subset of {', '.join(SECTIONS)}")
+    parser.add_argument('--threshold', type=float, default=0.3, help='allowed relative regression (0.3 = 30%%)')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    args = parser.parse_args()
+
+    sections = [s.strip() for s in args.only.split(',') if s.strip()]
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+    workload = load_workload(args.limit)
+    model = get_benchmark_model()
+    results = {}
+    print(f"workload: {len(workload)} resumes; sections: {', '.join(sections)}")
+    runs = []
+    for _ in range(max(args.repeat, 1)):
+        skipped = []
+        run = {}
+        if 'micro' in sections:
+            run.update(bench_micro(workload, model, skipped))
+        if 'endpoints' in sections:
+            run.update(bench_endpoints(workload, args.concurrency, args.requests, skipped))
+        if 'batch' in sections:
+            run.update(bench_batch(workload, model))
+        runs.append(run)
+    results.update(best_of(runs))
+    # Memory peaks are deterministic and the cold build is slow, so this section runs once
+    if 'memory' in sections:
+        results.update(bench_memory(workload, model))
+    for reason in skipped:
+        print(f"skipped: {reason}")
+
+    if args.save_baseline:
+        baseline = {
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "workload": {"limit": args.limit, "concurrency": args.concurrency, "requests": args.requests,
+                             "repeat": args.repeat},
+            },
+            "metrics": results,
+        }
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        compare(results, {}, args.threshold)
+        print(f"\nbaseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        compare(results, {}, args.threshold)
+        print(f"\nno baseline at {args.baseline}; run with --save-baseline first")
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['metrics']
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) past {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\nno regressions past {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
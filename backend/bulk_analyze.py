@@ -0,0 +1,343 @@
+"""
+Offline bulk analysis of a resume archive, from the backend directory:
+    python bulk_analyze.py /data/resumes results.jsonl
+    python bulk_analyze.py resumes.zip results_parquet --format parquet --category "Data Science"
+
+Every PDF/DOCX under the directory (or in the zip archive) is extracted on the batch process pool
+(RESUME_ANALYZER_BATCH_WORKERS processes) and analyzed in batches by the same pipeline as
+/analyze_resumes/batch, i.e. the /analyze_resume/ report. With the default --category auto each resume
+is analyzed against its top-ranked category. Results are streamed batch by batch (extraction of the next
+batch overlaps analysis of the current one), so memory stays bounded by --batch-size, not the archive size.
+
+Progress is committed to a checkpoint file after every batch; running the same command again after an
+interruption skips finished documents and discards output written after the last commit. --restart
+starts over. A throughput summary (documents per second, time per stage) is printed at the end.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import zipfile
+import argparse
+from collections import defaultdict
+from batch import analyze_batch, get_batch_executor
+from utils import MAX_UPLOAD_BYTES, allowed_file, extract_text_from_docx, extract_text_from_pdf, get_benchmark_model
+
+AUTO_CATEGORY = 'auto'
+DEFAULT_BATCH_SIZE = 64
+OUTPUT_FORMATS = ('jsonl', 'parquet')
+
+# Archives opened by this (pool worker) process, reused across its extraction tasks
+_archives = {}
+
+
+def list_documents(source):
+    """
+    PDF/DOCX documents under a directory or in a zip archive, in a stable order.
+    Returns:
+        list: (document id, location, size in bytes); the id is the path relative to the directory or
+              the archive member name, the location the file path or the member name
+    """
+    if os.path.isfile(source):
+        if not zipfile.is_zipfile(source):
+            raise ValueError(f"{source} is neither a directory nor a zip archive")
+        with zipfile.ZipFile(source) as archive:
+            return sorted((info.filename, info.filename, info.file_size) for info in archive.infolist()
+                          if not info.is_dir() and allowed_file(info.filename))
+    if not os.path.isdir(source):
+        raise ValueError(f"{source} does not exist")
+    documents = []
+    for root, _, files in os.walk(source):
+        for name in files:
+            if allowed_file(name):
+                path = os.path.join(root, name)
+                documents.append((os.path.relpath(path, source), path, os.path.getsize(path)))
+    return sorted(documents)
+
+
+def extract_document(archive_path, location, size):
+    """
+    Process-pool task: text of one document (a file path, or a member of the zip archive at archive_path).
+    Returns:
+        tuple: (text or None, error or None, extraction seconds)
+    """
+    start = time.perf_counter()
+    text, error = None, None
+    try:
+        if size > MAX_UPLOAD_BYTES:
+            raise ValueError(f"File exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB upload limit")
+        if archive_path is None:
+            data = location
+        else:
+            archive = _archives.get(archive_path)
+            if archive is None:
+                archive = _archives[archive_path] = zipfile.ZipFile(archive_path)
+            data = archive.read(location)
+        extract = extract_text_from_pdf if location.lower().endswith('.pdf') else extract_text_from_docx
+        text = extract(data)
+        if not text.strip():
+            text, error = None, "No text extracted"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return text, error, time.perf_counter() - start
+
+
+class Checkpoint:
+    """
+    Append-only log of committed batches: a header line with the run settings, then one JSON line per
+    batch with its document ids and the output position after it (byte offset or part file). A line torn
+    by a crash is dropped on load.
+    """
+
+    def __init__(self, path, settings, restart=False):
+        self.path = path
+        self.done = set()
+        self.position = None
+        if restart or not os.path.exists(path):
+            with open(path, 'w') as f:
+                f.write(json.dumps(settings) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            return
+        valid_bytes = 0
+        with open(path, 'rb') as f:
+            for n, line in enumerate(f):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                if n == 0:
+                    if entry != settings:
+                        raise ValueError(f"Checkpoint {path} was written by a run with different settings "
+                                         f"({entry}); pass --restart to start over")
+                else:
+                    self.done.update(entry['ids'])
+                    self.position = entry['position']
+                valid_bytes += len(line)
+        if valid_bytes == 0:
+            raise ValueError(f"Checkpoint {path} is empty or corrupt; pass --restart to start over")
+        with open(path, 'r+b') as f:
+            f.truncate(valid_bytes)
+
+    def commit(self, ids, position):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps({"ids": ids, "position": position}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(ids)
+        self.position = position
+
+
+class JsonlOutput:
+    """One JSON object per line, appended to a single file; positions are byte offsets."""
+
+    def __init__(self, path, position=None):
+        self.path = path
+        if position is not None and not os.path.exists(path):
+            raise ValueError(f"{path} is missing but the checkpoint has results in it; pass --restart to start over")
+        self._file = open(path, 'wb' if position is None else 'r+b')
+        # Drop lines written after the last checkpoint commit
+        self._file.truncate(position or 0)
+        self._file.seek(position or 0)
+
+    def write(self, records):
+        for record in records:
+            self._file.write(json.dumps(record).encode('utf-8') + b'\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetOutput:
+    """
+    A directory of Parquet files, one per batch; positions are part file names. Scalar fields get their
+    own columns and the full report is kept as a JSON string, so every part has the same schema.
+    """
+
+    def __init__(self, path, position=None):
+        import pyarrow as pa
+        self.pa = pa
+        self.path = path
+        self.schema = pa.schema([('id', pa.string()), ('category', pa.string()), ('error', pa.string()),
+                                 ('similarity', pa.float64()), ('skill_match', pa.float64()), ('report', pa.string())])
+        os.makedirs(path, exist_ok=True)
+        parts = sorted(name for name in os.listdir(path) if name.startswith('part-') and name.endswith('.parquet'))
+        # Drop parts written after the last checkpoint commit
+        if position is not None and position not in parts:
+            raise ValueError(f"{path}/{position} is missing but the checkpoint has results in it; pass --restart to start over")
+        committed = parts[:parts.index(position) + 1] if position is not None else []
+        for name in parts[len(committed):]:
+            os.remove(os.path.join(path, name))
+        self._next_part = len(committed)
+
+    def write(self, records):
+        import pyarrow.parquet as pq
+        columns = {
+            "id": [r['id'] for r in records],
+            "category": [r.get('category') for r in records],
+            "error": [r.get('error') for r in records],
+            "similarity": [r.get('similarity') for r in records],
+            "skill_match": [r.get('skill_match') for r in records],
+            "report": [None if 'error' in r else json.dumps(r) for r in records],
+        }
+        name = f"part-{self._next_part:06d}.parquet"
+        tmp_path = os.path.join(self.path, f".{name}.tmp")
+        pq.write_table(self.pa.table(columns, schema=self.schema), tmp_path)
+        os.replace(tmp_path, os.path.join(self.path, name))
+        self._next_part += 1
+        return name
+
+    def close(self):
+        pass
+
+
+class StageTimer:
+    """Wall seconds per pipeline stage, plus the analyzer stage timings summed over reports."""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.analyzer_ms = defaultdict(float)
+        self.extraction_seconds = 0.0
+
+    def add(self, stage, seconds):
+        self.seconds[stage] += seconds
+
+    def add_report(self, report):
+        for stage, ms in report.get('stage_timings_ms', {}).items():
+            self.analyzer_ms[stage] += ms
+
+
+async def analyze_documents(model, texts, category):
+    """
+    Analyze a batch like /analyze_resumes/batch, grouped by target category.
+    Returns:
+        tuple: (category per text, report per text)
+    """
+    if category == AUTO_CATEGORY:
+        categories = [ranking[0]['category'] for ranking in model.rank_categories(texts, top_k=1)]
+    else:
+        categories = [category] * len(texts)
+    groups = defaultdict(list)
+    for i, c in enumerate(categories):
+        groups[c].append(i)
+    reports = [None] * len(texts)
+    for c, members in groups.items():
+        async for j, report in analyze_batch(model, [texts[i] for i in members], c):
+            reports[members[j]] = report
+    return categories, reports
+
+
+async def run(source, documents, output, checkpoint, category, batch_size, model, timer):
+    """Extract, analyze and write every pending document; returns (analyzed, failed) counts."""
+    loop = asyncio.get_running_loop()
+    executor = get_batch_executor()
+    batches = [documents[i:i + batch_size] for i in range(0, len(documents), batch_size)]
+
+    archive_path = source if os.path.isfile(source) else None
+
+    def submit(batch):
+        return [loop.run_in_executor(executor, extract_document, archive_path, location, size)
+                for _, location, size in batch]
+
+    analyzed = failed = 0
+    pending = submit(batches[0]) if batches else None
+    for n, batch in enumerate(batches):
+        start = time.perf_counter()
+        extracted = await asyncio.gather(*pending)
+        timer.add('extract (waiting)', time.perf_counter() - start)
+        # Next batch is extracted while this one is analyzed and written
+        pending = submit(batches[n + 1]) if n + 1 < len(batches) else None
+
+        records = [None] * len(batch)
+        ok = []
+        for i, ((doc_id, _, _), (text, error, seconds)) in enumerate(zip(batch, extracted)):
+            timer.extraction_seconds += seconds
+            if error is None:
+                ok.append((i, text))
+            else:
+                records[i] = {"id": doc_id, "error": error}
+        start = time.perf_counter()
+        if ok:
+            categories, reports = await analyze_documents(model, [text for _, text in ok], category)
+            for (i, _), c, report in zip(ok, categories, reports):
+                timer.add_report(report)
+                records[i] = {"id": batch[i][0], "category": c, **report}
+        timer.add('analyze', time.perf_counter() - start)
+
+        start = time.perf_counter()
+        position = output.write(records)
+        checkpoint.commit([doc_id for doc_id, _, _ in batch], position)
+        timer.add('write + checkpoint', time.perf_counter() - start)
+        batch_failed = sum(1 for r in records if 'error' in r)
+        analyzed += len(records) - batch_failed
+        failed += batch_failed
+        print(f"  {len(checkpoint.done)} documents done ({failed} failed)", file=sys.stderr)
+    return analyzed, failed
+
+
+def print_summary(found, skipped, analyzed, failed, wall_seconds, timer):
+    processed = analyzed + failed
+    print(f"documents: {found} found, {skipped} already done, {analyzed} analyzed, {failed} failed")
+    print(f"wall time: {wall_seconds:.1f}s, {processed / wall_seconds if wall_seconds else 0.0:.1f} documents/s")
+    print(f"{'stage':<28} {'seconds':>10} {'ms/doc':>10}")
+    per_doc = 1000 / processed if processed else 0.0
+    for stage, seconds in timer.seconds.items():
+        print(f"{stage:<28} {seconds:10.2f} {seconds * per_doc:10.2f}")
+    print(f"{'extract (in workers)':<28} {timer.extraction_seconds:10.2f} {timer.extraction_seconds * per_doc:10.2f}")
+    # Analyzer stages run on several cores at once, so these add up to more than the analyze wall time
+    per_analyzed = 1 / analyzed if analyzed else 0.0
+    for stage, ms in sorted(timer.analyzer_ms.items(), key=lambda item: -item[1]):
+        print(f"  {stage:<26} {ms / 1000:10.2f} {ms * per_analyzed:10.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('source', help='directory or zip archive of PDF/DOCX resumes')
+    parser.add_argument('output', help='JSONL file, or directory of Parquet part files')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, help='default: parquet if OUTPUT ends in .parquet or is a directory, else jsonl')
+    parser.add_argument('--category', default=AUTO_CATEGORY, help='target category, or "auto" for each resume\'s top-ranked one')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--checkpoint', help='default: OUTPUT.checkpoint')
+    parser.add_argument('--restart', action='store_true', help='ignore an existing checkpoint and start over')
+    args = parser.parse_args(argv)
+    output_format = args.format or (
+        'parquet' if args.output.rstrip('/').endswith('.parquet') or os.path.isdir(args.output) else 'jsonl')
+    checkpoint_path = args.checkpoint or args.output.rstrip('/') + '.checkpoint'
+
+    wall_start = time.perf_counter()
+    timer = StageTimer()
+    start = time.perf_counter()
+    model = get_benchmark_model()
+    if args.category != AUTO_CATEGORY and args.category not in model.category_profiles:
+        parser.error(f"Unknown category: {args.category}")
+    timer.add('load model', time.perf_counter() - start)
+    start = time.perf_counter()
+    documents = list_documents(args.source)
+    timer.add('list documents', time.perf_counter() - start)
+
+    settings = {"source": os.path.abspath(args.source), "output": os.path.abspath(args.output),
+                "format": output_format, "category": args.category, "model_version": model.version}
+    try:
+        checkpoint = Checkpoint(checkpoint_path, settings, restart=args.restart)
+        pending = [doc for doc in documents if doc[0] not in checkpoint.done]
+        output = (ParquetOutput if output_format == 'parquet' else JsonlOutput)(args.output, checkpoint.position)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"{len(documents)} documents in {args.source}, {len(pending)} to analyze", file=sys.stderr)
+    try:
+        analyzed, failed = asyncio.run(run(
+            args.source, pending, output, checkpoint, args.category, args.batch_size, model, timer))
+    finally:
+        output.close()
+    print_summary(len(documents), len(documents) - len(pending), analyzed, failed,
+                  time.perf_counter() - wall_start, timer)
+
+
+if __name__ == '__main__':
+    main()
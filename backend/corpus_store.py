@@ -0,0 +1,192 @@
+import os
+import json
+import shutil
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Bump when the stored columns change so stale stores on disk are ignored
+CORPUS_STORE_VERSION = 1
+# Rows per CSV read, Parquet row group and streamed chunk; peak memory scales with this
+CORPUS_CHUNK_ROWS = int(os.environ.get('RESUME_ANALYZER_CORPUS_CHUNK_ROWS', '256'))
+
+MANIFEST_FILE = 'manifest.json'
+DATASET_COLUMNS = ['Category', 'Resume', 'Skills']
+CORPUS_SCHEMA = pa.schema([
+    ('Category', pa.string()),
+    ('Resume', pa.string()),
+    ('Skills', pa.string()),
+    # Precomputed once so readers never lowercase or split the raw text again
+    ('resume_lower', pa.string()),
+    ('word_count', pa.int32()),
+])
+
+
+def corpus_store_path(cache_dir, fingerprint):
+    return os.path.join(cache_dir, f"corpus_v{CORPUS_STORE_VERSION}_{fingerprint[:16]}")
+
+
+def prepare_chunk(df):
+    """
+    Convert a chunk of dataset rows into a table with the derived columns filled in.
+    Args:
+        df: DataFrame with 'Category', 'Resume' and 'Skills' columns
+    Returns:
+        pa.Table
+    """
+    resumes = df['Resume'].tolist()
+    columns = {
+        'Category': df['Category'].astype(str).tolist(),
+        'Resume': [r if isinstance(r, str) else None for r in resumes],
+        'Skills': [s if isinstance(s, str) else None for s in df['Skills'].tolist()],
+        'resume_lower': [r.lower() if isinstance(r, str) else '' for r in resumes],
+        'word_count': [len(str(r).split()) for r in resumes],
+    }
+    return pa.Table.from_pydict(columns, schema=CORPUS_SCHEMA)
+
+
+class CorpusStore:
+    """
+    Read-only view of the dataset as Parquet part files with one row group per chunk.
+    Readers stream chunks and select only the columns they need, so no caller has to hold the
+    whole corpus (or several lowercased copies of it) in memory. Appends add a part file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.parts = list(self.manifest['parts'])
+        self.num_rows = int(self.manifest['num_rows'])
+
+    @classmethod
+    def open_or_build(cls, csv_path, fingerprint, cache_dir, chunk_rows=CORPUS_CHUNK_ROWS):
+        """
+        Open the store for this dataset fingerprint, converting the CSV chunk by chunk if needed.
+        Read-only cache directories fall back to a per-process temp directory.
+        """
+        path = corpus_store_path(cache_dir, fingerprint)
+        store = cls._open(path, fingerprint)
+        if store is not None:
+            return store
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            return cls._build(csv_path, path, fingerprint, chunk_rows)
+        except OSError:
+            import tempfile
+            fallback = corpus_store_path(tempfile.gettempdir(), fingerprint)
+            return cls._open(fallback, fingerprint) or cls._build(csv_path, fallback, fingerprint, chunk_rows)
+
+    @classmethod
+    def _open(cls, path, fingerprint):
+        try:
+            store = cls(path)
+        except (OSError, ValueError, KeyError):
+            return None
+        if store.manifest.get('version') != CORPUS_STORE_VERSION or store.manifest.get('fingerprint') != fingerprint:
+            return None
+        return store
+
+    @classmethod
+    def _build(cls, csv_path, path, fingerprint, chunk_rows):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        num_rows = 0
+        with pq.ParquetWriter(os.path.join(tmp_path, 'part-00000.parquet'), CORPUS_SCHEMA) as writer:
+            for chunk in pd.read_csv(csv_path, chunksize=chunk_rows):
+                writer.write_table(prepare_chunk(chunk), row_group_size=chunk_rows)
+                num_rows += len(chunk)
+        _write_manifest(tmp_path, fingerprint, ['part-00000.parquet'], num_rows)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # Another worker published the same store first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        return cls(path)
+
+    def iter_chunks(self, columns=None, chunk_rows=CORPUS_CHUNK_ROWS):
+        """
+        Stream the corpus in order as DataFrames of at most chunk_rows rows.
+        Args:
+            columns: Column names to read (default: all)
+            chunk_rows: Rows per yielded chunk
+        """
+        for part in self.parts:
+            parquet_file = pq.ParquetFile(os.path.join(self.path, part))
+            for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+                yield batch.to_pandas()
+
+    def iter_column(self, name, chunk_rows=CORPUS_CHUNK_ROWS):
+        """Stream the values of one column."""
+        for chunk in self.iter_chunks([name], chunk_rows):
+            yield from chunk[name].tolist()
+
+    def column(self, name):
+        """Load one (small) column, e.g. 'Category', fully into memory."""
+        return pd.Series(list(self.iter_column(name)), name=name)
+
+    def take(self, row_ids, columns=None):
+        """
+        Read selected rows by position, touching only the row groups that contain them.
+        Args:
+            row_ids: Row positions in the corpus
+            columns: Column names to read (default: all)
+        Returns:
+            pd.DataFrame: One row per requested id, in request order
+        """
+        wanted = sorted(set(int(i) for i in row_ids))
+        found = {}
+        start = 0
+        for part in self.parts:
+            parquet_file = pq.ParquetFile(os.path.join(self.path, part))
+            for group in range(parquet_file.num_row_groups):
+                end = start + parquet_file.metadata.row_group(group).num_rows
+                in_group = [i for i in wanted if start <= i < end]
+                if in_group:
+                    table = parquet_file.read_row_group(group, columns=columns).to_pandas()
+                    for i in in_group:
+                        found[i] = table.iloc[i - start]
+                start = end
+        missing = [i for i in row_ids if int(i) not in found]
+        if missing:
+            raise IndexError(f"Row ids out of range: {missing[:5]}")
+        return pd.DataFrame([found[int(i)] for i in row_ids]).reset_index(drop=True)
+
+    def with_appended(self, records, fingerprint, cache_dir):
+        """
+        Return a store for the dataset with records appended, sharing the existing part files.
+        Args:
+            records: DataFrame with 'Category', 'Resume' and 'Skills' columns
+            fingerprint: Fingerprint of the dataset file after the append
+            cache_dir: Directory where stores are persisted
+        Returns:
+            CorpusStore
+        """
+        path = corpus_store_path(cache_dir, fingerprint)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        for part in self.parts:
+            source = os.path.join(self.path, part)
+            try:
+                os.link(source, os.path.join(tmp_path, part))
+            except OSError:
+                shutil.copyfile(source, os.path.join(tmp_path, part))
+        new_part = f"part-{len(self.parts):05d}.parquet"
+        pq.write_table(prepare_chunk(records), os.path.join(tmp_path, new_part), row_group_size=CORPUS_CHUNK_ROWS)
+        _write_manifest(tmp_path, fingerprint, self.parts + [new_part], self.num_rows + len(records))
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        return CorpusStore(path)
+
+
+def _write_manifest(path, fingerprint, parts, num_rows):
+    manifest = {
+        "version": CORPUS_STORE_VERSION,
+        "fingerprint": fingerprint,
+        "parts": parts,
+        "num_rows": num_rows,
+    }
+    with open(os.path.join(path, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
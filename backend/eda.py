@@ -0,0 +1,271 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from word_frequency import TermFrequencyMatrix
+from keyword_matcher import KeywordMatcher
+from resume_index import ResumeIndex
+
+# Bump when the snapshot layout changes so stale files on disk are ignored
+EDA_SNAPSHOT_VERSION = 1
+
+
+def dataset_fingerprint(dataset_path, chunk_size=1 << 20):
+    """
+    Hash the raw dataset file so derived artifacts can be tied to its exact contents.
+    Args:
+        dataset_path: Path to the CSV dataset
+        chunk_size: Bytes read per iteration
+    Returns:
+        str: Hex sha256 digest of the file
+    """
+    digest = hashlib.sha256()
+    with open(dataset_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _split_skills(skills):
+    if not isinstance(skills, str):
+        return []
+    return [s.strip() for s in skills.split(',') if s.strip()]
+
+
+class EDAAccumulator:
+    """
+    Running EDA aggregates that can be fed one resume at a time.
+    Building from a DataFrame or CorpusStore and appending new resumes later produce the same snapshot as a
+    full recompute. Skill coverage is not accumulated: snapshot() reads it from the phrase and category
+    posting lists of a ResumeIndex over the same resumes.
+    """
+
+    def __init__(self, skills=()):
+        self.category_sizes = {}  # category -> resume count, in first-appearance order
+        self.top_skills_per_category = {}
+        self.all_skills = list(dict.fromkeys(skills))
+        # Word frequencies for every resume, grouped by category
+        self.term_matrix = TermFrequencyMatrix()
+        self.resume_lengths = []
+
+    @classmethod
+    def from_dataframe(cls, df):
+        # Curated skills are known up front so the heatmap columns follow their dataset order
+        acc = cls(s for skills in df['Skills'].dropna().unique() for s in _split_skills(skills))
+        for cat, resume, skills in zip(df['Category'], df['Resume'], df['Skills']):
+            acc.add(cat, resume, skills)
+        return acc
+
+    @classmethod
+    def from_store(cls, store):
+        """Build the aggregates by streaming a CorpusStore chunk by chunk."""
+        acc = cls(s for skills in dict.fromkeys(store.iter_column('Skills')) for s in _split_skills(skills))
+        columns = ['Category', 'Skills', 'resume_lower', 'word_count']
+        for chunk in store.iter_chunks(columns):
+            for cat, skills, lower, word_count in zip(*(chunk[c] for c in columns)):
+                acc.add_prepared(cat, lower, int(word_count), skills)
+        return acc
+
+    def add(self, category, resume, skills=None):
+        lower = resume.lower() if isinstance(resume, str) else ""
+        self.add_prepared(category, lower, len(str(resume).split()), skills)
+
+    def add_prepared(self, category, lower, word_count, skills=None):
+        """Add one resume given its lowercased text and whitespace word count."""
+        if category not in self.category_sizes:
+            self.category_sizes[category] = 0
+            self.top_skills_per_category[category] = []
+        self.category_sizes[category] += 1
+        # Curated skills per category come from the first non-empty Skills value of that category
+        split_skills = _split_skills(skills)
+        if not self.top_skills_per_category[category]:
+            self.top_skills_per_category[category] = split_skills
+        for skill in split_skills:
+            if skill not in self.all_skills:
+                self.all_skills.append(skill)
+        self.resume_lengths.append(word_count)
+        self.term_matrix.add_document(lower, category)
+
+    def snapshot(self, index, fingerprint=None, load_store=None):
+        """
+        Render the aggregates in the shape served by the EDA endpoints.
+        Args:
+            index: ResumeIndex over the same resumes, whose phrase postings give skill coverage
+            fingerprint: Dataset hash the snapshot is keyed by
+            load_store: Zero-argument callable returning the CorpusStore, only called when some skill is
+                not an indexed phrase (e.g. introduced by appended resumes)
+        Returns:
+            dict: JSON-serializable snapshot with one entry per EDA endpoint
+        """
+        categories = list(self.category_sizes)
+        # Stable sort keeps first-appearance order among equal counts, like value_counts()
+        by_size = sorted(categories, key=lambda c: self.category_sizes[c], reverse=True)
+        all_skills = list(self.all_skills)
+        top_skills_per_category = self.top_skills_per_category
+        term_matrix = self.term_matrix
+        category_skill_hits = skill_category_counts(index, all_skills, load_store)
+
+        def coverage(cat, skill):
+            return float(category_skill_hits[skill].get(cat, 0) / self.category_sizes[cat])
+
+        top_words = term_matrix.top_k(20)
+        top_categories = [{"category": cat, "count": int(self.category_sizes[cat])} for cat in by_size[:10]]
+        resume_lengths = np.asarray(self.resume_lengths, dtype=np.int64)
+        length_series = pd.Series(resume_lengths)
+        length_stats = {
+            "min": int(length_series.min()),
+            "max": int(length_series.max()),
+            "mean": float(length_series.mean()),
+            "median": float(length_series.median()),
+            "std": float(length_series.std()),
+        }
+        skill_appearance = {skill: sum(category_skill_hits[skill].values()) for skill in all_skills}
+        most_common_skills = sorted(skill_appearance.items(), key=lambda x: x[1], reverse=True)
+        least_common_skills = sorted(skill_appearance.items(), key=lambda x: x[1])
+        skill_coverage_per_category = {
+            cat: {skill: coverage(cat, skill) for skill in top_skills_per_category[cat]}
+            for cat in categories
+        }
+        heatmap_matrix = [[coverage(cat, skill) for skill in all_skills] for cat in categories]
+        top5_categories = by_size[:5]
+        cross_tab = {
+            cat: [{"skill": skill, "coverage": coverage(cat, skill)} for skill in top_skills_per_category[cat][:5]]
+            for cat in top5_categories
+        }
+
+        dataset_summary = {
+            "summary": {
+                "total_resumes": len(resume_lengths),
+                "unique_categories": len(categories),
+                "top_skill": top_words[0][0] if top_words else None,
+            },
+            "top_categories": top_categories,
+            "resume_length_stats": length_stats,
+            "top_words": [{"word": w, "count": c} for w, c in top_words],
+            "skill_freq": dict(top_words),
+            "category_skill_crosstab": cross_tab,
+            "top_skills_per_category": {cat: list(top_skills_per_category[cat]) for cat in categories},
+            "skill_appearance": skill_appearance,
+            "most_common_skills": most_common_skills,
+            "least_common_skills": least_common_skills,
+            "skill_coverage_per_category": skill_coverage_per_category,
+            "heatmap_categories": categories,
+            "heatmap_skills": all_skills,
+            "heatmap_matrix": heatmap_matrix,
+        }
+
+        # Resume length histogram in buckets of 100 words
+        bins = list(range(0, int(resume_lengths.max()) + 100, 100))
+        hist, bin_edges = np.histogram(resume_lengths, bins=bins)
+        resume_length_histogram = {
+            "bins": [int(b) for b in bin_edges],
+            "counts": hist.tolist(),
+        }
+
+        category_skill_frequency = {
+            cat: [{"word": w, "count": c} for w, c in term_matrix.top_k(20, cat)]
+            for cat in categories
+        }
+
+        heatmap_words = [w for w, _ in term_matrix.top_k(10)]
+        skill_category_heatmap = {
+            "categories": top5_categories,
+            "skills": heatmap_words,
+            "matrix": [term_matrix.counts_of(heatmap_words, cat) for cat in top5_categories],
+        }
+
+        return {
+            "version": EDA_SNAPSHOT_VERSION,
+            "fingerprint": fingerprint,
+            "dataset_summary": dataset_summary,
+            "resume_length_histogram": resume_length_histogram,
+            "category_skill_frequency": category_skill_frequency,
+            "skill_category_heatmap": skill_category_heatmap,
+        }
+
+
+def skill_category_counts(index, skills, load_store=None):
+    """
+    Resumes containing each skill (substring match on the lowercased text), per category.
+    Indexed phrases are read from their posting lists; any other skill costs one matcher pass over the corpus.
+    Returns:
+        dict: {skill: {category: count}}
+    """
+    counts = {}
+    missing = []
+    for skill in skills:
+        if skill.lower() in index.phrases:
+            per_code = index.phrase_category_counts(skill)
+            counts[skill] = {index.categories[code]: int(per_code[code]) for code in np.flatnonzero(per_code)}
+        else:
+            missing.append(skill)
+    if missing:
+        if load_store is None:
+            raise ValueError(f"Skills missing from the resume index: {missing[:5]}")
+        matcher = KeywordMatcher([skill.lower() for skill in missing])
+        hits = {phrase: {} for phrase in matcher.patterns}
+        store = load_store()
+        for chunk in store.iter_chunks(['Category', 'resume_lower']):
+            for category, lower in zip(chunk['Category'], chunk['resume_lower']):
+                for phrase in matcher.scan(lower).counts:
+                    hits[phrase][category] = hits[phrase].get(category, 0) + 1
+        for skill in missing:
+            counts[skill] = hits[skill.lower()]
+    return counts
+
+
+def build_eda_snapshot(df, fingerprint=None):
+    """
+    Compute every aggregate served by the EDA endpoints in a single pass over the corpus.
+    Args:
+        df: Dataset with 'Category', 'Resume' and 'Skills' columns
+        fingerprint: Dataset hash the snapshot is keyed by
+    Returns:
+        dict: JSON-serializable snapshot with one entry per EDA endpoint
+    """
+    accumulator = EDAAccumulator.from_dataframe(df)
+    lower = pd.DataFrame({'Category': df['Category'], 'resume_lower': df['Resume'].astype(str).str.lower()})
+    return accumulator.snapshot(ResumeIndex.build([lower], accumulator.all_skills), fingerprint)
+
+
+def eda_snapshot_path(cache_dir, fingerprint):
+    return os.path.join(cache_dir, f"eda_snapshot_v{EDA_SNAPSHOT_VERSION}_{fingerprint[:16]}.json")
+
+
+def load_or_build_eda_snapshot(load_store, load_index, fingerprint, cache_dir):
+    """
+    Return the EDA snapshot for this dataset, rebuilding it only when the dataset hash changes.
+    Args:
+        load_store: Zero-argument callable returning the CorpusStore, only called on a rebuild
+        load_index: Zero-argument callable returning the ResumeIndex of the corpus, only called on a rebuild
+        fingerprint: Hash of the dataset file (see dataset_fingerprint)
+        cache_dir: Directory where snapshots are persisted
+    Returns:
+        dict: Snapshot as produced by build_eda_snapshot
+    """
+    path = eda_snapshot_path(cache_dir, fingerprint)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            if snapshot.get('version') == EDA_SNAPSHOT_VERSION and snapshot.get('fingerprint') == fingerprint:
+                return snapshot
+        except (OSError, ValueError):
+            pass  # Corrupt or unreadable snapshot, rebuild below
+    snapshot = EDAAccumulator.from_store(load_store()).snapshot(load_index(), fingerprint, load_store)
+    save_eda_snapshot(snapshot, cache_dir)
+    return snapshot
+
+
+def save_eda_snapshot(snapshot, cache_dir):
+    """Persist a snapshot under its fingerprint (best effort, written atomically)."""
+    path = eda_snapshot_path(cache_dir, snapshot['fingerprint'])
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # Read-only deployments still get the in-memory snapshot
@@ -0,0 +1,35 @@
+"""
+Production launch, from the backend directory:
+    gunicorn -c gunicorn.conf.py main:app
+
+The app is imported and warmed up once in the master, before the workers are forked: the model, its
+indexes, the spaCy pipeline and the skill/syllable dictionaries are then shared copy-on-write by every
+worker (the large arrays are additionally memory-mapped read-only from the artifact cache), workers are
+ready to serve as soon as they start, and a crashed worker is replaced without reloading anything.
+Settings come from RESUME_ANALYZER_* variables; other gunicorn options can be set with GUNICORN_CMD_ARGS.
+"""
+import os
+import gc
+
+bind = os.environ.get('RESUME_ANALYZER_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('RESUME_ANALYZER_WORKERS', os.cpu_count() or 1))
+worker_class = 'uvicorn.workers.UvicornWorker'
+preload_app = True
+# Seconds a worker may stay silent (e.g. inside a long batch request) before it is restarted
+timeout = int(os.environ.get('RESUME_ANALYZER_WORKER_TIMEOUT', '120'))
+graceful_timeout = 30
+# Restart each worker after this many requests (0: never), bounding the pages it un-shares over time
+max_requests = int(os.environ.get('RESUME_ANALYZER_WORKER_MAX_REQUESTS', '0'))
+max_requests_jitter = max_requests // 10
+
+
+def when_ready(server):
+    # Runs in the master after main:app was imported, before the first fork. A failed warm-up raises
+    # and stops the server instead of starting workers that could never become ready
+    from serving import warm_up
+    state = warm_up()
+    server.log.info("Warm-up finished in %.1fs: %s", sum(state['warm_up_seconds'].values()),
+                    ', '.join(f"{name} {seconds:.2f}s" for name, seconds in state['warm_up_seconds'].items()))
+    # Everything allocated so far lives as long as the master: exempt it from the cyclic GC, whose
+    # passes would otherwise write to (and so copy) every shared page holding these objects in each worker
+    gc.freeze()
@@ -0,0 +1,102 @@
+import os
+import threading
+import pandas as pd
+from eda import dataset_fingerprint
+from utils import CATEGORY_SKILLS, ResumeBenchmarkModel, get_benchmark_model, set_benchmark_model
+
+# Schedule a full refit once this fraction of the corpus was appended since the last fit
+REFIT_DRIFT_THRESHOLD = float(os.environ.get('RESUME_ANALYZER_REFIT_DRIFT', '0.1'))
+DATASET_COLUMNS = ['Category', 'Resume', 'Skills']
+
+# Serializes appends and refit swaps so the CSV, the fingerprint and the served model stay in step
+_append_lock = threading.Lock()
+_refit_thread = None
+
+
+def validate_records(records):
+    """
+    Normalize raw append records into a DataFrame in dataset column order.
+    Args:
+        records: List of {'category', 'resume', 'skills' (optional)} dicts
+    Returns:
+        pd.DataFrame
+    """
+    if not records:
+        raise ValueError("No records to append")
+    rows = []
+    for i, record in enumerate(records):
+        category = str(record.get('category') or '').strip()
+        resume = str(record.get('resume') or '').strip()
+        if not category or not resume:
+            raise ValueError(f"Record {i} needs a non-empty 'category' and 'resume'")
+        # Skills default to the curated list of the category, like add_skills_column_to_dataset
+        skills = record.get('skills') or CATEGORY_SKILLS.get(category)
+        rows.append({'Category': category, 'Resume': resume, 'Skills': skills})
+    return pd.DataFrame(rows, columns=DATASET_COLUMNS)
+
+
+def append_resumes(records):
+    """
+    Append resumes to the dataset and swap in a model that includes them.
+    Category profiles and EDA aggregates are updated incrementally; the vocabulary and IDF
+    weights stay those of the last fit until drift passes REFIT_DRIFT_THRESHOLD, at which
+    point a full refit runs in the background.
+    Args:
+        records: List of {'category', 'resume', 'skills' (optional)} dicts
+    Returns:
+        dict: { 'appended', 'total_resumes', 'model_version', 'drift', 'refit_scheduled' }
+    """
+    new_rows = validate_records(records)
+    with _append_lock:
+        model = get_benchmark_model()
+        original_size = os.path.getsize(model.dataset_path)
+        new_rows.to_csv(model.dataset_path, mode='a', header=False, index=False)
+        try:
+            updated = model.with_appended(new_rows, dataset_fingerprint(model.dataset_path))
+        except Exception:
+            # Roll the file back, so it never holds rows the served model lacks and a retry does not duplicate them
+            with open(model.dataset_path, 'r+b') as f:
+                f.truncate(original_size)
+            raise
+        set_benchmark_model(updated)
+        refit_scheduled = updated.drift >= REFIT_DRIFT_THRESHOLD and _schedule_refit()
+    return {
+        "appended": len(new_rows),
+        "total_resumes": updated.dataset_stats['total_resumes'],
+        "model_version": updated.version,
+        "drift": updated.drift,
+        "refit_scheduled": refit_scheduled,
+    }
+
+
+def _schedule_refit():
+    global _refit_thread
+    if _refit_thread is not None and _refit_thread.is_alive():
+        return True
+    _refit_thread = threading.Thread(target=_refit, name='benchmark-refit', daemon=True)
+    _refit_thread.start()
+    return True
+
+
+def refit_benchmark_model(progress=None):
+    """
+    Refit the vocabulary, IDF weights and profiles on the whole dataset and swap the result in.
+    Args:
+        progress: Optional callable invoked before each fitting attempt
+    Returns:
+        ResumeBenchmarkModel: The model now being served
+    """
+    while True:
+        if progress is not None:
+            progress()
+        current = get_benchmark_model()
+        refitted = ResumeBenchmarkModel(current.dataset_path, current.cache_dir, refit=True)
+        with _append_lock:
+            if get_benchmark_model().dataset_hash == refitted.dataset_hash:
+                set_benchmark_model(refitted)
+                return refitted
+            # Resumes were appended while fitting; fit again on the newer file
+
+
+def _refit():
+    refit_benchmark_model()
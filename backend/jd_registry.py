@@ -0,0 +1,189 @@
+import os
+import json
+import time
+import uuid
+import threading
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+from sqlite_util import SqliteConnection
+
+# Weight of skill coverage vs TF-IDF cosine similarity in the combined match score
+MATCH_SKILL_WEIGHT = float(os.environ.get('RESUME_ANALYZER_MATCH_SKILL_WEIGHT', '0.5'))
+# Set RESUME_ANALYZER_JD_DB to keep registered JDs across restarts
+JD_DB = os.environ.get('RESUME_ANALYZER_JD_DB')
+
+
+class JDRegistry:
+    """
+    Registered job descriptions with their TF-IDF vectors and skill sets computed once at upload.
+    JD vectors are stacked into one sparse matrix (and skills into a binary JD x skill matrix) so
+    matching any number of resumes against any number of JDs is two sparse products. Vectors are
+    only recomputed when the model's vectorizer changes (a full refit), from the stored JD text.
+    """
+
+    def __init__(self, skill_vocabulary, db_path=None):
+        self.skill_vocabulary = list(skill_vocabulary)
+        self.skill_index = {s: i for i, s in enumerate(self.skill_vocabulary)}
+        self._jds = {}  # id -> {'id', 'title', 'text', 'skills', 'created_at'}
+        self._vectors = {}  # id -> 1 x n_features TF-IDF row
+        self._vectorizer = None
+        self._stacked = None
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._db = SqliteConnection(
+                db_path, 'CREATE TABLE IF NOT EXISTS jds (id TEXT PRIMARY KEY, title TEXT, text TEXT, skills TEXT, created_at REAL)'
+            )
+            self._sync()
+
+    def add(self, text, skills, vectorizer, title=None):
+        """
+        Register a JD.
+        Args:
+            text: Full JD text
+            skills: Skills found in the JD (from skill_vocabulary)
+            vectorizer: Fitted TfidfVectorizer of the current model
+            title: Optional display name (e.g. the uploaded filename)
+        Returns:
+            dict: { 'id', 'title', 'skills', 'created_at' }
+        """
+        jd = {"id": uuid.uuid4().hex, "title": title, "text": text, "skills": list(skills), "created_at": time.time()}
+        vector = vectorizer.transform([text])
+        with self._lock:
+            if self._vectorizer is not vectorizer:
+                self._revectorize(vectorizer)
+            self._jds[jd['id']] = jd
+            self._vectors[jd['id']] = vector
+            self._stacked = None
+            if self._db is not None:
+                self._db.execute('INSERT INTO jds (id, title, text, skills, created_at) VALUES (?, ?, ?, ?, ?)',
+                                 (jd['id'], title, text, json.dumps(jd['skills']), jd['created_at']))
+        return self.describe(jd['id'])
+
+    def remove(self, jd_id):
+        with self._lock:
+            self._sync()
+            if self._jds.pop(jd_id, None) is None:
+                return False
+            self._vectors.pop(jd_id, None)
+            self._stacked = None
+            if self._db is not None:
+                self._db.execute('DELETE FROM jds WHERE id = ?', (jd_id,))
+        return True
+
+    def describe(self, jd_id):
+        jd = self._get(jd_id)
+        if jd is None:
+            return None
+        return {"id": jd['id'], "title": jd['title'], "skills": jd['skills'], "created_at": jd['created_at']}
+
+    def list(self):
+        with self._lock:
+            self._sync()
+        return [self.describe(jd_id) for jd_id in list(self._jds)]
+
+    def matrices(self, vectorizer, jd_ids=None):
+        """
+        Stacked JD vectors for the given ids (default: every registered JD).
+        Returns:
+            tuple: (ids, TF-IDF matrix n_jds x n_features, binary skill matrix n_jds x n_skills)
+        """
+        with self._lock:
+            self._sync()
+            if self._vectorizer is not vectorizer:
+                self._revectorize(vectorizer)
+            if self._stacked is None:
+                ids = list(self._jds)
+                tfidf = vstack([self._vectors[i] for i in ids]).tocsr() if ids else None
+                self._stacked = (ids, tfidf, self.skill_matrix([self._jds[i]['skills'] for i in ids]))
+            ids, tfidf, skills = self._stacked
+        if jd_ids is None:
+            return ids, tfidf, skills
+        position = {jd_id: i for i, jd_id in enumerate(ids)}
+        missing = [jd_id for jd_id in jd_ids if jd_id not in position]
+        if missing:
+            raise KeyError(f"Unknown JD ids: {missing}")
+        rows = [position[jd_id] for jd_id in jd_ids]
+        return list(jd_ids), tfidf[rows], skills[rows]
+
+    def skill_matrix(self, skill_lists):
+        """Binary (n x n_skills) CSR matrix with one row per skill list."""
+        rows, cols = [], []
+        for r, skills in enumerate(skill_lists):
+            for skill in skills:
+                c = self.skill_index.get(skill)
+                if c is not None:
+                    rows.append(r)
+                    cols.append(c)
+        return csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(skill_lists), len(self.skill_vocabulary)))
+
+    def skills_of(self, jd_id):
+        jd = self._get(jd_id)
+        if jd is None:
+            raise KeyError(jd_id)
+        return jd['skills']
+
+    def _get(self, jd_id):
+        jd = self._jds.get(jd_id)
+        if jd is None and self._db is not None:
+            # Possibly registered by another worker process sharing the database
+            with self._lock:
+                self._sync()
+            jd = self._jds.get(jd_id)
+        return jd
+
+    def _sync(self):
+        """
+        Pick up JDs added or removed through the database by other processes (e.g. the other workers of a
+        multi-worker server). Only ids are read unless something changed. Caller holds the lock.
+        """
+        if self._db is None:
+            return
+        stored = [row[0] for row in self._db.execute('SELECT id FROM jds ORDER BY created_at')]
+        if stored == list(self._jds):
+            return
+        new_ids = [jd_id for jd_id in stored if jd_id not in self._jds]
+        jds = {}
+        for start in range(0, len(new_ids), 500):
+            batch = new_ids[start:start + 500]
+            for jd_id, title, text, skills, created_at in self._db.execute(
+                    f"SELECT id, title, text, skills, created_at FROM jds WHERE id IN ({','.join('?' * len(batch))})",
+                    batch):
+                jds[jd_id] = {"id": jd_id, "title": title, "text": text,
+                              "skills": json.loads(skills), "created_at": created_at}
+        if self._vectorizer is not None and jds:
+            matrix = self._vectorizer.transform([jd['text'] for jd in jds.values()])
+            self._vectors.update({jd_id: matrix[r] for r, jd_id in enumerate(jds)})
+        self._jds = {jd_id: self._jds.get(jd_id) or jds[jd_id] for jd_id in stored if jd_id in self._jds or jd_id in jds}
+        self._vectors = {jd_id: self._vectors[jd_id] for jd_id in self._jds if jd_id in self._vectors}
+        self._stacked = None
+
+    def _revectorize(self, vectorizer):
+        ids = list(self._jds)
+        matrix = vectorizer.transform([self._jds[i]['text'] for i in ids]) if ids else None
+        self._vectors = {jd_id: matrix[r] for r, jd_id in enumerate(ids)}
+        self._vectorizer = vectorizer
+        self._stacked = None
+
+
+def match_scores(resume_tfidf, resume_skills, jd_tfidf, jd_skills, skill_weight=MATCH_SKILL_WEIGHT):
+    """
+    Score every resume against every JD with two sparse products.
+    Args:
+        resume_tfidf: L2-normalized TF-IDF rows (n_resumes x n_features)
+        resume_skills: Binary skill matrix (n_resumes x n_skills)
+        jd_tfidf: L2-normalized TF-IDF rows (n_jds x n_features)
+        jd_skills: Binary skill matrix (n_jds x n_skills)
+        skill_weight: Weight of skill coverage in the combined score
+    Returns:
+        tuple: (score, similarity, skill_match) dense arrays of shape n_resumes x n_jds
+    """
+    similarity = np.asarray((resume_tfidf @ jd_tfidf.T).todense())
+    overlap = np.asarray((resume_skills @ jd_skills.T).todense())
+    jd_skill_counts = np.asarray(jd_skills.sum(axis=1)).ravel()
+    skill_match = np.divide(overlap, jd_skill_counts, out=np.zeros_like(overlap, dtype=float),
+                            where=jd_skill_counts > 0)
+    # JDs without recognizable skills are ranked on similarity alone
+    weight = np.where(jd_skill_counts > 0, skill_weight, 0.0)
+    score = (1 - weight) * similarity + weight * skill_match
+    return score, similarity, skill_match
@@ -0,0 +1,256 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import threading
+from collections import deque
+from utils import analyze_resume_text, get_benchmark_model
+from batch import analyze_batch
+from ingest import refit_benchmark_model
+from sqlite_util import SqliteConnection
+
+# In-process worker threads shared by all background jobs (interactive requests never wait on them)
+JOB_WORKERS = int(os.environ.get('RESUME_ANALYZER_JOB_WORKERS', '2'))
+# Per-tenant limits: jobs running at once, and jobs queued or running before submissions are refused
+JOB_TENANT_CONCURRENCY = int(os.environ.get('RESUME_ANALYZER_JOB_TENANT_CONCURRENCY', '1'))
+JOB_TENANT_QUEUE_LIMIT = int(os.environ.get('RESUME_ANALYZER_JOB_TENANT_QUEUE_LIMIT', '20'))
+JOB_TIMEOUT_SECONDS = float(os.environ.get('RESUME_ANALYZER_JOB_TIMEOUT', '600'))
+# Set RESUME_ANALYZER_JOB_DB to keep job state in sqlite, visible to every worker process on the box
+JOB_DB = os.environ.get('RESUME_ANALYZER_JOB_DB')
+JOB_TTL = int(os.environ.get('RESUME_ANALYZER_JOB_TTL', str(24 * 3600)))
+
+FINISHED_STATUSES = {'succeeded', 'failed', 'timed_out'}
+JOB_FIELDS = ['id', 'kind', 'tenant', 'status', 'done', 'total', 'result', 'error',
+              'created_at', 'started_at', 'finished_at', 'deadline']
+
+
+class JobTimeoutError(Exception):
+    pass
+
+
+class JobLimitError(Exception):
+    pass
+
+
+class MemoryJobStore:
+    """Job records kept in a dict; only visible to the current process."""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, job):
+        with self._lock:
+            self._jobs[job['id']] = dict(job)
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def purge(self, finished_before):
+        with self._lock:
+            for job_id in [k for k, j in self._jobs.items() if j['finished_at'] is not None and j['finished_at'] < finished_before]:
+                del self._jobs[job_id]
+
+
+class SqliteJobStore:
+    """Job records in a local sqlite file (WAL), so any worker process can serve status and results."""
+
+    def __init__(self, db_path):
+        self._db = SqliteConnection(
+            db_path,
+            'CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, kind TEXT, tenant TEXT, status TEXT, '
+            'done INTEGER, total INTEGER, result TEXT, error TEXT, created_at REAL, started_at REAL, '
+            'finished_at REAL, deadline REAL)'
+        )
+        self._lock = threading.Lock()
+
+    def create(self, job):
+        row = [json.dumps(job[f]) if f == 'result' else job[f] for f in JOB_FIELDS]
+        with self._lock:
+            self._db.execute(f"INSERT INTO jobs ({', '.join(JOB_FIELDS)}) VALUES ({', '.join('?' * len(JOB_FIELDS))})", row)
+
+    def update(self, job_id, **fields):
+        if 'result' in fields:
+            fields['result'] = json.dumps(fields['result'])
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._db.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", [*fields.values(), job_id])
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._db.execute(f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(JOB_FIELDS, row))
+        job['result'] = json.loads(job['result']) if job['result'] is not None else None
+        return job
+
+    def purge(self, finished_before):
+        with self._lock:
+            self._db.execute('DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?', (finished_before,))
+
+
+class JobContext:
+    """Handed to job functions to report progress; also where cooperative timeouts are raised."""
+
+    def __init__(self, queue, job_id, deadline):
+        self.queue = queue
+        self.job_id = job_id
+        self.deadline = deadline
+
+    def check(self):
+        if time.time() > self.deadline:
+            raise JobTimeoutError(f"Job exceeded its {self.queue.timeout:g}s timeout")
+
+    def progress(self, done, total=None):
+        self.check()
+        fields = {'done': done} if total is None else {'done': done, 'total': total}
+        self.queue.store.update(self.job_id, **fields)
+
+
+class JobQueue:
+    """
+    Background jobs run on a fixed pool of in-process worker threads.
+    Pending jobs are dispatched in submission order, skipping tenants that already have
+    tenant_concurrency jobs running, so one tenant's backlog cannot occupy every worker.
+    Timeouts are cooperative: jobs call ctx.progress()/ctx.check() between units of work, and a
+    job still running past its deadline is reported as timed out and its result discarded.
+    """
+
+    def __init__(self, store, workers=JOB_WORKERS, tenant_concurrency=JOB_TENANT_CONCURRENCY,
+                 tenant_queue_limit=JOB_TENANT_QUEUE_LIMIT, timeout=JOB_TIMEOUT_SECONDS):
+        self.store = store
+        self.workers = workers
+        self.tenant_concurrency = tenant_concurrency
+        self.tenant_queue_limit = tenant_queue_limit
+        self.timeout = timeout
+        self._handlers = {}
+        self._pending = deque()  # (job_id, kind, params, tenant)
+        self._running = {}  # tenant -> running job count
+        self._cond = threading.Condition()
+        self._threads = []
+
+    def register(self, kind, handler):
+        """Register handler(ctx, **params) -> JSON-serializable result for a job kind."""
+        self._handlers[kind] = handler
+
+    def submit(self, kind, params, tenant='default'):
+        """
+        Queue a job and return its record straight away.
+        Raises:
+            ValueError: Unknown job kind
+            JobLimitError: The tenant already has tenant_queue_limit jobs queued or running
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        now = time.time()
+        job = {
+            'id': uuid.uuid4().hex, 'kind': kind, 'tenant': tenant, 'status': 'queued', 'done': 0, 'total': None,
+            'result': None, 'error': None, 'created_at': now, 'started_at': None, 'finished_at': None,
+            'deadline': None,
+        }
+        with self._cond:
+            active = self._running.get(tenant, 0) + sum(1 for p in self._pending if p[3] == tenant)
+            if active >= self.tenant_queue_limit:
+                raise JobLimitError(f"Tenant '{tenant}' already has {active} jobs queued or running")
+            self.store.create(job)
+            self._pending.append((job['id'], kind, params, tenant))
+            self._start_workers()
+            self._cond.notify()
+        self.store.purge(now - JOB_TTL)
+        return job
+
+    def get(self, job_id):
+        job = self.store.get(job_id)
+        if job is not None and job['status'] == 'running' and job['deadline'] and time.time() > job['deadline']:
+            # The worker is still busy, but the client gets its answer now
+            self.store.update(job_id, status='timed_out', finished_at=time.time(),
+                              error=f"Job exceeded its {self.timeout:g}s timeout")
+            job = self.store.get(job_id)
+        return job
+
+    def _start_workers(self):
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f'job-worker-{len(self._threads)}', daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _next_job(self):
+        with self._cond:
+            while True:
+                for item in self._pending:
+                    if self._running.get(item[3], 0) < self.tenant_concurrency:
+                        self._pending.remove(item)
+                        self._running[item[3]] = self._running.get(item[3], 0) + 1
+                        return item
+                self._cond.wait()
+
+    def _work(self):
+        while True:
+            job_id, kind, params, tenant = self._next_job()
+            try:
+                self._run(job_id, kind, params)
+            finally:
+                with self._cond:
+                    self._running[tenant] -= 1
+                    self._cond.notify_all()
+
+    def _run(self, job_id, kind, params):
+        started = time.time()
+        deadline = started + self.timeout
+        self.store.update(job_id, status='running', started_at=started, deadline=deadline)
+        try:
+            result = self._handlers[kind](JobContext(self, job_id, deadline), **params)
+            fields = {'status': 'succeeded', 'result': result}
+            if time.time() > deadline:
+                fields = {'status': 'timed_out', 'error': f"Job exceeded its {self.timeout:g}s timeout"}
+        except JobTimeoutError as e:
+            fields = {'status': 'timed_out', 'error': str(e)}
+        except Exception as e:
+            fields = {'status': 'failed', 'error': str(e)}
+        if self.store.get(job_id)['status'] != 'timed_out':
+            self.store.update(job_id, finished_at=time.time(), **fields)
+
+
+def run_analyze_resume_job(ctx, text, category):
+    ctx.progress(0, 1)
+    report = analyze_resume_text(text, category)
+    ctx.progress(1)
+    return report
+
+
+def run_analyze_batch_job(ctx, texts, category):
+    model = get_benchmark_model()
+    reports = [None] * len(texts)
+    ctx.progress(0, len(texts))
+
+    async def collect():
+        done = 0
+        async for i, report in analyze_batch(model, texts, category):
+            reports[i] = report
+            done += 1
+            ctx.progress(done)
+
+    asyncio.run(collect())
+    return {"results": reports}
+
+
+def run_dataset_rebuild_job(ctx):
+    ctx.progress(0, 1)
+    model = refit_benchmark_model(progress=ctx.check)
+    ctx.progress(1)
+    return {"model_version": model.version, "total_resumes": model.dataset_stats['total_resumes']}
+
+
+JOB_QUEUE = JobQueue(SqliteJobStore(JOB_DB) if JOB_DB else MemoryJobStore())
+JOB_QUEUE.register('analyze_resume', run_analyze_resume_job)
+JOB_QUEUE.register('analyze_batch', run_analyze_batch_job)
+JOB_QUEUE.register('dataset_rebuild', run_dataset_rebuild_job)
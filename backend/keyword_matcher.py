@@ -0,0 +1,110 @@
+from collections import deque
+
+
+class KeywordHits:
+    """
+    Result of one KeywordMatcher scan.
+    counts[pattern] matches str.count semantics (non-overlapping occurrences),
+    offsets[pattern] holds the start offset of each counted occurrence.
+    """
+
+    def __init__(self, offsets):
+        self.offsets = offsets
+        self.counts = {p: len(o) for p, o in offsets.items()}
+
+    def __contains__(self, pattern):
+        return pattern in self.offsets
+
+    def count(self, pattern):
+        return self.counts.get(pattern, 0)
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed vocabulary of lowercase keywords.
+    The trie is compiled into a full transition table at build time so a scan is
+    a single dict lookup per character of text, independent of the vocabulary size.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(dict.fromkeys(p.lower() for p in patterns if p))
+        self._pattern_set = frozenset(self.patterns)
+        self._build()
+
+    def __contains__(self, pattern):
+        return pattern in self._pattern_set
+
+    def _build(self):
+        goto = [{}]
+        outputs = [[]]
+        for idx, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(idx)
+
+        # Breadth-first pass resolves failure links and folds them into the transition table
+        fail = [0] * len(goto)
+        delta = [dict(edges) for edges in goto]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+            # Inherit transitions from the failure state so scans never backtrack
+            for ch, nxt in delta[fail[state]].items():
+                delta[state].setdefault(ch, nxt)
+        self._delta = delta
+        self._outputs = [tuple(o) for o in outputs]
+        self._lengths = [len(p) for p in self.patterns]
+
+    def scan(self, lower_text, word_boundary=False):
+        """
+        Find every vocabulary keyword in one pass over the text.
+        Args:
+            lower_text: Lowercased text to scan
+            word_boundary: Only accept hits not embedded in a larger word
+                (e.g. 'sql' does not match inside 'mysql')
+        Returns:
+            KeywordHits: Counts and offsets for each keyword found
+        """
+        delta = self._delta
+        outputs = self._outputs
+        lengths = self._lengths
+        patterns = self.patterns
+        offsets = {}
+        last_end = {}
+        text_len = len(lower_text)
+        state = 0
+        for end, ch in enumerate(lower_text, 1):
+            state = delta[state].get(ch, 0)
+            if not outputs[state]:
+                continue
+            for idx in outputs[state]:
+                start = end - lengths[idx]
+                if word_boundary and (
+                    (start > 0 and _is_word_char(lower_text[start - 1]))
+                    or (end < text_len and _is_word_char(lower_text[end]))
+                ):
+                    continue
+                # Skip occurrences overlapping the previous counted one, like str.count
+                if start < last_end.get(idx, 0):
+                    continue
+                last_end[idx] = end
+                offsets.setdefault(patterns[idx], []).append(start)
+        return KeywordHits(offsets)
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
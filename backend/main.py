@@ -1,15 +1,45 @@
-from fastapi import FastAPI, UploadFile, File, Form, Body
+import os
+import json
+import asyncio
+from typing import List
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, UploadFile, File, Form, Body, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from utils import allowed_file, extract_text, extract_resume_entities, get_benchmark_model, check_timeline_consistency, suggest_career_path_and_upskilling, detect_soft_skills, analyze_readability_ats
-import pandas as pd
-from collections import Counter
-import re
-from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
-import numpy as np
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from utils import allowed_file, extract_text, extract_resume_entities, get_benchmark_model, analyze_resume_text, result_cache_stats, UploadTooLargeError, PREVIEW_CHARS
+from utils import JD_REGISTRY, register_jd, match_resumes_to_jd, top_jds_for_resume, top_resumes_for_jd
+from batch import analyze_batch
+from ingest import append_resumes
+from jobs import JOB_QUEUE, FINISHED_STATUSES, JobLimitError
+from metrics import REGISTRY, PROFILER, MetricsMiddleware
+from serving import READINESS, ReadinessMiddleware, start_warm_up
 
-app = FastAPI()
+# Seconds between job state checks while streaming progress over SSE
+JOB_EVENT_POLL_SECONDS = 0.5
 
+def submit_job(kind, params, tenant):
+    try:
+        job = JOB_QUEUE.submit(kind, params, tenant=tenant or 'default')
+    except JobLimitError as e:
+        return JSONResponse(status_code=429, content={"error": str(e)})
+    return JSONResponse(status_code=202, content={"job_id": job["id"], "status": job["status"]})
+
+@asynccontextmanager
+async def lifespan(app):
+    # Background stack sampling, only when RESUME_ANALYZER_PROFILER_INTERVAL_MS is set. Started per
+    # process here rather than at import, so a preloading server's workers each get their own thread
+    PROFILER.start()
+    # Load the model and its indexes off the event loop; a no-op when a preloading master already did
+    start_warm_up()
+    yield
+    PROFILER.stop()
+
+app = FastAPI(lifespan=lifespan)
+
+# 503 for everything but probes and monitoring until the model is loaded (innermost, so its
+# responses still carry CORS headers)
+app.add_middleware(ReadinessMiddleware)
 # Allow CORS for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -18,35 +48,71 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Request latency / in-flight metrics for every route, exported at /metrics
+app.add_middleware(MetricsMiddleware)
 
 @app.get("/")
 def read_root():
     return {"message": "AI-Powered Resume Analyzer Backend"}
 
+@app.get("/healthz")
+def healthz():
+    """Liveness: the process is up and serving HTTP (the model may still be loading)."""
+    return {"status": "ok", "pid": os.getpid()}
+
+@app.get("/readyz")
+def readyz():
+    """Readiness: 200 once the model, indexes and caches are loaded, 503 while warming up or if that failed."""
+    state = READINESS.snapshot()
+    if state["status"] != "ready":
+        return JSONResponse(status_code=503, content=state)
+    return state
+
 @app.post("/upload_resume/")
 async def upload_resume(file: UploadFile = File(...)):
     if not allowed_file(file.filename):
         return JSONResponse(status_code=400, content={"error": "Unsupported file type"})
     try:
-        text = extract_text(file)
-        return {"filename": file.filename, "text": text[:1000]}  # Return first 1000 chars for preview
+        # Extraction stops once the preview is filled and runs off the event loop
+        text = await run_in_threadpool(extract_text, file, PREVIEW_CHARS)
+        return {"filename": file.filename, "text": text}
+    except UploadTooLargeError as e:
+        return JSONResponse(status_code=413, content={"error": str(e)})
     except Exception as e:
         return JSONResponse(status_code=400, content={"error": str(e)})
 
 @app.post("/upload_jd/")
 async def upload_jd(file: UploadFile = File(None), text: str = Form(None)):
+    """Extract a JD, register it for matching and return its id, detected skills and a text preview."""
     if file:
         if not allowed_file(file.filename):
             return JSONResponse(status_code=400, content={"error": "Unsupported file type"})
         try:
-            jd_text = extract_text(file)
-            return {"filename": file.filename, "text": jd_text[:1000]}
+            jd_text = await run_in_threadpool(extract_text, file)
+            jd = await run_in_threadpool(register_jd, jd_text, file.filename)
+            return {"filename": file.filename, "text": jd_text[:PREVIEW_CHARS], "jd_id": jd["id"], "skills": jd["skills"]}
+        except UploadTooLargeError as e:
+            return JSONResponse(status_code=413, content={"error": str(e)})
         except Exception as e:
             return JSONResponse(status_code=400, content={"error": str(e)})
     elif text:
-        return {"text": text[:1000]}
+        try:
+            jd = await run_in_threadpool(register_jd, text)
+        except Exception as e:
+            return JSONResponse(status_code=400, content={"error": str(e)})
+        return {"text": text[:PREVIEW_CHARS], "jd_id": jd["id"], "skills": jd["skills"]}
     return JSONResponse(status_code=400, content={"error": "No JD provided"})
 
+@app.get("/jds/")
+def list_jds():
+    return {"jds": JD_REGISTRY.list()}
+
+@app.delete("/jds/{jd_id}")
+def delete_jd(jd_id: str):
+    if not JD_REGISTRY.remove(jd_id):
+        return JSONResponse(status_code=404, content={"error": "Unknown JD"})
+    return {"deleted": jd_id}
+
 @app.post("/parse_resume/")
 async def parse_resume(text: str = Body(..., embed=True)):
     try:
@@ -58,180 +124,215 @@ async def parse_resume(text: str = Body(..., embed=True)):
 @app.post("/analyze_resume/")
 async def analyze_resume(text: str = Body(...), category: str = Body(...)):
     try:
-        model = get_benchmark_model()
-        result = model.compare_resume(text, category)
-        top_skills = model.get_category_skills(category)
-        # Add curated skills for this category, excluding stopwords
-        from utils import CATEGORY_SKILLS
-        curated_skills = [s.strip() for s in CATEGORY_SKILLS.get(category, "").split(",") if s.strip() and s.strip().lower() not in ENGLISH_STOP_WORDS]
-        # Timeline & Consistency Check
-        entities = extract_resume_entities(text)
-        timeline_report = check_timeline_consistency(entities.get('dates', []))
-        # Career Path Suggestions
-        missing_skills = [s for s in curated_skills if s not in result['matched_skills']]
-        career_suggestions = suggest_career_path_and_upskilling(category, missing_skills)
-        # Soft Skills Detection
-        soft_skills = detect_soft_skills(text)
-        # Readability & ATS Optimization
-        readability_ats_report = analyze_readability_ats(text, category, curated_skills)
-        return {
-            "similarity": result["similarity"],
-            "skill_match": result["skill_match"],
-            "matched_skills": result["matched_skills"],
-            "top_skills": top_skills,
-            "all_skills": curated_skills,
-            "timeline_report": timeline_report,
-            "career_suggestions": career_suggestions,
-            "soft_skills": soft_skills,
-            "readability_ats_report": readability_ats_report
-        }
+        return await run_in_threadpool(analyze_resume_text, text, category)
+    except Exception as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+@app.post("/rank_categories/")
+async def rank_categories(text: str = Body(None), texts: List[str] = Body(None), top_k: int = Body(5)):
+    """Top-k categories for one resume (`text`) or many (`texts`), in input order."""
+    resume_texts = ([text] if text else []) + (texts or [])
+    if not resume_texts:
+        return JSONResponse(status_code=400, content={"error": "No resume text provided"})
+    try:
+        model = await run_in_threadpool(get_benchmark_model)
+        rankings = await run_in_threadpool(model.rank_categories, resume_texts, top_k)
+        return {"rankings": rankings}
+    except Exception as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+@app.post("/match/")
+async def match(jd_id: str = Body(...), text: str = Body(None), texts: List[str] = Body(None)):
+    """Score one resume (`text`) or many (`texts`) against a registered JD, in input order."""
+    resume_texts = ([text] if text else []) + (texts or [])
+    if not resume_texts:
+        return JSONResponse(status_code=400, content={"error": "No resume text provided"})
+    try:
+        return {"jd_id": jd_id, "matches": await run_in_threadpool(match_resumes_to_jd, jd_id, resume_texts)}
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+@app.post("/match/top_k")
+async def match_top_k(text: str = Body(None), jd_id: str = Body(None), texts: List[str] = Body(None),
+                      jd_ids: List[str] = Body(None), top_k: int = Body(10)):
+    """
+    With `text`: the best registered JDs (optionally among `jd_ids`) for that resume.
+    With `jd_id`: the best resumes for that JD among `texts`, or across the whole corpus when omitted.
+    """
+    try:
+        if text:
+            return {"jds": await run_in_threadpool(top_jds_for_resume, text, top_k, jd_ids)}
+        if jd_id:
+            return {"resumes": await run_in_threadpool(top_resumes_for_jd, jd_id, texts, top_k)}
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return JSONResponse(status_code=400, content={"error": "Provide a resume `text` or a `jd_id`"})
+
+@app.post("/analyze_resumes/batch")
+async def analyze_resumes_batch(category: str = Form(...), texts: List[str] = Form(None), files: List[UploadFile] = File(None)):
+    """
+    Analyze many resumes (texts and/or uploaded files) against one category.
+    Streams one JSON object per line ({"index", "filename", ...report}) as each resume completes.
+    """
+    items = [(None, t) for t in texts or []]
+    for f in files or []:
+        if not allowed_file(f.filename):
+            return JSONResponse(status_code=400, content={"error": f"Unsupported file type: {f.filename}"})
+        try:
+            items.append((f.filename, await run_in_threadpool(extract_text, f)))
+        except UploadTooLargeError as e:
+            return JSONResponse(status_code=413, content={"error": f"{f.filename}: {e}"})
+        except Exception as e:
+            return JSONResponse(status_code=400, content={"error": f"{f.filename}: {e}"})
+    if not items:
+        return JSONResponse(status_code=400, content={"error": "No resumes provided"})
+    try:
+        model = await run_in_threadpool(get_benchmark_model)
     except Exception as e:
         return JSONResponse(status_code=400, content={"error": str(e)})
 
+    async def stream():
+        try:
+            async for i, report in analyze_batch(model, [t for _, t in items], category):
+                yield json.dumps({"index": i, "filename": items[i][0], **report}) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.post("/search_resumes/")
+async def search_resumes(query: str = Body(...), category: str = Body(None), top_k: int = Body(20), ranked: bool = Body(True)):
+    """
+    Boolean skill search over the corpus: AND / OR / NOT (upper case), parentheses, "quoted phrases"
+    and an optional trailing 'in <Category>'. Matches are ranked by BM25 unless ranked is false.
+    """
+    try:
+        model = await run_in_threadpool(get_benchmark_model)
+        return await run_in_threadpool(model.search_resumes, query, category, top_k, ranked)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/similar_resumes/")
+async def similar_resumes(text: str = Body(...), top_k: int = Body(10), category: str = Body(None)):
+    """
+    Corpus resumes most similar to a resume. Exact or LSH search over TF-IDF, hashed or SVD-reduced
+    vectors, as configured by the RESUME_ANALYZER_NEIGHBOR_* / SVD / LSH settings.
+    """
+    try:
+        model = await run_in_threadpool(get_benchmark_model)
+        return await run_in_threadpool(model.similar_resumes, text, top_k, category)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/dataset/append")
+async def dataset_append(records: List[dict] = Body(..., embed=True)):
+    """
+    Append resumes ({"category", "resume", "skills"?}) to the dataset.
+    Profiles and EDA aggregates are updated in place of a refit; the new model is swapped in atomically.
+    """
+    try:
+        return await run_in_threadpool(append_resumes, records)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/jobs/analyze_resume/")
+def submit_analyze_resume_job(text: str = Body(...), category: str = Body(...), x_tenant_id: str = Header(None)):
+    """Queue /analyze_resume/ as a background job and return its id."""
+    return submit_job('analyze_resume', {"text": text, "category": category}, x_tenant_id)
+
+@app.post("/jobs/analyze_batch/")
+def submit_analyze_batch_job(texts: List[str] = Body(...), category: str = Body(...), x_tenant_id: str = Header(None)):
+    """Queue a batch analysis; progress counts analyzed resumes."""
+    if not texts:
+        return JSONResponse(status_code=400, content={"error": "No resumes provided"})
+    return submit_job('analyze_batch', {"texts": texts, "category": category}, x_tenant_id)
+
+@app.post("/jobs/dataset_rebuild/")
+def submit_dataset_rebuild_job(x_tenant_id: str = Header(None)):
+    """Queue a full refit of the benchmark model on the current dataset."""
+    return submit_job('dataset_rebuild', {}, x_tenant_id)
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = JOB_QUEUE.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "Unknown job"})
+    return job
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    Server-sent events: 'progress' whenever the job state changes, then one 'done' event, or a final 'error'
+    event if the job disappears mid-stream.
+    """
+    if JOB_QUEUE.get(job_id) is None:
+        return JSONResponse(status_code=404, content={"error": "Unknown job"})
+
+    async def stream():
+        last = None
+        while True:
+            job = await run_in_threadpool(JOB_QUEUE.get, job_id)
+            if job is None:
+                # Purged (finished jobs expire) while the client was still listening
+                yield f"event: error\ndata: {json.dumps({'id': job_id, 'error': 'Unknown job'})}\n\n"
+                return
+            if job["status"] in FINISHED_STATUSES:
+                yield f"event: done\ndata: {json.dumps(job)}\n\n"
+                return
+            state = (job["status"], job["done"], job["total"])
+            if state != last:
+                last = state
+                progress = {k: job[k] for k in ("id", "status", "done", "total")}
+                yield f"event: progress\ndata: {json.dumps(progress)}\n\n"
+            await asyncio.sleep(JOB_EVENT_POLL_SECONDS)
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+@app.get("/cache_stats/")
+def cache_stats():
+    return result_cache_stats()
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus text exposition of request, analyzer-stage, model and cache metrics."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/metrics/profile")
+def metrics_profile(limit: int = 500, reset: bool = False):
+    """Folded stacks from the sampling profiler (flamegraph.pl / speedscope input), most frequent first."""
+    if not PROFILER.running:
+        return JSONResponse(status_code=404, content={"error": "Profiler disabled; set RESUME_ANALYZER_PROFILER_INTERVAL_MS"})
+    folded = PROFILER.folded(limit)
+    if reset:
+        PROFILER.reset()
+    return PlainTextResponse(folded)
+
 @app.get("/dataset_summary/")
 def dataset_summary():
     try:
         model = get_benchmark_model()
-        df = model.df
-        print('DF columns:', df.columns.tolist())
-        print('DF head:', df.head().to_dict())
-        summary = {
-            "total_resumes": len(df),
-            "unique_categories": len(df['Category'].unique()),
-            "top_skill": None
-        }
-        # Top N categories
-        top_categories = (
-            df['Category'].value_counts().head(10).reset_index().rename(columns={"index": "category", "Category": "count"})
-            .to_dict(orient="records")
-        )
-        # Resume length stats
-        resume_lengths = df['Resume'].astype(str).apply(lambda x: len(x.split()))
-        length_stats = {
-            "min": int(resume_lengths.min()),
-            "max": int(resume_lengths.max()),
-            "mean": float(resume_lengths.mean()),
-            "median": float(resume_lengths.median()),
-            "std": float(resume_lengths.std()),
-        }
-        # Most common words (excluding stopwords)
-        all_text = " ".join(df['Resume'].astype(str).tolist()).lower()
-        words = re.findall(r"\b\w+\b", all_text)
-        words = [w for w in words if w not in ENGLISH_STOP_WORDS and len(w) > 2]
-        top_words = Counter(words).most_common(20)
-        summary["top_skill"] = top_words[0][0] if top_words else None
-        top_words_list = [{"word": s, "count": c} for s, c in top_words]
-        # Skill frequency distribution (bar chart data)
-        skill_freq = dict(top_words)
-        # --- New EDA with Skills column ---
-        # 1. Top skills per category (from Skills column)
-        top_skills_per_category = {}
-        for cat in df['Category'].unique():
-            skills = df[df['Category'] == cat]['Skills'].iloc[0] if not df[df['Category'] == cat]['Skills'].isnull().all() else ""
-            top_skills_per_category[cat] = [s.strip() for s in skills.split(',') if s.strip()]
-
-        # 2. Skill frequency across all resumes (from curated skills)
-        all_skills = []
-        for skills in df['Skills'].dropna().unique():
-            all_skills.extend([s.strip() for s in skills.split(',') if s.strip()])
-        all_skills = list(set(all_skills))
-        skill_appearance = {skill: int(df['Resume'].str.lower().str.contains(skill.lower()).sum()) for skill in all_skills}
-        most_common_skills = [(skill, int(count)) for skill, count in sorted(skill_appearance.items(), key=lambda x: x[1], reverse=True)]
-        least_common_skills = [(skill, int(count)) for skill, count in sorted(skill_appearance.items(), key=lambda x: x[1])]
-
-        # 3. Skill coverage per category (what % of resumes in each category mention each curated skill)
-        skill_coverage_per_category = {}
-        for cat in df['Category'].unique():
-            cat_df = df[df['Category'] == cat]
-            skills = top_skills_per_category[cat]
-            coverage = {}
-            for skill in skills:
-                coverage[skill] = float(cat_df['Resume'].str.lower().str.contains(skill.lower()).mean())  # as fraction
-            skill_coverage_per_category[cat] = coverage
-
-        # 4. Heatmap: categories vs. curated skills (fraction of resumes mentioning each skill)
-        heatmap_categories = list(df['Category'].unique())
-        heatmap_skills = all_skills
-        heatmap_matrix = []
-        for cat in heatmap_categories:
-            cat_df = df[df['Category'] == cat]
-            row = [float(cat_df['Resume'].str.lower().str.contains(skill.lower()).mean()) for skill in heatmap_skills]
-            heatmap_matrix.append(row)
-
-        # Category-skill cross-tab (top 5 curated skills per top 5 categories, with coverage)
-        cross_tab = {}
-        for cat in df['Category'].value_counts().head(5).index:
-            skills = top_skills_per_category[cat][:5]
-            cat_df = df[df['Category'] == cat]
-            skill_rows = []
-            for skill in skills:
-                coverage = float(cat_df['Resume'].str.lower().str.contains(skill.lower()).mean())
-                skill_rows.append({"skill": skill, "coverage": coverage})
-            cross_tab[cat] = skill_rows
-
-        return {
-            "summary": summary,
-            "top_categories": top_categories,
-            "resume_length_stats": length_stats,
-            "top_words": top_words_list,
-            "skill_freq": skill_freq,
-            "category_skill_crosstab": cross_tab,
-            "top_skills_per_category": top_skills_per_category,
-            "skill_appearance": skill_appearance,
-            "most_common_skills": most_common_skills,
-            "least_common_skills": least_common_skills,
-            "skill_coverage_per_category": skill_coverage_per_category,
-            "heatmap_categories": heatmap_categories,
-            "heatmap_skills": heatmap_skills,
-            "heatmap_matrix": heatmap_matrix
-        }
+        return model.eda_snapshot["dataset_summary"]
     except Exception as e:
-        import traceback
-        print('Error in /dataset_summary:', traceback.format_exc())
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 @app.get("/resume_length_histogram/")
 def resume_length_histogram():
     model = get_benchmark_model()
-    df = model.df
-    resume_lengths = df['Resume'].astype(str).apply(lambda x: len(x.split()))
-    # Bin lengths (e.g., 0-100, 100-200, ...)
-    bins = list(range(0, int(resume_lengths.max()) + 100, 100))
-    hist, bin_edges = np.histogram(resume_lengths, bins=bins)
-    return {
-        "bins": [int(b) for b in bin_edges],
-        "counts": hist.tolist()
-    }
+    return model.eda_snapshot["resume_length_histogram"]
 
 @app.get("/category_skill_frequency/")
 def category_skill_frequency(category: str):
     model = get_benchmark_model()
-    df = model.df
-    cat_text = " ".join(df[df['Category'] == category]['Resume'].astype(str).tolist()).lower()
-    words = re.findall(r"\b\w+\b", cat_text)
-    words = [w for w in words if w not in ENGLISH_STOP_WORDS and len(w) > 2]
-    top_words = Counter(words).most_common(20)
-    return {"category": category, "top_words": [{"word": w, "count": c} for w, c in top_words]}
+    top_words = model.eda_snapshot["category_skill_frequency"].get(category, [])
+    return {"category": category, "top_words": top_words}
 
 @app.get("/skill_category_heatmap/")
 def skill_category_heatmap():
     model = get_benchmark_model()
-    df = model.df
-    all_text = " ".join(df['Resume'].astype(str).tolist()).lower()
-    words = re.findall(r"\b\w+\b", all_text)
-    words = [w for w in words if w not in ENGLISH_STOP_WORDS and len(w) > 2]
-    top_skills = [w for w, _ in Counter(words).most_common(10)]
-    top_categories = df['Category'].value_counts().head(5).index.tolist()
-    matrix = []
-    for cat in top_categories:
-        cat_text = " ".join(df[df['Category'] == cat]['Resume'].astype(str).tolist()).lower()
-        cat_words = re.findall(r"\b\w+\b", cat_text)
-        cat_words = [w for w in cat_words if w not in ENGLISH_STOP_WORDS and len(w) > 2]
-        cat_counter = Counter(cat_words)
-        row = [cat_counter.get(skill, 0) for skill in top_skills]
-        matrix.append(row)
-    return {
-        "categories": top_categories,
-        "skills": top_skills,
-        "matrix": matrix
-    } 
\ No newline at end of file
+    return model.eda_snapshot["skill_category_heatmap"]
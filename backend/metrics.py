@@ -0,0 +1,310 @@
+import os
+import sys
+import time
+import bisect
+import threading
+from collections import Counter as TallyCounter
+from contextlib import contextmanager
+from functools import wraps
+
+# Upper bounds (seconds) of the latency histogram buckets, shared by requests and analyzer stages
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Set RESUME_ANALYZER_PROFILER_INTERVAL_MS (e.g. 10) to sample every thread's stack in the background
+PROFILER_INTERVAL_MS = float(os.environ.get('RESUME_ANALYZER_PROFILER_INTERVAL_MS', '0'))
+PROFILER_MAX_DEPTH = int(os.environ.get('RESUME_ANALYZER_PROFILER_MAX_DEPTH', '40'))
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"'))
+        for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}  # label values tuple -> value (or histogram state)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """[(name suffix, ((label, value), ...), value)] for the exposition format."""
+        with self._lock:
+            return [('', tuple(zip(self.labelnames, key)), value) for key, value in self._values.items()]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        # Per-bucket (non-cumulative) counts; the +Inf bucket is the last slot
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][slot] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        out = []
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        for key, counts, total in items:
+            labels = tuple(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                out.append(('_bucket', labels + (('le', _format_value(bound)),), cumulative))
+            out.append(('_sum', labels, total))
+            out.append(('_count', labels, cumulative))
+        return out
+
+
+class MetricsRegistry:
+    """
+    In-process metrics rendered in the Prometheus text exposition format.
+    Metrics are updated on the request path; collectors are callables run at scrape time for
+    values that already live elsewhere (e.g. cache statistics), so they cost nothing per request.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector):
+        """
+        Add a scrape-time collector.
+        Args:
+            collector: Callable returning [(name, kind, help, [(labels dict, value)])]
+        """
+        self._collectors.append(collector)
+
+    def render(self):
+        families = [(m.name, m.kind, m.documentation, m.samples()) for m in list(self._metrics.values())]
+        for collector in self._collectors:
+            for name, kind, documentation, values in collector():
+                families.append((name, kind, documentation,
+                                 [('', tuple(labels.items()), value) for labels, value in values]))
+        lines = []
+        for name, kind, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+REQUEST_SECONDS = REGISTRY.histogram(
+    'resume_analyzer_http_request_duration_seconds', 'HTTP request latency by route', ['method', 'route', 'status'])
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    'resume_analyzer_http_requests_in_flight', 'HTTP requests currently being served', ['method'])
+ANALYZER_SECONDS = REGISTRY.histogram(
+    'resume_analyzer_analyzer_duration_seconds', 'Wall time per analyzer call (nested calls are counted in both)',
+    ['analyzer'])
+ANALYZER_ERRORS = REGISTRY.counter(
+    'resume_analyzer_analyzer_errors_total', 'Analyzer calls that raised', ['analyzer'])
+STAGE_SECONDS = REGISTRY.histogram(
+    'resume_analyzer_stage_duration_seconds',
+    'Wall time per stage of a resume analysis (spaCy parse, TF-IDF transform, keyword scan, ...)', ['stage'])
+MODEL_LOAD_SECONDS = REGISTRY.gauge(
+    'resume_analyzer_model_load_seconds', 'Wall time of the most recent model build', ['source'])
+MODEL_LOADS = REGISTRY.counter(
+    'resume_analyzer_model_loads_total', 'Models built, from saved artifacts or by fitting', ['source'])
+WARM_UP_SECONDS = REGISTRY.gauge(
+    'resume_analyzer_warm_up_seconds', 'Wall time of each startup warm-up step', ['component'])
+READY = REGISTRY.gauge(
+    'resume_analyzer_ready', '1 once startup warm-up has finished and requests are served, else 0')
+
+
+def instrumented(analyzer):
+    """Decorator recording call latency and errors of a function under ANALYZER_SECONDS{analyzer=...}."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                ANALYZER_ERRORS.inc(analyzer=analyzer)
+                raise
+            finally:
+                ANALYZER_SECONDS.observe(time.perf_counter() - start, analyzer=analyzer)
+        return wrapper
+    return decorate
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request by method, route template and status code.
+    Paths that match no route are reported as route="unmatched" to keep label cardinality bounded.
+    """
+
+    def __init__(self, app, exclude_paths=('/metrics',)):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        method = scope['method']
+        status = [500]
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+            await send(message)
+
+        # The route is only known once the router has matched, so in-flight is tracked per method
+        REQUESTS_IN_FLIGHT.inc(method=method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec(method=method)
+            route = getattr(scope.get('route'), 'path', None) or 'unmatched'
+            REQUEST_SECONDS.observe(time.perf_counter() - start, method=method, route=route, status=status[0])
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler: a daemon thread snapshots every other thread's stack each interval and
+    tallies them as folded stacks ('module:function;module:function ...'), the input format of
+    flamegraph.pl and speedscope. Overhead scales with the interval, not with request volume.
+    """
+
+    def __init__(self, interval_ms=PROFILER_INTERVAL_MS, max_depth=PROFILER_MAX_DEPTH):
+        self.interval = interval_ms / 1000.0
+        self.max_depth = max_depth
+        self.samples = 0
+        self._stacks = TallyCounter()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running or self.interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            stacks = []
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                names = []
+                while frame is not None and len(names) < self.max_depth:
+                    code = frame.f_code
+                    names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                    frame = frame.f_back
+                stacks.append(';'.join(reversed(names)))
+            with self._lock:
+                self._stacks.update(stacks)
+                self.samples += 1
+
+    def folded(self, limit=None):
+        """Folded stacks with their sample counts, most frequent first."""
+        with self._lock:
+            top = self._stacks.most_common(limit)
+        return ''.join(f"{stack} {count}\n" for stack, count in top)
+
+    def reset(self):
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+
+
+PROFILER = SamplingProfiler()
@@ -0,0 +1,120 @@
+import os
+import json
+import shutil
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Bump when the artifact layout changes so stale directories on disk are ignored
+MODEL_ARTIFACT_VERSION = 2
+
+META_FILE = 'meta.json'
+IDF_FILE = 'idf.npy'
+PROFILES_FILE = 'profile_matrix.npy'
+SUMS_FILE = 'profile_sums.npy'
+
+
+def model_artifacts_path(cache_dir, fingerprint):
+    return os.path.join(cache_dir, f"model_v{MODEL_ARTIFACT_VERSION}_{fingerprint[:16]}")
+
+
+def save_model_artifacts(path, fingerprint, vectorizer_params, vectorizer, categories, profile_matrix,
+                         profile_sums, category_top_skills, dataset_stats, overwrite=False):
+    """
+    Persist a fitted benchmark model as plain .npy arrays plus a JSON manifest.
+    Arrays are stored uncompressed so they can be memory-mapped and shared between worker processes.
+    Args:
+        path: Target directory (written atomically)
+        fingerprint: Hash of the dataset the model was fitted on
+        vectorizer_params: Constructor kwargs of the TfidfVectorizer
+        vectorizer: Fitted TfidfVectorizer
+        categories: Category names in profile_matrix row order
+        profile_matrix: L2-normalized category profiles (n_categories x n_features)
+        profile_sums: Un-normalized per-category TF-IDF sums, so appended resumes can be folded in
+        category_top_skills: {category: [top terms]}
+        dataset_stats: Small JSON-serializable summary of the dataset
+        overwrite: Replace an existing directory (used by refits of the same dataset)
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    np.save(os.path.join(tmp_path, IDF_FILE), np.asarray(vectorizer.idf_))
+    np.save(os.path.join(tmp_path, PROFILES_FILE), np.ascontiguousarray(profile_matrix))
+    np.save(os.path.join(tmp_path, SUMS_FILE), np.ascontiguousarray(profile_sums))
+    meta = {
+        "version": MODEL_ARTIFACT_VERSION,
+        "fingerprint": fingerprint,
+        "vectorizer_params": vectorizer_params,
+        "terms": vectorizer.get_feature_names_out().tolist(),
+        "categories": list(categories),
+        "category_top_skills": category_top_skills,
+        "dataset_stats": dataset_stats,
+    }
+    with open(os.path.join(tmp_path, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    old_path = None
+    if overwrite and os.path.isdir(path):
+        # Move the old directory aside first; readers holding memory maps keep their open files
+        old_path = f"{path}.{os.getpid()}.old"
+        shutil.rmtree(old_path, ignore_errors=True)
+        os.replace(path, old_path)
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        # Another worker published the same artifacts first
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    if old_path is not None:
+        shutil.rmtree(old_path, ignore_errors=True)
+
+
+def load_model_artifacts(path, fingerprint, vectorizer_params, mmap=True):
+    """
+    Load persisted model artifacts if they match the dataset fingerprint and vectorizer config.
+    Args:
+        path: Artifact directory
+        fingerprint: Expected dataset hash
+        vectorizer_params: Expected TfidfVectorizer kwargs
+        mmap: Memory-map the arrays read-only instead of copying them into the process
+    Returns:
+        dict or None: { 'vectorizer', 'categories', 'profile_matrix', 'profile_sums', 'category_top_skills',
+            'dataset_stats' }
+    """
+    try:
+        with open(os.path.join(path, META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        # Compared in their JSON form: tuples such as ngram_range are stored as lists
+        if (meta.get('version') != MODEL_ARTIFACT_VERSION or meta.get('fingerprint') != fingerprint
+                or meta.get('vectorizer_params') != json.loads(json.dumps(vectorizer_params))):
+            return None
+        mmap_mode = 'r' if mmap else None
+        idf = np.load(os.path.join(path, IDF_FILE), mmap_mode=mmap_mode)
+        profile_matrix = np.load(os.path.join(path, PROFILES_FILE), mmap_mode=mmap_mode)
+        profile_sums = np.load(os.path.join(path, SUMS_FILE), mmap_mode=mmap_mode)
+    except (OSError, ValueError):
+        return None
+    return {
+        "vectorizer": restore_vectorizer(vectorizer_params, meta['terms'], idf),
+        "categories": meta['categories'],
+        "profile_matrix": profile_matrix,
+        "profile_sums": profile_sums,
+        "category_top_skills": meta['category_top_skills'],
+        "dataset_stats": meta['dataset_stats'],
+    }
+
+
+def restore_vectorizer(vectorizer_params, terms, idf):
+    """Rebuild a fitted TfidfVectorizer from its vocabulary and IDF weights without refitting."""
+    vectorizer = TfidfVectorizer(**vectorizer_params)
+    vectorizer.vocabulary_ = {term: i for i, term in enumerate(terms)}
+    vectorizer.idf_ = idf
+    return vectorizer
+
+
+if __name__ == '__main__':
+    # Build step: fit (or validate) the artifacts for the configured dataset ahead of serving
+    import time
+    from utils import ResumeBenchmarkModel, get_skill_index
+    start = time.perf_counter()
+    model = ResumeBenchmarkModel()
+    model.neighbor_index
+    get_skill_index()
+    print(f"Model artifacts ready at {model.artifacts_path} ({time.perf_counter() - start:.2f}s)")
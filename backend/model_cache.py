@@ -0,0 +1,41 @@
+import threading
+from functools import wraps
+
+
+def model_cached(method):
+    """
+    Memoize a ResumeBenchmarkModel method per model instance.
+    Results live on the instance, so a refitted or reloaded model never serves stale entries;
+    call clear_model_cache(model) to drop them explicitly. Cached values are shared between
+    callers and must be treated as read-only. Arguments must be hashable.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = _instance_cache(self)
+        key = (name, args, tuple(sorted(kwargs.items())))
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        result = method(self, *args, **kwargs)
+        cache[key] = result
+        return result
+
+    return wrapper
+
+
+def clear_model_cache(model):
+    _instance_cache(model).clear()
+
+
+_init_lock = threading.Lock()
+
+
+def _instance_cache(model):
+    cache = model.__dict__.get('_model_cache')
+    if cache is None:
+        with _init_lock:
+            cache = model.__dict__.setdefault('_model_cache', {})
+    return cache
@@ -0,0 +1,380 @@
+import os
+import json
+import shutil
+import numpy as np
+from scipy.sparse import csr_matrix, issparse, vstack
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from result_cache import content_hash
+
+# Bump when the index layout changes so stale directories on disk are ignored
+NEIGHBOR_INDEX_VERSION = 1
+# Resume vectors: 'tfidf' reuses the category model's fitted vectorizer, 'hashing' needs no vocabulary
+# at all (appends and refits never invalidate it). SVD components > 0 reduce either to dense vectors.
+NEIGHBOR_VECTORS = os.environ.get('RESUME_ANALYZER_NEIGHBOR_VECTORS', 'tfidf')
+HASHING_FEATURES = int(os.environ.get('RESUME_ANALYZER_HASHING_FEATURES', str(1 << 18)))
+SVD_COMPONENTS = int(os.environ.get('RESUME_ANALYZER_SVD_COMPONENTS', '0'))
+# 'exact' scores every resume with blocked matrix products; 'lsh' only re-ranks hash-bucket candidates
+NEIGHBOR_INDEX = os.environ.get('RESUME_ANALYZER_NEIGHBOR_INDEX', 'exact')
+LSH_TABLES = int(os.environ.get('RESUME_ANALYZER_LSH_TABLES', '16'))
+LSH_BITS = int(os.environ.get('RESUME_ANALYZER_LSH_BITS', '12'))
+# Extra buckets probed per table: the query's bucket with one of its least certain bits flipped
+LSH_PROBES = int(os.environ.get('RESUME_ANALYZER_LSH_PROBES', '2'))
+LSH_SEED = 0
+# Rows scored per matrix product by the exact scan and by LSH hashing (bounds temporary memory)
+BLOCK_ROWS = 32768
+# Wider vectors (hashed vocabularies) are folded to this many dimensions with a random-sign count
+# sketch before LSH projection, which keeps the Gaussian hyperplanes small
+SKETCH_DIM = 16384
+
+META_FILE = 'meta.json'
+
+
+def neighbor_index_path(cache_dir, fingerprint, settings):
+    key = content_hash(json.dumps(settings, sort_keys=True))
+    return os.path.join(cache_dir, f"neighbors_v{NEIGHBOR_INDEX_VERSION}_{fingerprint[:16]}_{key[:8]}")
+
+
+def neighbor_settings(vectorizer_params, vectorizer):
+    """
+    Index configuration from the environment. Stored with the index, which is only reused while it matches.
+    Args:
+        vectorizer_params: TfidfVectorizer kwargs of the category model (stop words and n-grams are shared)
+        vectorizer: Fitted TfidfVectorizer of the category model
+    Returns:
+        dict: JSON-serializable settings
+    """
+    settings = {
+        "vectors": NEIGHBOR_VECTORS,
+        "svd_components": SVD_COMPONENTS,
+        "method": NEIGHBOR_INDEX,
+        "lsh_tables": LSH_TABLES,
+        "lsh_bits": LSH_BITS,
+        "seed": LSH_SEED,
+    }
+    if NEIGHBOR_VECTORS == 'hashing':
+        settings["n_features"] = HASHING_FEATURES
+        settings["stop_words"] = vectorizer_params.get('stop_words')
+        settings["ngram_range"] = list(vectorizer_params.get('ngram_range', (1, 1)))
+    else:
+        # A refit changes the vocabulary and IDF weights without changing the dataset hash
+        settings["vocabulary"] = content_hash('\n'.join(vectorizer.get_feature_names_out()),
+                                              np.asarray(vectorizer.idf_).tobytes())
+    return settings
+
+
+class ResumeEncoder:
+    """
+    Text -> unit-length vectors compared by the neighbour index: sparse TF-IDF or hashed term
+    vectors, optionally projected onto TruncatedSVD components (dense, low-dimensional float32).
+    """
+
+    def __init__(self, vectorizer, components=None):
+        self.vectorizer = vectorizer
+        self.components = components
+
+    @classmethod
+    def create(cls, settings, vectorizer, components=None):
+        if settings['vectors'] == 'tfidf':
+            return cls(vectorizer, components)
+        if settings['vectors'] == 'hashing':
+            hashing = HashingVectorizer(stop_words=settings['stop_words'], ngram_range=tuple(settings['ngram_range']),
+                                        n_features=settings['n_features'], alternate_sign=False)
+            return cls(hashing, components)
+        raise ValueError(f"Unknown neighbour vectors: {settings['vectors']}")
+
+    def fit_svd(self, term_vectors, n_components, seed=LSH_SEED):
+        n_components = min(n_components, term_vectors.shape[1] - 1)
+        svd = TruncatedSVD(n_components=n_components, random_state=seed).fit(term_vectors)
+        self.components = np.ascontiguousarray(svd.components_, dtype=np.float32)
+
+    def project(self, term_vectors):
+        """Term vectors (rows of vectorizer.transform) as L2-normalized float32 index vectors."""
+        if self.components is None:
+            return normalize(csr_matrix(term_vectors, dtype=np.float32))
+        return normalize(np.asarray(term_vectors @ self.components.T, dtype=np.float32))
+
+    def encode(self, texts):
+        return self.project(self.vectorizer.transform(texts))
+
+
+class RandomProjectionLSH:
+    """
+    Sign-random-projection hashing for cosine similarity. Each of `tables` hash tables keys a vector
+    by the signs of its projections on `bits` random hyperplanes, so vectors at a small angle share a
+    bucket with high probability. A table is its keys sorted plus the row ids in that order: a bucket
+    lookup is a binary search, and appending resumes re-sorts arrays instead of rebuilding.
+    Hyperplanes are regenerated from the seed, so only the keys are persisted.
+    """
+
+    def __init__(self, dim, tables, bits, seed, keys=None, ids=None):
+        self.dim = dim
+        self.tables = tables
+        self.bits = bits
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self.sketch = _count_sketch(dim, SKETCH_DIM, rng) if dim > SKETCH_DIM else None
+        self.planes = rng.standard_normal((min(dim, SKETCH_DIM), tables * bits), dtype=np.float32)
+        self.keys = keys  # tables x n, sorted along each row
+        self.ids = ids  # tables x n row ids in key order
+
+    @classmethod
+    def build(cls, vectors, tables, bits, seed=LSH_SEED):
+        lsh = cls(vectors.shape[1], tables, bits, seed)
+        lsh.keys, lsh.ids = _sort_tables(lsh.hash(vectors), np.arange(vectors.shape[0], dtype=np.int32))
+        return lsh
+
+    def hash(self, vectors):
+        """(n x tables) int64 bucket keys of each vector."""
+        keys = [self._keys(self._project(_row_block(vectors, start, start + BLOCK_ROWS)) > 0)
+                for start in range(0, vectors.shape[0], BLOCK_ROWS)]
+        return np.vstack(keys) if keys else np.zeros((0, self.tables), dtype=np.int64)
+
+    def _project(self, vectors):
+        if self.sketch is not None:
+            vectors = vectors @ self.sketch
+        return _dense(vectors @ self.planes)
+
+    def _keys(self, signs):
+        signs = signs.reshape(len(signs), self.tables, self.bits).astype(np.int64)
+        return (signs << np.arange(self.bits, dtype=np.int64)).sum(axis=2)
+
+    def candidates(self, query, probes=LSH_PROBES):
+        """Sorted ids of the rows sharing a probed bucket with the query (1 x dim) in any table."""
+        projection = self._project(query).reshape(self.tables, self.bits)
+        keys = self._keys(projection.reshape(1, -1) > 0).reshape(self.tables, 1)
+        probes = min(probes, self.bits)
+        if probes:
+            # Bits whose projection is closest to zero are the likeliest to differ for a near neighbour
+            uncertain = np.argsort(np.abs(projection), axis=1)[:, :probes]
+            keys = np.hstack([keys, keys ^ (np.int64(1) << uncertain.astype(np.int64))])
+        found = []
+        for t in range(self.tables):
+            starts = np.searchsorted(self.keys[t], keys[t], side='left')
+            ends = np.searchsorted(self.keys[t], keys[t], side='right')
+            found.extend(self.ids[t][a:b] for a, b in zip(starts, ends) if b > a)
+        return np.unique(np.concatenate(found)) if found else np.zeros(0, dtype=np.int32)
+
+    def with_appended(self, vectors, first_id):
+        ids = np.arange(first_id, first_id + vectors.shape[0], dtype=np.int32)
+        new_keys, new_ids = self.hash(vectors).T, np.broadcast_to(ids, (self.tables, len(ids)))
+        order = np.argsort(np.hstack([self.keys, new_keys]), axis=1, kind='stable')
+        keys = np.take_along_axis(np.hstack([self.keys, new_keys]), order, axis=1)
+        ids = np.take_along_axis(np.hstack([self.ids, new_ids]), order, axis=1)
+        return RandomProjectionLSH(self.dim, self.tables, self.bits, self.seed, keys, ids)
+
+
+class NeighborIndex:
+    """
+    Most similar corpus resumes by cosine similarity; row i is corpus resume id i.
+    The exact method scores every resume with blocked matrix products. The LSH method scores only
+    the resumes sharing a bucket with the query, trading a little recall for latency that grows
+    with bucket sizes rather than with the corpus.
+    """
+
+    def __init__(self, settings, encoder, vectors, doc_categories, categories, lsh=None):
+        self.settings = settings
+        self.encoder = encoder
+        self.vectors = vectors
+        self.doc_categories = doc_categories
+        self.categories = list(categories)
+        self.lsh = lsh
+
+    @classmethod
+    def build(cls, settings, encoder, term_vectors, row_categories):
+        """
+        Index the corpus.
+        Args:
+            settings: neighbor_settings() (method, SVD components, LSH tables/bits/seed)
+            encoder: ResumeEncoder whose vectorizer produced term_vectors (SVD is fitted here)
+            term_vectors: Sparse term vectors of every corpus resume, in corpus order
+            row_categories: Category of every corpus resume
+        Returns:
+            NeighborIndex
+        """
+        if settings['method'] not in ('exact', 'lsh'):
+            raise ValueError(f"Unknown neighbour index method: {settings['method']}")
+        if settings['svd_components'] > 0:
+            encoder.fit_svd(term_vectors, settings['svd_components'], settings['seed'])
+        vectors = encoder.project(term_vectors)
+        categories = list(dict.fromkeys(row_categories))
+        codes = {c: i for i, c in enumerate(categories)}
+        doc_categories = np.asarray([codes[c] for c in row_categories], dtype=np.int16)
+        lsh = None
+        if settings['method'] == 'lsh':
+            lsh = RandomProjectionLSH.build(vectors, settings['lsh_tables'], settings['lsh_bits'], settings['seed'])
+        return cls(settings, encoder, vectors, doc_categories, categories, lsh)
+
+    @property
+    def method(self):
+        return 'exact' if self.lsh is None else 'lsh'
+
+    @property
+    def num_docs(self):
+        return self.vectors.shape[0]
+
+    def search(self, text, top_k=10, category=None, probes=LSH_PROBES):
+        """
+        Most similar corpus resumes to a resume text.
+        Returns:
+            tuple: (ids, similarities, number of resumes scored), best first
+        """
+        return self.query(self.encoder.encode([text]), top_k, category, probes)
+
+    def query(self, vector, top_k=10, category=None, probes=LSH_PROBES):
+        """search() for an already encoded query (1 x dim)."""
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        code = self._category_code(category)
+        if self.lsh is None:
+            ids, scores = self.exact(vector, top_k, code)
+            ids, scores = ids[0], scores[0]
+            scored = self.num_docs
+        else:
+            ids = self.lsh.candidates(vector, probes)
+            if code is not None:
+                ids = ids[np.asarray(self.doc_categories)[ids] == code]
+            scored = len(ids)
+            scores = _dense(self.vectors[ids] @ _dense(vector).T)[:, 0] if len(ids) else np.zeros(0)
+            top = _top_k(scores, top_k)
+            ids, scores = ids[top], scores[top]
+        keep = np.isfinite(scores)
+        return ids[keep], scores[keep], scored
+
+    def exact(self, queries, top_k, category_code=None):
+        """
+        Blocked exact scan for many queries at once.
+        Args:
+            queries: Encoded queries (m x dim)
+            top_k: Neighbours per query
+            category_code: Only score resumes of this category code
+        Returns:
+            tuple: (ids, similarities) arrays of shape m x min(top_k, num_docs), best first;
+                -inf similarities pad results when the category has fewer resumes
+        """
+        queries = _dense(queries).T
+        best_ids = np.zeros((queries.shape[1], 0), dtype=np.int64)
+        best_scores = np.zeros((queries.shape[1], 0), dtype=np.float32)
+        for start in range(0, self.num_docs, BLOCK_ROWS):
+            scores = _dense(_row_block(self.vectors, start, start + BLOCK_ROWS) @ queries).T
+            if category_code is not None:
+                scores[:, np.asarray(self.doc_categories[start:start + BLOCK_ROWS]) != category_code] = -np.inf
+            k = min(top_k, scores.shape[1])
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            best_ids = np.hstack([best_ids, top + start])
+            best_scores = np.hstack([best_scores, np.take_along_axis(scores, top, axis=1)])
+        order = np.argsort(-best_scores, axis=1, kind='stable')[:, :top_k]
+        return np.take_along_axis(best_ids, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+    def category_of(self, doc_id):
+        return self.categories[self.doc_categories[doc_id]]
+
+    def _category_code(self, category):
+        if category is None:
+            return None
+        if category not in self.categories:
+            raise ValueError(f"Unknown category: {category}")
+        return self.categories.index(category)
+
+    def with_appended(self, texts, categories):
+        """Return a new index that also covers appended resumes (ids continue after the last one)."""
+        vectors = self.encoder.encode(texts)
+        all_categories = list(self.categories)
+        for c in categories:
+            if c not in all_categories:
+                all_categories.append(c)
+        codes = np.asarray([all_categories.index(c) for c in categories], dtype=np.int16)
+        stacked = vstack([self.vectors, vectors]).tocsr() if issparse(vectors) else np.vstack([self.vectors, vectors])
+        lsh = None if self.lsh is None else self.lsh.with_appended(vectors, self.num_docs)
+        return NeighborIndex(self.settings, self.encoder, stacked,
+                             np.concatenate([self.doc_categories, codes]), all_categories, lsh)
+
+    def save(self, path, fingerprint):
+        """Persist vectors, categories, SVD components and LSH tables as .npy files (written atomically)."""
+        arrays = {'doc_categories': np.asarray(self.doc_categories, dtype=np.int16)}
+        if issparse(self.vectors):
+            arrays.update(data=self.vectors.data, indices=self.vectors.indices, indptr=self.vectors.indptr)
+        else:
+            arrays['vectors'] = self.vectors
+        if self.encoder.components is not None:
+            arrays['components'] = self.encoder.components
+        if self.lsh is not None:
+            arrays.update(lsh_keys=self.lsh.keys, lsh_ids=self.lsh.ids)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_path, f"{name}.npy"), np.ascontiguousarray(array))
+        meta = {
+            "version": NEIGHBOR_INDEX_VERSION,
+            "fingerprint": fingerprint,
+            "settings": self.settings,
+            "shape": list(self.vectors.shape),
+            "arrays": list(arrays),
+            "categories": self.categories,
+        }
+        with open(os.path.join(tmp_path, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path, fingerprint, settings, vectorizer):
+        """Load a persisted index if it matches the dataset fingerprint and settings, else None."""
+        try:
+            with open(os.path.join(path, META_FILE), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if (meta.get('version') != NEIGHBOR_INDEX_VERSION or meta.get('fingerprint') != fingerprint
+                    or meta.get('settings') != settings):
+                return None
+            arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in meta['arrays']}
+        except (OSError, ValueError):
+            return None
+        if 'vectors' in arrays:
+            vectors = arrays['vectors']
+        else:
+            vectors = csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']), shape=tuple(meta['shape']))
+        encoder = ResumeEncoder.create(settings, vectorizer, arrays.get('components'))
+        lsh = None
+        if 'lsh_keys' in arrays:
+            lsh = RandomProjectionLSH(vectors.shape[1], settings['lsh_tables'], settings['lsh_bits'], settings['seed'],
+                                      arrays['lsh_keys'], arrays['lsh_ids'])
+        return cls(settings, encoder, vectors, arrays['doc_categories'], meta['categories'], lsh)
+
+
+def _count_sketch(dim, sketch_dim, rng):
+    # Each input dimension maps to one output dimension with a random sign; inner products are
+    # preserved in expectation
+    signs = rng.choice(np.array([-1.0, 1.0], dtype=np.float32), dim)
+    return csr_matrix((signs, (np.arange(dim), rng.integers(0, sketch_dim, dim))), shape=(dim, sketch_dim))
+
+
+def _sort_tables(keys, ids):
+    keys = np.ascontiguousarray(keys.T)
+    order = np.argsort(keys, axis=1, kind='stable')
+    return np.take_along_axis(keys, order, axis=1), ids[order].astype(np.int32)
+
+
+def _row_block(matrix, start, stop):
+    """Rows start:stop without copying (CSR slicing would copy the block's data and indices)."""
+    if not issparse(matrix):
+        return matrix[start:stop]
+    stop = min(stop, matrix.shape[0])
+    a, b = matrix.indptr[start], matrix.indptr[stop]
+    return csr_matrix((matrix.data[a:b], matrix.indices[a:b], matrix.indptr[start:stop + 1] - a),
+                      shape=(stop - start, matrix.shape[1]), copy=False)
+
+
+def _dense(matrix):
+    return matrix.toarray() if issparse(matrix) else np.asarray(matrix)
+
+
+def _top_k(scores, k):
+    k = min(k, len(scores))
+    if k == 0:
+        return np.zeros(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
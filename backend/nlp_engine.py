@@ -0,0 +1,99 @@
+import os
+import threading
+
+SPACY_MODEL = os.environ.get('RESUME_ANALYZER_SPACY_MODEL', 'en_core_web_sm')
+# Only NER output (ORG/DATE entities) is used, so everything else in the pipeline is skipped
+SPACY_EXCLUDE = [
+    name.strip()
+    for name in os.environ.get(
+        'RESUME_ANALYZER_SPACY_EXCLUDE', 'parser,tagger,attribute_ruler,lemmatizer,senter'
+    ).split(',')
+    if name.strip()
+]
+# Longer texts are parsed in chunks of about this many characters to bound peak memory
+SPACY_MAX_CHUNK_CHARS = int(os.environ.get('RESUME_ANALYZER_SPACY_MAX_CHUNK_CHARS', '20000'))
+
+
+class NLPEngine:
+    """
+    Lazily loaded spaCy pipeline trimmed down to what entity extraction needs.
+    The model is loaded on first use (not at import time), long texts are split into chunks
+    and re-assembled into one Doc, and pipe() offers a batched entry point.
+    """
+
+    def __init__(self, model_name=SPACY_MODEL, exclude=None, max_chunk_chars=SPACY_MAX_CHUNK_CHARS):
+        self.model_name = model_name
+        self.exclude = list(SPACY_EXCLUDE if exclude is None else exclude)
+        self.max_chunk_chars = max_chunk_chars
+        self._nlp = None
+        self._load_error = None
+        self._lock = threading.Lock()
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            with self._lock:
+                if self._nlp is None and self._load_error is None:
+                    self._load()
+        if self._nlp is None:
+            raise RuntimeError(f"spaCy model not loaded. Run: python -m spacy download {self.model_name}")
+        return self._nlp
+
+    @property
+    def available(self):
+        try:
+            self.nlp
+        except RuntimeError:
+            return False
+        return True
+
+    def _load(self):
+        import spacy
+        try:
+            self._nlp = spacy.load(self.model_name, exclude=self.exclude)
+        except OSError as e:
+            self._load_error = e
+
+    def __call__(self, text):
+        chunks = self._chunk(text)
+        if len(chunks) == 1:
+            return self.nlp(text)
+        return self._merge(list(self.nlp.pipe(chunks)))
+
+    def pipe(self, texts, n_process=1, batch_size=16):
+        """
+        Parse many texts with nlp.pipe, yielding one Doc per input text in order.
+        """
+        texts = list(texts)
+        chunked = [self._chunk(text) for text in texts]
+        if all(len(chunks) == 1 for chunks in chunked):
+            yield from self.nlp.pipe(texts, n_process=n_process, batch_size=batch_size)
+            return
+        flat = [chunk for chunks in chunked for chunk in chunks]
+        docs = iter(self.nlp.pipe(flat, n_process=n_process, batch_size=batch_size))
+        for chunks in chunked:
+            parts = [next(docs) for _ in chunks]
+            yield parts[0] if len(parts) == 1 else self._merge(parts)
+
+    def _chunk(self, text):
+        limit = self.max_chunk_chars
+        if not limit or len(text) <= limit:
+            return [text]
+        chunks = []
+        start = 0
+        while len(text) - start > limit:
+            # Prefer to cut at a line break, then at whitespace, so entities are rarely split
+            end = text.rfind('\n', start + 1, start + limit)
+            if end <= start:
+                end = text.rfind(' ', start + 1, start + limit)
+            if end <= start:
+                end = start + limit
+            chunks.append(text[start:end])
+            start = end
+        chunks.append(text[start:])
+        return chunks
+
+    @staticmethod
+    def _merge(docs):
+        from spacy.tokens import Doc
+        return Doc.from_docs(docs, ensure_whitespace=False)
@@ -0,0 +1,111 @@
+import os
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+from itertools import islice
+
+# Distinct lowercased words whose syllable counts are memoized across requests
+SYLLABLE_CACHE_SIZE = int(os.environ.get('RESUME_ANALYZER_SYLLABLE_CACHE', '65536'))
+READABILITY_LANG = 'en_US'
+
+# Word and sentence rules of textstat 0.7 (the engine the scores were originally computed with)
+NONCONTRACTION_APOSTROPHE = re.compile(r"\'(?!(?:[tsd]|ve|ll|re))")
+PUNCTUATION = re.compile(r"[^\w\s\']")
+SENTENCE_FRAGMENT = re.compile(r"\b[^.!?]+[.!?]*")
+# A whitespace-separated chunk is a word once punctuation is stripped iff it has a word character
+WORD_CHUNK = re.compile(r"\S*\w\S*")
+# Sentences of at most this many words are not counted
+SHORT_SENTENCE_WORDS = 2
+
+FRE_BASE = 206.835
+FRE_SENTENCE_LENGTH = 1.015
+FRE_SYLLABLES_PER_WORD = 84.6
+
+
+class TextStatistics:
+    """Word, sentence and syllable totals of one text, from which every readability score is derived."""
+
+    __slots__ = ('words', 'sentences', 'syllables')
+
+    def __init__(self, words, sentences, syllables):
+        self.words = words
+        self.sentences = sentences
+        self.syllables = syllables
+
+    @property
+    def words_per_sentence(self):
+        return self.words / self.sentences if self.sentences else 0.0
+
+    @property
+    def syllables_per_word(self):
+        return self.syllables / self.words if self.words else 0.0
+
+
+_pronunciations = None
+_hyphenator = None
+_load_lock = threading.Lock()
+
+
+def _load_dictionaries():
+    # CMUdict when the NLTK corpus is installed (python -m nltk.downloader cmudict; never downloaded at
+    # request time), pyphen otherwise
+    global _pronunciations, _hyphenator
+    with _load_lock:
+        if _hyphenator is None:
+            from pyphen import Pyphen
+            try:
+                import nltk
+                nltk.data.find('corpora/cmudict')
+                _pronunciations = nltk.corpus.cmudict.dict()
+            except (ImportError, LookupError):
+                _pronunciations = {}
+            _hyphenator = Pyphen(lang=READABILITY_LANG)
+
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def count_syllables(word):
+    """Syllables in one lowercased word: CMUdict vowel phones, else pyphen hyphenation points + 1."""
+    if _hyphenator is None:
+        _load_dictionaries()
+    phones = _pronunciations.get(word)
+    if phones:
+        return sum(1 for p in phones[0] if p[-1].isdigit())
+    return len(_hyphenator.positions(word)) + 1
+
+
+def text_statistics(text):
+    """
+    Count words, sentences and syllables in one pass over the text.
+    Args:
+        text: Raw text
+    Returns:
+        TextStatistics
+    """
+    if not text:
+        return TextStatistics(0, 0, 0)
+    words = PUNCTUATION.sub('', NONCONTRACTION_APOSTROPHE.sub('', text)).lower().split()
+    # Each distinct word is looked up once
+    syllables = sum(count_syllables(word) * n for word, n in Counter(words).items())
+    fragments = SENTENCE_FRAGMENT.findall(text)
+    # Only whether a fragment has more than SHORT_SENTENCE_WORDS words matters, so stop counting there
+    short = sum(1 for fragment in fragments
+                if sum(1 for _ in islice(WORD_CHUNK.finditer(fragment), SHORT_SENTENCE_WORDS + 1))
+                <= SHORT_SENTENCE_WORDS)
+    return TextStatistics(len(words), max(1, len(fragments) - short), syllables)
+
+
+def flesch_reading_ease(stats):
+    sentence_length = stats.words_per_sentence
+    syllables = stats.syllables_per_word
+    if sentence_length == 0 or syllables == 0:
+        return 0.0
+    return FRE_BASE - FRE_SENTENCE_LENGTH * sentence_length - FRE_SYLLABLES_PER_WORD * syllables
+
+
+def flesch_kincaid_grade(stats):
+    sentence_length = stats.words_per_sentence
+    syllables = stats.syllables_per_word
+    if sentence_length == 0 or syllables == 0:
+        return 0.0
+    return (0.39 * sentence_length) + (11.8 * syllables) - 15.59
@@ -0,0 +1,135 @@
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from sqlite_util import SqliteConnection
+
+
+def content_hash(*parts):
+    """
+    Stable sha256 key over text/bytes parts (e.g. resume text, category, model version).
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8', 'surrogatepass')
+        elif not isinstance(part, (bytes, bytearray, memoryview)):
+            part = str(part).encode('utf-8')
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache for JSON-serializable results keyed by content hash.
+    The in-process tier is an LRU bounded by entry count and approximate byte size; both tiers
+    expire entries after ttl_seconds. The optional sqlite tier survives restarts and is shared by
+    every process pointing at the same file. Values are shared with callers and must not be mutated.
+    """
+
+    def __init__(self, name, max_entries=1024, max_bytes=64 * 1024 * 1024, ttl_seconds=24 * 3600, db_path=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._db = None
+        if db_path:
+            self._db = SqliteConnection(
+                db_path,
+                'CREATE TABLE IF NOT EXISTS results (cache TEXT, key TEXT, expires_at REAL, value TEXT, '
+                'PRIMARY KEY (cache, key))'
+            )
+
+    def get(self, key):
+        """Return the cached value or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return entry[2]
+                self._drop(key)
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT expires_at, value FROM results WHERE cache = ? AND key = ?', (self.name, key)
+                ).fetchone()
+                if row is not None and row[0] > now:
+                    value = json.loads(row[1])
+                    self._remember(key, value, len(row[1]), row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        encoded = json.dumps(value)
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, value, len(encoded), expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO results (cache, key, expires_at, value) VALUES (?, ?, ?, ?)',
+                    (self.name, key, expires_at, encoded),
+                )
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute('DELETE FROM results WHERE cache = ?', (self.name,))
+
+    def purge_expired(self):
+        """Drop expired rows from the sqlite tier (memory entries expire lazily on access)."""
+        if self._db is not None:
+            with self._lock:
+                self._db.execute('DELETE FROM results WHERE cache = ? AND expires_at <= ?', (self.name, time.time()))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _remember(self, key, value, size, expires_at):
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (expires_at, size, value)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
@@ -0,0 +1,385 @@
+import os
+import re
+import json
+import math
+import shutil
+from collections import Counter
+import numpy as np
+from keyword_matcher import KeywordMatcher
+
+# Bump when the index layout changes so stale directories on disk are ignored
+RESUME_INDEX_VERSION = 1
+TOKEN_PATTERN = re.compile(r"\b\w+\b")
+QUERY_TOKEN = re.compile(r'"([^"]*)"|(\()|(\))|([^\s()"]+)')
+QUERY_OPERATORS = {'and', 'or', 'not'}
+# BM25 parameters for ranked queries
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+META_FILE = 'meta.json'
+ARRAY_FILES = ('offsets', 'ids', 'counts', 'doc_lengths', 'doc_categories')
+
+
+def resume_index_path(cache_dir, fingerprint):
+    return os.path.join(cache_dir, f"resume_index_v{RESUME_INDEX_VERSION}_{fingerprint[:16]}")
+
+
+class ResumeIndex:
+    """
+    Inverted index from terms and curated skill phrases to the ids of the resumes containing them.
+    Resume ids are row positions in the corpus. Postings are sorted int32 arrays with per-resume
+    occurrence counts, and every category has its own posting list, so coverage questions are a
+    sorted-array intersection and boolean queries never touch the resume text.
+    Terms are \\w+ tokens of the lowercased resume; phrases use substring semantics like the EDA
+    skill coverage ('java' as a phrase also matches 'javascript').
+    """
+
+    def __init__(self, terms, phrases, categories, postings, doc_lengths, doc_categories):
+        self.terms = {t: i for i, t in enumerate(terms)}
+        self.phrases = {p: i for i, p in enumerate(phrases)}
+        self.categories = list(categories)
+        self._postings = postings  # [(ids, counts)] for terms, then phrases
+        self.doc_lengths = doc_lengths
+        self.doc_categories = doc_categories
+        self.num_docs = len(doc_lengths)
+        self.avg_doc_length = float(np.mean(doc_lengths)) if self.num_docs else 0.0
+        self._category_postings = {}
+
+    @classmethod
+    def build(cls, chunks, phrases):
+        """
+        Index a corpus streamed as chunks.
+        Args:
+            chunks: Iterable of DataFrames with 'Category' and 'resume_lower' columns
+            phrases: Curated skill phrases indexed with substring semantics
+        Returns:
+            ResumeIndex
+        """
+        builder = _IndexBuilder(phrases)
+        for chunk in chunks:
+            builder.add(chunk['Category'], chunk['resume_lower'])
+        return builder.finish()
+
+    def with_appended(self, categories, lower_texts):
+        """Return a new index that also covers appended resumes (ids continue after the last one)."""
+        builder = _IndexBuilder(list(self.phrases), first_id=self.num_docs, categories=self.categories)
+        builder.add(categories, lower_texts)
+        return builder.merge_into(self)
+
+    def term_postings(self, term):
+        i = self.terms.get(term)
+        return _EMPTY if i is None else self._postings[i][0]
+
+    def phrase_postings(self, phrase):
+        i = self.phrases.get(phrase)
+        return _EMPTY if i is None else self._postings[len(self.terms) + i][0]
+
+    def category_postings(self, category):
+        ids = self._category_postings.get(category)
+        if ids is None:
+            code = self.categories.index(category) if category in self.categories else -1
+            ids = np.flatnonzero(np.asarray(self.doc_categories) == code).astype(np.int32)
+            self._category_postings[category] = ids
+        return ids
+
+    def lookup(self, text):
+        """
+        Resume ids matching a query atom: a word, a curated phrase, or several words (all required).
+        """
+        text = text.lower().strip()
+        tokens = TOKEN_PATTERN.findall(text)
+        if len(tokens) == 1 and tokens[0] == text:
+            return self.term_postings(text)
+        if text in self.phrases:
+            return self.phrase_postings(text)
+        if not tokens:
+            return _EMPTY
+        ids = self.term_postings(tokens[0])
+        for token in tokens[1:]:
+            ids = np.intersect1d(ids, self.term_postings(token), assume_unique=True)
+        return ids
+
+    def phrase_category_counts(self, phrase):
+        """
+        Resumes containing a curated phrase per category (aligned with self.categories): the size of the
+        intersection of the phrase's postings with every category's postings, in one pass over the phrase list.
+        """
+        ids = self.phrase_postings(phrase.lower())
+        return np.bincount(np.asarray(self.doc_categories)[ids], minlength=len(self.categories))
+
+    def search(self, query, category=None, top_k=20, ranked=True):
+        """
+        Evaluate a boolean skill query such as 'python AND (django OR flask) NOT php'.
+        Adjacent atoms are ANDed, "quoted text" is looked up as one phrase, and a trailing
+        'in <Category>' restricts the results like the category argument.
+        Args:
+            query: Query string
+            category: Optional category filter
+            top_k: Number of resume ids returned
+            ranked: Order results by BM25 over the query's positive terms (otherwise by id)
+        Returns:
+            dict: { 'total', 'category', 'results': [{'id', 'category', 'score'}] }
+        Raises:
+            ValueError: Empty query or top_k below 1
+        """
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        query, category = self._split_category(query, category)
+        tokens = _tokenize_query(query)
+        if not tokens:
+            raise ValueError("Empty query")
+        parser = _QueryParser(tokens, self)
+        ids = parser.parse()
+        if category is not None:
+            ids = np.intersect1d(ids, self.category_postings(category), assume_unique=True)
+        if ranked and parser.positive_terms and len(ids):
+            scores = self._bm25(ids, parser.positive_terms)
+            order = np.argsort(-scores, kind='stable')[:top_k]
+            top_ids, top_scores = ids[order], scores[order]
+        else:
+            top_ids, top_scores = ids[:top_k], np.zeros(min(len(ids), top_k))
+        return {
+            "total": int(len(ids)),
+            "category": category,
+            "results": [
+                {"id": int(i), "category": self.categories[self.doc_categories[i]], "score": float(s)}
+                for i, s in zip(top_ids, top_scores)
+            ],
+        }
+
+    def _split_category(self, query, category):
+        by_name = {c.lower(): c for c in self.categories}
+        for match in re.finditer(r"\s+in\s+", query, flags=re.IGNORECASE):
+            named = by_name.get(query[match.end():].strip().strip('"').lower())
+            if named is not None:
+                return query[:match.start()], named
+        if category is not None and category not in self.categories:
+            raise ValueError(f"Unknown category: {category}")
+        return query, category
+
+    def _bm25(self, ids, terms):
+        scores = np.zeros(len(ids))
+        lengths = np.asarray(self.doc_lengths)[ids]
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(self.avg_doc_length, 1e-9))
+        for term in terms:
+            i = self.terms.get(term)
+            if i is None:
+                continue
+            term_ids, term_counts = self._postings[i]
+            if not len(term_ids):
+                continue
+            idf = math.log(1 + (self.num_docs - len(term_ids) + 0.5) / (len(term_ids) + 0.5))
+            pos = np.searchsorted(term_ids, ids)
+            found = (pos < len(term_ids)) & (term_ids[np.minimum(pos, len(term_ids) - 1)] == ids)
+            tf = np.where(found, np.asarray(term_counts)[np.minimum(pos, len(term_ids) - 1)], 0)
+            scores += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    def save(self, path, fingerprint):
+        """Persist the index as CSR arrays plus a JSON manifest (written atomically)."""
+        postings = list(self._postings)
+        arrays = {
+            'offsets': np.concatenate([[0], np.cumsum([len(ids) for ids, _ in postings])]).astype(np.int64),
+            'ids': _concat([ids for ids, _ in postings]),
+            'counts': _concat([counts for _, counts in postings]),
+            'doc_lengths': np.asarray(self.doc_lengths, dtype=np.int32),
+            'doc_categories': np.asarray(self.doc_categories, dtype=np.int16),
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+        meta = {
+            "version": RESUME_INDEX_VERSION,
+            "fingerprint": fingerprint,
+            "terms": list(self.terms),
+            "phrases": list(self.phrases),
+            "categories": self.categories,
+        }
+        with open(os.path.join(tmp_path, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path, fingerprint, phrases):
+        """Load a persisted index if it matches the fingerprint and phrase list, else None."""
+        try:
+            with open(os.path.join(path, META_FILE), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if (meta.get('version') != RESUME_INDEX_VERSION or meta.get('fingerprint') != fingerprint
+                    or meta.get('phrases') != list(phrases)):
+                return None
+            arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in ARRAY_FILES}
+        except (OSError, ValueError):
+            return None
+        postings = _CSRPostings(arrays['offsets'], arrays['ids'], arrays['counts'])
+        return cls(meta['terms'], meta['phrases'], meta['categories'], postings,
+                   arrays['doc_lengths'], arrays['doc_categories'])
+
+
+_EMPTY = np.zeros(0, dtype=np.int32)
+
+
+class _CSRPostings:
+    """Posting lists sliced on demand out of memory-mapped CSR arrays."""
+
+    def __init__(self, offsets, ids, counts):
+        self.offsets = np.asarray(offsets)
+        self.ids = np.asarray(ids)
+        self.counts = np.asarray(counts)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        a, b = self.offsets[i], self.offsets[i + 1]
+        return self.ids[a:b], self.counts[a:b]
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+def _concat(arrays):
+    return np.concatenate(arrays).astype(np.int32) if arrays else _EMPTY
+
+
+class _IndexBuilder:
+    def __init__(self, phrases, first_id=0, categories=()):
+        self.phrases = list(dict.fromkeys(p.lower() for p in phrases if p))
+        self.matcher = KeywordMatcher(self.phrases)
+        self.next_id = first_id
+        self.categories = list(categories)
+        self.category_codes = {c: i for i, c in enumerate(self.categories)}
+        self.term_hits = {}  # term -> ([ids], [counts])
+        self.phrase_hits = {}
+        self.doc_lengths = []
+        self.doc_categories = []
+
+    def add(self, categories, lower_texts):
+        for category, lower in zip(categories, lower_texts):
+            doc_id = self.next_id
+            self.next_id += 1
+            code = self.category_codes.get(category)
+            if code is None:
+                code = self.category_codes[category] = len(self.categories)
+                self.categories.append(category)
+            self.doc_categories.append(code)
+            tokens = Counter(TOKEN_PATTERN.findall(lower))
+            self.doc_lengths.append(sum(tokens.values()))
+            for term, n in tokens.items():
+                hits = self.term_hits.setdefault(term, ([], []))
+                hits[0].append(doc_id)
+                hits[1].append(n)
+            for phrase, n in self.matcher.scan(lower).counts.items():
+                hits = self.phrase_hits.setdefault(phrase, ([], []))
+                hits[0].append(doc_id)
+                hits[1].append(n)
+
+    def finish(self):
+        terms = sorted(self.term_hits)
+        postings = [_arrays(self.term_hits[t]) for t in terms]
+        postings += [_arrays(self.phrase_hits.get(p, ([], []))) for p in self.phrases]
+        return ResumeIndex(terms, self.phrases, self.categories, postings,
+                           np.asarray(self.doc_lengths, dtype=np.int32),
+                           np.asarray(self.doc_categories, dtype=np.int16))
+
+    def merge_into(self, index):
+        # Only posting lists that gained resumes are copied; the rest are shared with the old index
+        terms = list(index.terms)
+        postings = [index._postings[i] for i in range(len(terms))]
+        for term in sorted(self.term_hits):
+            if term in index.terms:
+                postings[index.terms[term]] = _extend(postings[index.terms[term]], self.term_hits[term])
+            else:
+                terms.append(term)
+                postings.append(_arrays(self.term_hits[term]))
+        offset = len(index.terms)
+        for phrase, j in index.phrases.items():
+            old = index._postings[offset + j]
+            postings.append(_extend(old, self.phrase_hits[phrase]) if phrase in self.phrase_hits else old)
+        return ResumeIndex(terms, list(index.phrases), self.categories, postings,
+                           np.concatenate([index.doc_lengths, np.asarray(self.doc_lengths, dtype=np.int32)]),
+                           np.concatenate([index.doc_categories, np.asarray(self.doc_categories, dtype=np.int16)]))
+
+
+def _arrays(hits):
+    return np.asarray(hits[0], dtype=np.int32), np.asarray(hits[1], dtype=np.int32)
+
+
+def _extend(postings, hits):
+    ids, counts = _arrays(hits)
+    return np.concatenate([postings[0], ids]), np.concatenate([postings[1], counts])
+
+
+def _tokenize_query(query):
+    tokens = []
+    for phrase, lparen, rparen, word in QUERY_TOKEN.findall(query):
+        if lparen or rparen:
+            tokens.append(lparen or rparen)
+        elif word and word.lower() in QUERY_OPERATORS and word.isupper():
+            tokens.append(word.lower())
+        else:
+            tokens.append(('atom', phrase if not word else word))
+    return tokens
+
+
+class _QueryParser:
+    """
+    Recursive descent over: or := and ('or' and)* ; and := not ('and'? not)* ;
+    not := 'not' not | '(' or ')' | atom. Operators must be upper case (AND, OR, NOT).
+    """
+
+    def __init__(self, tokens, index):
+        self.tokens = tokens
+        self.pos = 0
+        self.index = index
+        self.universe = np.arange(index.num_docs, dtype=np.int32)
+        self.positive_terms = []
+
+    def parse(self):
+        ids = self._or(negated=False)
+        if self.pos != len(self.tokens):
+            raise ValueError("Unbalanced parentheses in query")
+        return ids
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _or(self, negated):
+        ids = self._and(negated)
+        while self._peek() == 'or':
+            self.pos += 1
+            ids = np.union1d(ids, self._and(negated))
+        return ids
+
+    def _and(self, negated):
+        ids = self._not(negated)
+        while self._peek() not in (None, 'or', ')'):
+            if self._peek() == 'and':
+                self.pos += 1
+            ids = np.intersect1d(ids, self._not(negated), assume_unique=True)
+        return ids
+
+    def _not(self, negated):
+        token = self._peek()
+        if token is None:
+            raise ValueError("Incomplete query")
+        self.pos += 1
+        if token == 'not':
+            return np.setdiff1d(self.universe, self._not(not negated), assume_unique=True)
+        if token == '(':
+            ids = self._or(negated)
+            if self._peek() != ')':
+                raise ValueError("Unbalanced parentheses in query")
+            self.pos += 1
+            return ids
+        if token in ('and', 'or', ')'):
+            raise ValueError(f"Unexpected '{token.upper()}' in query")
+        text = token[1]
+        if not negated:
+            self.positive_terms.extend(TOKEN_PATTERN.findall(text.lower()))
+        return self.index.lookup(text)
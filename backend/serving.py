@@ -0,0 +1,169 @@
+import os
+import time
+import logging
+import threading
+from fastapi.responses import JSONResponse
+from utils import (JD_REGISTRY, NLP_ENGINE, SEMANTIC_SKILL_MATCHING, analyze_readability_ats, analyze_resume_text,
+                   curated_category_skills, get_benchmark_model, get_skill_index)
+from metrics import READY, WARM_UP_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Paths answered while the app is still warming up (probes, monitoring and docs); everything else gets a 503
+UNGATED_PATHS = {'/', '/healthz', '/readyz', '/metrics', '/metrics/profile', '/docs', '/redoc', '/openapi.json'}
+
+
+class Readiness:
+    """
+    Startup state of the process: starting -> warming -> ready, or failed with the error.
+    A worker forked from a master that already warmed up inherits the ready state (and the loaded model).
+    """
+
+    def __init__(self):
+        self.status = 'starting'
+        self.error = None
+        self.components = {}  # warm-up step -> seconds
+        self.warmed_in_pid = None
+        self.started_at = None
+        self.ready_at = None
+        self._lock = threading.Lock()
+        READY.set(0)
+
+    @property
+    def ready(self):
+        return self.status == 'ready'
+
+    def claim(self):
+        """Move starting -> warming; False when warm-up already ran (or is running) in this process tree."""
+        with self._lock:
+            if self.status != 'starting':
+                return False
+            self.status = 'warming'
+            self.warmed_in_pid = os.getpid()
+            self.started_at = time.time()
+            return True
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "status": self.status,
+                "error": self.error,
+                "pid": os.getpid(),
+                # True in workers that inherited a model loaded by a preloading master
+                "preloaded": self.warmed_in_pid is not None and self.warmed_in_pid != os.getpid(),
+                "warm_up_seconds": dict(self.components),
+                "started_at": self.started_at,
+                "ready_at": self.ready_at,
+            }
+
+
+READINESS = Readiness()
+
+
+def sample_resume(model):
+    """First corpus resume and its category, used to exercise the request path once."""
+    row = model.store.take([0], columns=['Resume', 'Category']).iloc[0]
+    return str(row['Resume']), row['Category']
+
+
+def warm_up_steps(model):
+    """(component, callable) pairs in load order; each fills a lazily built cache requests would otherwise build."""
+    steps = [
+        ('resume_index', lambda: model.resume_index),
+        ('neighbor_index', lambda: model.neighbor_index),
+        ('corpus_matrices', lambda: (model.corpus_tfidf(), model.corpus_skill_matrix())),
+        ('jd_registry', lambda: JD_REGISTRY.matrices(model.vectorizer)),
+        ('spacy', lambda: NLP_ENGINE.available),
+    ]
+    if SEMANTIC_SKILL_MATCHING:
+        steps.append(('skill_index', get_skill_index))
+
+    def sample_request():
+        text, category = sample_resume(model)
+        if NLP_ENGINE.available:
+            analyze_resume_text(text, category, model=model)
+        else:
+            # Without a spaCy model /analyze_resume/ fails anyway; warm the parts other endpoints share
+            analyze_readability_ats(text, category, curated_category_skills(category))
+        model.rank_categories([text])
+    steps.append(('sample_request', sample_request))
+    return steps
+
+
+def warm_up():
+    """
+    Load the model and every index and cache derived from it, so no request pays for (or triggers) a build.
+    Runs once per process tree: called directly by a preloading master before it forks workers, or in a
+    background thread by start_warm_up() otherwise.
+    Returns:
+        dict: READINESS snapshot
+    Raises:
+        Exception: Whatever failed to load (also recorded as the 'failed' readiness status)
+    """
+    if not READINESS.claim():
+        return READINESS.snapshot()
+    try:
+        start = time.perf_counter()
+        model = get_benchmark_model()
+        _record('model', time.perf_counter() - start)
+        for component, step in warm_up_steps(model):
+            start = time.perf_counter()
+            step()
+            _record(component, time.perf_counter() - start)
+    except Exception as e:
+        with READINESS._lock:
+            READINESS.status = 'failed'
+            READINESS.error = f"{type(e).__name__}: {e}"
+        logger.exception("Warm-up failed")
+        raise
+    with READINESS._lock:
+        READINESS.status = 'ready'
+        READINESS.ready_at = time.time()
+    READY.set(1)
+    return READINESS.snapshot()
+
+
+def start_warm_up():
+    """Warm up in a daemon thread (no-op when this process is already warm); the app answers /readyz meanwhile."""
+    if READINESS.status != 'starting':
+        return
+    thread = threading.Thread(target=_warm_up_in_background, name='warm-up', daemon=True)
+    thread.start()
+
+
+def _warm_up_in_background():
+    try:
+        warm_up()
+    except Exception:
+        pass  # logged and reported by /readyz
+
+
+def _record(component, seconds):
+    with READINESS._lock:
+        READINESS.components[component] = seconds
+    WARM_UP_SECONDS.set(seconds, component=component)
+
+
+class ReadinessMiddleware:
+    """
+    ASGI middleware answering 503 (with Retry-After) to every request outside UNGATED_PATHS until warm-up
+    has finished, so early traffic can never start a model build of its own.
+    """
+
+    def __init__(self, app, ungated_paths=UNGATED_PATHS, readiness=READINESS):
+        self.app = app
+        self.ungated_paths = set(ungated_paths)
+        self.readiness = readiness
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or self.readiness.ready or scope['path'] in self.ungated_paths:
+            await self.app(scope, receive, send)
+            return
+        state = self.readiness.snapshot()
+        response = JSONResponse(
+            status_code=503,
+            content={"error": "Service is starting up" if state['status'] != 'failed' else "Service failed to start",
+                     "status": state['status']},
+            headers={"Retry-After": "5"},
+        )
+        await response(scope, receive, send)
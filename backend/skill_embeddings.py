@@ -0,0 +1,248 @@
+import os
+import re
+import json
+import operator
+import threading
+from collections import OrderedDict
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from result_cache import content_hash
+
+SKILL_EMBEDDING_VERSION = 1
+# Character trigrams inside word boundaries: spelling variants ('postgres'/'postgresql',
+# 'problem-solving'/'problem solving') land close together, unrelated words share few trigrams
+EMBEDDING_NGRAMS = (3, 3)
+EMBEDDING_FEATURES = 1 << 16
+# Cosine similarity a resume phrase needs to count as a match for a skill
+SEMANTIC_MATCH_THRESHOLD = float(os.environ.get('RESUME_ANALYZER_SEMANTIC_THRESHOLD', '0.76'))
+# Latency budget: at most this many distinct candidate phrases are scored per resume
+SEMANTIC_MAX_SPANS = int(os.environ.get('RESUME_ANALYZER_SEMANTIC_MAX_SPANS', '4096'))
+# Distinct words whose trigram vectors are kept between requests (resumes share most of their words)
+SKILL_WORD_CACHE_SIZE = int(os.environ.get('RESUME_ANALYZER_SKILL_WORD_CACHE', '20000'))
+# Tokens keep the characters skills are spelled with ('c++', 'c#', 'node.js')
+SKILL_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+# Candidate phrases never cross a line, list separator or sentence end; breaks match as empty tokens
+TOKEN_OR_BREAK = re.compile(rf"({SKILL_TOKEN_PATTERN.pattern})|[\n\r,;:|•()\[\]/]|\.(?:\s|$)")
+
+
+def skill_embeddings_path(cache_dir, fingerprint):
+    return os.path.join(cache_dir, f"skill_embeddings_v{SKILL_EMBEDDING_VERSION}_{fingerprint[:16]}.npz")
+
+
+def vocabulary_fingerprint(skills, aliases):
+    return content_hash('skill_embeddings', SKILL_EMBEDDING_VERSION, EMBEDDING_NGRAMS, EMBEDDING_FEATURES,
+                        json.dumps(list(skills)), json.dumps(aliases, sort_keys=True))
+
+
+class SkillEmbeddingIndex:
+    """
+    Skill vocabulary embedded in a hashed character-trigram TF-IDF space.
+    Each skill has one row per surface form (the skill itself plus curated aliases such as 'ml' for
+    'machine learning'), stored as an L2-normalized float32 CSR matrix. A phrase's vector is the sum
+    of its words' vectors, so a resume is embedded by hashing each distinct word once; every
+    candidate phrase of up to max_words words is then scored against every alias with a few sparse
+    products and reduced to the best (score, phrase) per skill.
+    """
+
+    def __init__(self, skills, alias_texts, alias_skill, matrix, idf):
+        self.skills = list(skills)
+        self.skill_index = {s: i for i, s in enumerate(self.skills)}
+        self.alias_texts = list(alias_texts)
+        self.alias_skill = np.asarray(alias_skill, dtype=np.int32)  # sorted, so each skill is a contiguous run
+        self.matrix = matrix
+        self.idf = idf
+        self.max_words = max(len(SKILL_TOKEN_PATTERN.findall(a)) for a in self.alias_texts) if self.alias_texts else 1
+        self._hasher = HashingVectorizer(
+            analyzer='char_wb', ngram_range=EMBEDDING_NGRAMS, n_features=EMBEDDING_FEATURES,
+            alternate_sign=False, norm=None, dtype=np.float32,
+        )
+        self._word_cache = OrderedDict()  # word -> (trigram columns, IDF-weighted counts), least recent first
+        self._word_cache_lock = threading.Lock()
+
+    @classmethod
+    def build(cls, skills, aliases=None):
+        """
+        Args:
+            skills: Skill vocabulary (lowercase; duplicates are dropped)
+            aliases: Optional {skill: [alternative spellings / abbreviations]}
+        """
+        skills = list(dict.fromkeys(s.strip().lower() for s in skills if s and s.strip()))
+        alias_texts, alias_skill = [], []
+        for i, skill in enumerate(skills):
+            for form in dict.fromkeys([skill] + [a.lower() for a in (aliases or {}).get(skill, [])]):
+                if SKILL_TOKEN_PATTERN.search(form):
+                    alias_texts.append(' '.join(SKILL_TOKEN_PATTERN.findall(form)))
+                    alias_skill.append(i)
+        hasher = HashingVectorizer(analyzer='char_wb', ngram_range=EMBEDDING_NGRAMS, n_features=EMBEDDING_FEATURES,
+                                   alternate_sign=False, norm=None, dtype=np.float32)
+        counts = hasher.transform(alias_texts)
+        # Smoothed IDF over the alias forms: trigrams shared by many skills ('ing', 'ion') weigh less
+        document_frequency = np.bincount(counts.indices, minlength=EMBEDDING_FEATURES)
+        idf = (np.log((1 + len(alias_texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+        matrix = normalize(counts.multiply(idf).tocsr()).astype(np.float32)
+        return cls(skills, alias_texts, alias_skill, matrix, idf)
+
+    def save(self, path, fingerprint):
+        np.savez(
+            path, fingerprint=fingerprint, skills=np.array(self.skills), alias_texts=np.array(self.alias_texts),
+            alias_skill=self.alias_skill, data=self.matrix.data, indices=self.matrix.indices,
+            indptr=self.matrix.indptr, idf=self.idf,
+        )
+
+    @classmethod
+    def load(cls, path, fingerprint):
+        """Return the saved index if it was built for this vocabulary fingerprint, else None."""
+        try:
+            with np.load(path) as saved:
+                if str(saved['fingerprint']) != fingerprint:
+                    return None
+                matrix = csr_matrix((saved['data'], saved['indices'], saved['indptr']),
+                                    shape=(len(saved['alias_texts']), EMBEDDING_FEATURES))
+                return cls(saved['skills'].tolist(), saved['alias_texts'].tolist(), saved['alias_skill'],
+                           matrix, saved['idf'])
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def candidate_phrases(self, lower_text, max_spans=SEMANTIC_MAX_SPANS):
+        """
+        Distinct phrases of 1..max_words consecutive words within a segment, in order of first occurrence.
+        Returns:
+            tuple: (words, phrase matrix n_phrases x max_words of word ids padded with -1)
+        """
+        pieces = TOKEN_OR_BREAK.findall(lower_text)
+        is_break = np.fromiter(map(operator.not_, pieces), dtype=bool, count=len(pieces))
+        segments = np.cumsum(is_break)[~is_break]
+        vocabulary = {}
+        ids = np.fromiter((vocabulary.setdefault(p, len(vocabulary)) for p in pieces if p), dtype=np.int64,
+                          count=len(segments))
+        windows = []
+        for width in range(1, self.max_words + 1):
+            if len(ids) < width:
+                break
+            starts = np.arange(len(ids) - width + 1)
+            # Drop windows that span two segments
+            starts = starts[segments[starts] == segments[starts + width - 1]]
+            window = np.full((len(starts), self.max_words), -1, dtype=np.int64)
+            for offset in range(width):
+                window[:, offset] = ids[starts + offset]
+            windows.append((starts, window))
+        if not windows:
+            return list(vocabulary), np.empty((0, self.max_words), dtype=np.int64)
+        starts = np.concatenate([s for s, _ in windows])
+        phrases = np.concatenate([w for _, w in windows])
+        base = len(vocabulary) + 1
+        if base ** self.max_words < 2 ** 63:
+            # One integer key per phrase: far cheaper to deduplicate than rows
+            keys = ((phrases + 1) * base ** np.arange(self.max_words, dtype=np.int64)).sum(axis=1)
+            _, first = np.unique(keys, return_index=True)
+            phrases = phrases[first]
+        else:
+            phrases, first = np.unique(phrases, axis=0, return_index=True)
+        # Keep the earliest phrases when the budget is exceeded (ties: shorter first, as generated)
+        order = np.lexsort((first, starts[first]))[:max_spans]
+        return list(vocabulary), phrases[order]
+
+    def score(self, lower_text, max_spans=SEMANTIC_MAX_SPANS):
+        """
+        Best cosine similarity of each skill to any candidate phrase of the text.
+        Returns:
+            np.ndarray: float32 scores aligned with self.skills
+        """
+        alias_rows = np.arange(len(self.alias_texts))
+        similarity, _, _ = self._phrase_similarity(lower_text, max_spans, alias_rows)
+        return self._skill_scores(similarity, alias_rows)[0]
+
+    def _phrase_similarity(self, lower_text, max_spans, alias_rows):
+        # Dense (n_phrases x len(alias_rows)) cosine similarities, or None when there is nothing to score
+        words, phrases = self.candidate_phrases(lower_text, max_spans)
+        if not len(phrases) or not len(alias_rows):
+            return None, phrases, words
+        word_vectors = self.word_vectors(words)
+        rows = np.repeat(np.arange(len(phrases)), self.max_words)
+        cols = phrases.ravel()
+        keep = cols >= 0
+        phrase_words = csr_matrix((np.ones(keep.sum(), dtype=np.float32), (rows[keep], cols[keep])),
+                                  shape=(len(phrases), len(words)))
+        # phrase . alias is the sum of its words' dot products with the alias
+        similarity = phrase_words @ (word_vectors @ self.matrix[alias_rows].T).toarray()
+        # |phrase|^2 is the sum of the Gram entries over every pair of its word slots
+        gram = (word_vectors @ word_vectors.T).toarray()
+        squared = np.zeros(len(phrases), dtype=np.float32)
+        for k in range(self.max_words):
+            for l in range(self.max_words):
+                valid = (phrases[:, k] >= 0) & (phrases[:, l] >= 0)
+                squared[valid] += gram[phrases[valid, k], phrases[valid, l]]
+        similarity /= np.maximum(np.sqrt(squared), 1e-12)[:, None]
+        return similarity, phrases, words
+
+    def _skill_scores(self, similarity, alias_rows):
+        # Per skill: best score over its aliases and phrases, and the similarity column that reached it
+        skill_scores = np.zeros(len(self.skills), dtype=np.float32)
+        skill_alias = np.zeros(len(self.skills), dtype=np.int64)
+        if similarity is None:
+            return skill_scores, skill_alias
+        alias_scores = similarity.max(axis=0)
+        alias_skill = self.alias_skill[alias_rows]
+        # Aliases of a skill are contiguous: sort each run by descending score and keep its head
+        run_starts = np.flatnonzero(np.r_[True, alias_skill[1:] != alias_skill[:-1]])
+        best_alias = np.lexsort((-alias_scores, alias_skill))[run_starts]
+        present = alias_skill[best_alias]
+        skill_scores[present] = alias_scores[best_alias]
+        skill_alias[present] = best_alias
+        return skill_scores, skill_alias
+
+    def word_vectors(self, words):
+        """IDF-weighted trigram vectors (CSR, one row per word), hashing only words not seen before."""
+        cache = self._word_cache
+        found = {}
+        with self._word_cache_lock:
+            for w in words:
+                entry = cache.get(w)
+                if entry is not None:
+                    cache.move_to_end(w)
+                    found[w] = entry
+        missing = [w for w in words if w not in found]
+        if missing:
+            hashed = self._hasher.transform(missing).multiply(self.idf).tocsr()
+            for w, start, end in zip(missing, hashed.indptr[:-1], hashed.indptr[1:]):
+                found[w] = (hashed.indices[start:end], hashed.data[start:end])
+            with self._word_cache_lock:
+                for w in missing:
+                    cache[w] = found[w]
+                # Least recently used words go first
+                while len(cache) > SKILL_WORD_CACHE_SIZE:
+                    cache.popitem(last=False)
+        # Rows come from this call's own lookups, so concurrent evictions cannot remove them
+        rows = [found[w] for w in words]
+        lengths = np.fromiter((len(r[0]) for r in rows), dtype=np.int64, count=len(rows))
+        indptr = np.r_[0, np.cumsum(lengths)]
+        if not len(rows):
+            return csr_matrix((0, EMBEDDING_FEATURES), dtype=np.float32)
+        return csr_matrix((np.concatenate([r[1] for r in rows]), np.concatenate([r[0] for r in rows]), indptr),
+                          shape=(len(words), EMBEDDING_FEATURES))
+
+    def match(self, lower_text, skills, threshold=SEMANTIC_MATCH_THRESHOLD, max_spans=SEMANTIC_MAX_SPANS):
+        """
+        Fuzzy matches of the given skills in a lowercased text.
+        Args:
+            lower_text: Lowercased resume text
+            skills: Skills to report (entries outside the vocabulary never match)
+            threshold: Minimum cosine similarity
+        Returns:
+            dict: {skill: {'score', 'matched'}} for the skills at or above the threshold, in input order
+        """
+        wanted = [i for i in (self.skill_index.get(skill.lower()) for skill in skills) if i is not None]
+        # Only the requested skills' aliases are scored
+        alias_rows = np.flatnonzero(np.isin(self.alias_skill, wanted))
+        similarity, phrases, words = self._phrase_similarity(lower_text, max_spans, alias_rows)
+        scores, skill_alias = self._skill_scores(similarity, alias_rows)
+        result = {}
+        for skill in skills:
+            i = self.skill_index.get(skill.lower())
+            if i is not None and scores[i] >= threshold:
+                phrase = phrases[similarity[:, skill_alias[i]].argmax()]
+                result[skill] = {"score": round(float(scores[i]), 4),
+                                 "matched": ' '.join(words[w] for w in phrase if w >= 0)}
+        return result
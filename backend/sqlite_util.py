@@ -0,0 +1,34 @@
+import os
+import sqlite3
+
+
+# Connections inherited across fork() are parked here: a child must neither use nor close them
+# (closing the last handle can checkpoint and remove a WAL file the parent is still writing)
+_INHERITED_CONNECTIONS = []
+
+
+class SqliteConnection:
+    """
+    sqlite connection in WAL mode shared by the threads of a process. Worker processes forked
+    after it was opened (e.g. a preloading server) transparently get a fresh connection.
+    """
+
+    def __init__(self, db_path, *schema):
+        self.db_path = db_path
+        self.schema = schema
+        self._connect()
+        os.register_at_fork(after_in_child=self._reconnect)
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        for statement in self.schema:
+            self._conn.execute(statement)
+
+    def _reconnect(self):
+        _INHERITED_CONNECTIONS.append(self._conn)
+        self._connect()
+
+    def execute(self, sql, parameters=()):
+        return self._conn.execute(sql, parameters)
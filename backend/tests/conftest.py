@@ -0,0 +1,37 @@
+import os
+import sys
+import tempfile
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+# Module-level settings are read at import: point them at the bundled dataset and a throwaway cache
+os.environ.setdefault('RESUME_ANALYZER_DATASET', os.path.join(BACKEND_DIR, 'UpdatedResumeDataSet.csv'))
+os.environ.setdefault('RESUME_ANALYZER_CACHE_DIR', tempfile.mkdtemp(prefix='resume-analyzer-tests-'))
+
+
+@pytest.fixture
+def nlp_engine():
+    """The shared NLP engine, falling back to a blank English pipeline when no spaCy model is installed."""
+    import spacy
+    from utils import NLP_ENGINE
+    if NLP_ENGINE.available:
+        yield NLP_ENGINE
+        return
+    saved = NLP_ENGINE._nlp
+    NLP_ENGINE._nlp = spacy.blank('en')
+    yield NLP_ENGINE
+    NLP_ENGINE._nlp = saved
+
+
+@pytest.fixture
+def small_dataset(tmp_path):
+    """A few resumes per category copied from the bundled dataset, in a private CSV and cache dir."""
+    import pandas as pd
+    df = pd.read_csv(os.environ['RESUME_ANALYZER_DATASET']).drop_duplicates('Resume')
+    df = df[df['Category'].isin(['Data Science', 'HR', 'Java Developer'])].groupby('Category').head(4)
+    path = tmp_path / 'resumes.csv'
+    df.to_csv(path, index=False)
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    return str(path), str(cache_dir)
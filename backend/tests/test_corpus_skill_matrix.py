@@ -0,0 +1,15 @@
+import pytest
+import utils
+from utils import MATCH_SKILLS, ResumeBenchmarkModel, extract_skill_set, scan_keywords
+
+
+@pytest.mark.parametrize('word_boundary', [False, True])
+def test_corpus_skills_match_request_extraction(small_dataset, monkeypatch, word_boundary):
+    monkeypatch.setattr(utils, 'WORD_BOUNDARY_MATCHING', word_boundary)
+    path, cache_dir = small_dataset
+    model = ResumeBenchmarkModel(path, cache_dir)
+    matrix = model.corpus_skill_matrix()
+    resumes = model.store.iter_column('Resume')
+    for row, text in zip(matrix, resumes):
+        # A corpus resume sent as a request must yield the same skills as its corpus row
+        assert [MATCH_SKILLS[c] for c in sorted(row.indices)] == extract_skill_set(scan_keywords(text))
@@ -0,0 +1,47 @@
+import json
+import pandas as pd
+import pytest
+from eda import EDAAccumulator, build_eda_snapshot, dataset_fingerprint
+from ingest import DATASET_COLUMNS
+from utils import ResumeBenchmarkModel
+
+
+def new_rows():
+    return pd.DataFrame([
+        {'Category': 'HR', 'Resume': 'Recruiter using Quantumflux and Python daily', 'Skills': 'Quantumflux, Python'},
+        {'Category': 'Data Science', 'Resume': 'quantumflux pipelines with SQL', 'Skills': None},
+        {'Category': 'Mobile', 'Resume': 'Kotlin and Java apps', 'Skills': 'Kotlin'},
+    ], columns=DATASET_COLUMNS)
+
+
+def skill_hits_by_scan(df):
+    """Reference coverage: every curated skill checked against every resume by substring."""
+    acc = EDAAccumulator.from_dataframe(df)
+    hits = {cat: {skill: 0 for skill in acc.all_skills} for cat in acc.category_sizes}
+    for cat, resume in zip(df['Category'], df['Resume'].astype(str)):
+        for skill in acc.all_skills:
+            hits[cat][skill] += skill.lower() in resume.lower()
+    return {cat: [hits[cat][skill] / acc.category_sizes[cat] for skill in acc.all_skills] for cat in hits}
+
+
+def test_snapshot_coverage_matches_substring_scan(small_dataset):
+    path, _ = small_dataset
+    df = pd.concat([pd.read_csv(path), new_rows()], ignore_index=True)
+    summary = build_eda_snapshot(df)['dataset_summary']
+    expected = skill_hits_by_scan(df)
+    assert dict(zip(summary['heatmap_categories'], summary['heatmap_matrix'])) == pytest.approx(expected)
+    assert summary['skill_appearance']['Quantumflux'] == 2
+
+
+@pytest.mark.parametrize('index_loaded', [True, False])
+def test_appended_snapshot_matches_full_rebuild(small_dataset, index_loaded):
+    path, cache_dir = small_dataset
+    model = ResumeBenchmarkModel(path, cache_dir)
+    if index_loaded:
+        model.resume_index
+    rows = new_rows()
+    rows.to_csv(path, mode='a', header=False, index=False)
+    appended = model.with_appended(rows, dataset_fingerprint(path))
+    expected = build_eda_snapshot(pd.read_csv(path), appended.dataset_hash)
+    # Compared through JSON, the form snapshots are persisted and served in
+    assert json.dumps(appended.eda_snapshot, sort_keys=True) == json.dumps(expected, sort_keys=True)
@@ -0,0 +1,35 @@
+import pytest
+import utils
+from ingest import append_resumes
+from utils import ResumeBenchmarkModel
+
+RECORDS = [{'category': 'HR', 'resume': 'Recruiter with payroll and onboarding experience'}]
+
+
+@pytest.fixture
+def served_model(small_dataset, monkeypatch):
+    path, cache_dir = small_dataset
+    model = ResumeBenchmarkModel(path, cache_dir)
+    monkeypatch.setattr(utils, 'benchmark_model', model)
+    return model
+
+
+def test_failed_update_leaves_dataset_unchanged(served_model, monkeypatch):
+    with open(served_model.dataset_path, 'rb') as f:
+        before = f.read()
+
+    def fail(self, records, dataset_hash):
+        raise RuntimeError("profile update failed")
+    monkeypatch.setattr(ResumeBenchmarkModel, 'with_appended', fail)
+    with pytest.raises(RuntimeError):
+        append_resumes(RECORDS)
+    with open(served_model.dataset_path, 'rb') as f:
+        assert f.read() == before
+    assert utils.get_benchmark_model() is served_model
+
+
+def test_append_swaps_in_updated_model(served_model):
+    result = append_resumes(RECORDS)
+    assert result['appended'] == 1
+    assert result['total_resumes'] == served_model.dataset_stats['total_resumes'] + 1
+    assert utils.get_benchmark_model().dataset_hash != served_model.dataset_hash
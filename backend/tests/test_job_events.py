@@ -0,0 +1,29 @@
+import pytest
+from fastapi.testclient import TestClient
+import main
+from jobs import JOB_QUEUE
+from serving import READINESS
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(READINESS, 'status', 'ready')
+    monkeypatch.setattr(main, 'JOB_EVENT_POLL_SECONDS', 0)
+    return TestClient(main.app)
+
+
+def test_job_purged_mid_stream_ends_with_error_event(client, monkeypatch):
+    running = {"id": "job-1", "status": "running", "done": 1, "total": 3}
+    # Seen by the route's existence check and the first poll, then purged
+    states = iter([running, running, None])
+    monkeypatch.setattr(JOB_QUEUE, 'get', lambda job_id: next(states))
+    response = client.get('/jobs/job-1/events')
+    assert response.status_code == 200
+    events = [block.split('\n', 1)[0] for block in response.text.strip().split('\n\n')]
+    assert events == ['event: progress', 'event: error']
+    assert '"Unknown job"' in response.text
+
+
+def test_unknown_job_is_404(client, monkeypatch):
+    monkeypatch.setattr(JOB_QUEUE, 'get', lambda job_id: None)
+    assert client.get('/jobs/missing/events').status_code == 404
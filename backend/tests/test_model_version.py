@@ -0,0 +1,38 @@
+import pandas as pd
+from eda import dataset_fingerprint
+from ingest import DATASET_COLUMNS
+from utils import ResumeBenchmarkModel, analyze_resume_text
+
+NEW_TERM = 'quantumflux'
+
+
+def append_rows(path, category, n):
+    resume = ' '.join([NEW_TERM] * 20 + ['pipelines', 'tensors'])
+    rows = pd.DataFrame([{'Category': category, 'Resume': f"{resume} {i}", 'Skills': None} for i in range(n)],
+                        columns=DATASET_COLUMNS)
+    rows.to_csv(path, mode='a', header=False, index=False)
+    return rows
+
+
+def test_refit_of_same_dataset_changes_version_and_analysis(small_dataset, nlp_engine):
+    path, cache_dir = small_dataset
+    fitted = ResumeBenchmarkModel(path, cache_dir)
+    rows = append_rows(path, 'Data Science', 6)
+    # Appended resumes are folded in with the old vocabulary, which has never seen NEW_TERM
+    appended = fitted.with_appended(rows, dataset_fingerprint(path))
+    refitted = ResumeBenchmarkModel(path, cache_dir, refit=True)
+    assert refitted.dataset_hash == appended.dataset_hash
+    assert refitted.version != appended.version
+
+    text = f"{NEW_TERM} {NEW_TERM} {NEW_TERM} data scientist"
+    before = analyze_resume_text(text, 'Data Science', model=appended)
+    after = analyze_resume_text(text, 'Data Science', model=refitted)
+    assert before['similarity'] != after['similarity']
+    assert NEW_TERM in refitted.get_category_skills('Data Science')
+    assert after['top_skills'] != before['top_skills']
+
+
+def test_reloaded_artifacts_keep_version(small_dataset):
+    path, cache_dir = small_dataset
+    fitted = ResumeBenchmarkModel(path, cache_dir)
+    assert ResumeBenchmarkModel(path, cache_dir).version == fitted.version
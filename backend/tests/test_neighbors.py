@@ -0,0 +1,98 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics.pairwise import cosine_similarity
+from neighbors import NeighborIndex, ResumeEncoder, neighbor_settings
+from utils import TFIDF_PARAMS, ResumeBenchmarkModel
+
+TOP_K = 10
+
+
+@pytest.fixture(scope='module')
+def model(tmp_path_factory):
+    """Model over every distinct bundled resume (enough for LSH buckets to matter)."""
+    root = tmp_path_factory.mktemp('neighbors')
+    df = pd.read_csv(os.environ['RESUME_ANALYZER_DATASET']).drop_duplicates('Resume')
+    path = root / 'resumes.csv'
+    df.to_csv(path, index=False)
+    return ResumeBenchmarkModel(str(path), str(root / 'cache'))
+
+
+@pytest.fixture(scope='module')
+def queries(model):
+    texts = model.store.column('Resume').tolist()[::4]
+    return [text[:len(text) // 2] for text in texts]
+
+
+def build(model, method='exact', svd_components=0, **lsh):
+    settings = {**neighbor_settings(TFIDF_PARAMS, model.vectorizer), 'method': method,
+                'svd_components': svd_components, **lsh}
+    return NeighborIndex.build(settings, ResumeEncoder.create(settings, model.vectorizer), model.corpus_tfidf(),
+                               model.store.column('Category').tolist())
+
+
+def brute_force(model, text, k):
+    scores = cosine_similarity(model.vectorizer.transform([text]), model.corpus_tfidf())[0]
+    order = np.argsort(-scores, kind='stable')[:k]
+    return order, scores[order]
+
+
+def test_exact_matches_brute_force_cosine(model, queries):
+    index = build(model)
+    for text in queries:
+        ids, scores, scored = index.search(text, top_k=TOP_K)
+        expected_ids, expected_scores = brute_force(model, text, TOP_K)
+        assert scored == index.num_docs
+        np.testing.assert_allclose(scores, expected_scores, rtol=1e-5)
+        np.testing.assert_array_equal(ids, expected_ids)
+
+
+# Share of the exact top-k that LSH finds (seed 0) for queries that are the first half of a corpus resume.
+# With the default 12 bits the ~170-resume corpus spreads over sparse buckets, so only the nearest
+# neighbour is reliably found; fewer bits make buckets large enough for a useful top 10
+@pytest.mark.parametrize('bits, k, recall_floor', [(12, 1, 0.9), (8, TOP_K, 0.45)])
+def test_lsh_recall_on_fixed_seed(model, queries, bits, k, recall_floor):
+    exact, lsh = build(model), build(model, method='lsh', lsh_bits=bits, lsh_tables=16, seed=0)
+    found = total = 0
+    scored = []
+    for text in queries:
+        expected = set(exact.search(text, top_k=k)[0])
+        ids, _, n = lsh.search(text, top_k=k)
+        found += len(expected & set(ids))
+        total += len(expected)
+        scored.append(n)
+    assert found / total >= recall_floor
+    # Only bucket candidates are scored
+    assert np.mean(scored) < lsh.num_docs / 2
+
+
+def test_svd_vectors_keep_self_as_nearest(model):
+    index = build(model, svd_components=50)
+    assert isinstance(index.vectors, np.ndarray) and index.vectors.shape == (index.num_docs, 50)
+    np.testing.assert_allclose(np.linalg.norm(index.vectors, axis=1), 1, rtol=1e-5)
+    texts = model.store.column('Resume').tolist()
+    for doc_id in range(0, index.num_docs, 10):
+        ids, scores, _ = index.search(texts[doc_id], top_k=3)
+        assert scores[0] == pytest.approx(1, abs=1e-4)
+        assert ids[0] == doc_id
+
+
+@pytest.mark.parametrize('method', ['exact', 'lsh'])
+def test_category_filter(model, queries, method):
+    index = build(model, method=method)
+    category = index.categories[0]
+    size = int(np.sum(np.asarray(index.doc_categories) == 0))
+    for text in queries[:10]:
+        ids, scores, _ = index.search(text, top_k=size + 5, category=category)
+        assert len(ids) <= size
+        assert all(index.category_of(i) == category for i in ids)
+        assert np.all(np.diff(scores) <= 0)
+    with pytest.raises(ValueError, match='Unknown category'):
+        index.search(queries[0], category='No Such Category')
+
+
+@pytest.mark.parametrize('top_k', [0, -3])
+def test_rejects_top_k_below_one(model, top_k):
+    with pytest.raises(ValueError, match='top_k'):
+        build(model).search('python developer', top_k=top_k)
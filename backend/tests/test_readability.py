@@ -0,0 +1,51 @@
+import os
+import nltk
+import pandas as pd
+import pytest
+import textstat
+from textstat.backend.counts import _count_syllables
+from readability import flesch_kincaid_grade, flesch_reading_ease, text_statistics
+
+EDGE_CASES = [
+    "",
+    "Python.",
+    "Led a team of 5. Shipped it!",
+    "Don't over-engineer; it's the team's call... Isn't it? Yes: we'll see.",
+    "Skills: C++, C#, .NET, Node.js -- e-commerce & SQL/NoSQL (3+ yrs).",
+    "Managed   whitespace\tand\nnew lines\n\nwithout any sentence punctuation at all",
+]
+
+
+def dataset_resumes(n=40):
+    df = pd.read_csv(os.environ['RESUME_ANALYZER_DATASET']).drop_duplicates('Resume')
+    return df['Resume'].astype(str).head(n).tolist()
+
+
+@pytest.fixture(scope='module', autouse=True)
+def textstat_syllable_source():
+    """
+    Without the NLTK cmudict corpus textstat tries to download it on every call, while readability falls back
+    to pyphen for every word: run textstat in the same pyphen-only mode, as benchmarks.bench_readability does.
+    """
+    try:
+        nltk.data.find('corpora/cmudict')
+        yield
+        return
+    except LookupError:
+        pass
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(_count_syllables, 'get_cmudict', lambda lang: None)
+        yield
+
+
+TEXTS = EDGE_CASES + dataset_resumes()
+
+
+@pytest.mark.parametrize('text', TEXTS, ids=[f"text{i}" for i in range(len(TEXTS))])
+def test_matches_textstat(text):
+    stats = text_statistics(text)
+    assert stats.words == textstat.lexicon_count(text)
+    assert stats.sentences == textstat.sentence_count(text)
+    assert stats.syllables == textstat.syllable_count(text)
+    assert flesch_reading_ease(stats) == pytest.approx(textstat.flesch_reading_ease(text), abs=1e-9)
+    assert flesch_kincaid_grade(stats) == pytest.approx(textstat.flesch_kincaid_grade(text), abs=1e-9)
@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+from resume_index import ResumeIndex
+
+
+@pytest.fixture
+def index():
+    chunk = pd.DataFrame({
+        'Category': ['Data Science', 'Data Science', 'HR', 'Java Developer'],
+        'resume_lower': ['python and sql analyst', 'python machine learning', 'recruiting with python',
+                         'java spring and sql'],
+    })
+    return ResumeIndex.build([chunk], ['python', 'sql', 'machine learning'])
+
+
+@pytest.mark.parametrize('ranked', [True, False])
+def test_search_top_k_limits_results(index, ranked):
+    result = index.search('python', top_k=2, ranked=ranked)
+    assert result['total'] == 3
+    assert len(result['results']) == 2
+
+
+@pytest.mark.parametrize('top_k', [0, -1])
+def test_search_rejects_top_k_below_one(index, top_k):
+    with pytest.raises(ValueError, match='top_k'):
+        index.search('python', top_k=top_k)
+
+
+def test_phrase_category_counts(index):
+    counts = dict(zip(index.categories, index.phrase_category_counts('Python').tolist()))
+    assert counts == {'Data Science': 2, 'HR': 1, 'Java Developer': 0}
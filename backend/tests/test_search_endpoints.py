@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+import main
+from serving import READINESS
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(READINESS, 'status', 'ready')
+    return TestClient(main.app)
+
+
+def failing_model(method):
+    def fail(*args):
+        raise RuntimeError("index files are unreadable")
+    return SimpleNamespace(**{method: fail})
+
+
+def test_search_resumes_failure_is_json_error(client, monkeypatch):
+    monkeypatch.setattr(main, 'get_benchmark_model', lambda: failing_model('search_resumes'))
+    response = client.post('/search_resumes/', json={'query': 'python'})
+    assert response.status_code == 500
+    assert response.json() == {"error": "index files are unreadable"}
+
+
+def test_similar_resumes_failure_is_json_error(client, monkeypatch):
+    monkeypatch.setattr(main, 'get_benchmark_model', lambda: failing_model('similar_resumes'))
+    response = client.post('/similar_resumes/', json={'text': 'python developer'})
+    assert response.status_code == 500
+    assert response.json() == {"error": "index files are unreadable"}
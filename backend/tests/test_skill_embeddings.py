@@ -0,0 +1,49 @@
+import os
+import threading
+import pandas as pd
+import skill_embeddings
+from utils import EMBEDDED_SKILLS, SKILL_ALIASES, get_skill_index
+from skill_embeddings import SkillEmbeddingIndex
+
+
+def test_word_cache_is_thread_safe_under_eviction(monkeypatch):
+    monkeypatch.setattr(skill_embeddings, 'SKILL_WORD_CACHE_SIZE', 200)
+    index = SkillEmbeddingIndex.build(EMBEDDED_SKILLS, SKILL_ALIASES)
+    texts = pd.read_csv(os.environ['RESUME_ANALYZER_DATASET'])['Resume'].astype(str).str.lower().head(40).tolist()
+    expected = [index.score(text) for text in texts]
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(len(texts)):
+                j = (i + offset) % len(texts)
+                assert (index.score(texts[j]) == expected[j]).all()
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(k * 5,)) for k in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert len(index._word_cache) <= 200
+
+
+def test_word_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(skill_embeddings, 'SKILL_WORD_CACHE_SIZE', 3)
+    index = SkillEmbeddingIndex.build(['python'])
+    index.word_vectors(['alpha', 'beta', 'gamma'])
+    index.word_vectors(['alpha'])
+    index.word_vectors(['delta'])
+    assert list(index._word_cache) == ['gamma', 'alpha', 'delta']
+
+
+def test_get_skill_index_builds_once_under_concurrency():
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(get_skill_index())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(index) for index in seen}) == 1
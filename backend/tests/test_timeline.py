@@ -0,0 +1,35 @@
+from datetime import date
+import pytest
+from timeline import check_timeline_consistency, normalize_date, parse_date_range
+
+
+@pytest.mark.parametrize('fragment, year, month', [
+    ("Mar'98", 1998, 3),
+    ("Jun ’99", 1999, 6),
+    ("Jan'05", 2005, 1),
+    (f"Dec'{date.today().year % 100:02d}", date.today().year, 12),
+])
+def test_short_year_fragments(fragment, year, month):
+    parsed = normalize_date(fragment)
+    assert (parsed.year, parsed.month) == (year, month)
+
+
+@pytest.mark.parametrize('text, start, end', [
+    ("Mar'98 - Jun'99", (1998, 3), (1999, 6)),
+    ("Nov'99 to Feb'01", (1999, 11), (2001, 2)),
+    ("1998-99", (1998, None), (1999, None)),
+    ("1999-00", (1999, None), (2000, None)),
+    ("2014-15", (2014, None), (2015, None)),
+])
+def test_short_year_ranges(text, start, end):
+    parsed_start, parsed_end = parse_date_range(text)
+    assert parsed_start.year == start[0] and parsed_end.year == end[0]
+    if start[1] is not None:
+        assert (parsed_start.month, parsed_end.month) == (start[1], end[1])
+    assert parsed_start <= parsed_end
+
+
+def test_short_year_ranges_feed_gap_detection():
+    report = check_timeline_consistency(["Mar'98 - Jun'99", "Jan'02 - Dec'04"])
+    assert report['overlaps'] == []
+    assert [gap['gap_months'] for gap in report['gaps']] == [31]
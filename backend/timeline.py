@@ -0,0 +1,186 @@
+import re
+import calendar
+from datetime import datetime, date
+from functools import lru_cache
+import dateparser
+from metrics import REGISTRY, STAGE_SECONDS, instrumented
+
+# Bounded memo of normalized date fragments (keyed by fragment and today's date)
+DATE_CACHE_SIZE = 4096
+
+MONTHS = {
+    'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3, 'apr': 4, 'april': 4,
+    'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7, 'aug': 8, 'august': 8,
+    'sep': 9, 'sept': 9, 'september': 9, 'oct': 10, 'october': 10, 'nov': 11, 'november': 11,
+    'dec': 12, 'december': 12,
+}
+PRESENT_WORDS = {
+    'present', 'current', 'currently', 'now', 'today', 'date', 'till date', 'to date', 'till now', 'ongoing',
+}
+
+# Fast path for the formats resumes actually use; anything else falls back to dateparser
+MONTH_YEAR = re.compile(r"^(?P<month>[a-z]+)[\s.,-]*(?P<year>(?:19|20)\d{2})$")
+MONTH_SHORT_YEAR = re.compile(r"^(?P<month>[a-z]+)\s*['’]\s*(?P<year>\d{2})$")
+YEAR = re.compile(r"^(?P<year>(?:19|20)\d{2})$")
+NUMERIC_MONTH_YEAR = re.compile(r"^(?P<month>\d{1,2})\s*[/.-]\s*(?P<year>(?:19|20)\d{2})$")
+NUMERIC_YEAR_MONTH = re.compile(r"^(?P<year>(?:19|20)\d{2})[/.-](?P<month>\d{1,2})$")
+SHORT_YEAR = re.compile(r"^\d{2}$")
+# Range separators: spaced ones first so '2018-06 - 2019-05' splits on the spaced dash
+SPACED_RANGE_SEPARATOR = re.compile(r"\s+(?:-|–|—|to|till|until)\s+")
+TIGHT_RANGE_SEPARATOR = re.compile(r"\s*(?:–|—|-|\bto\b|\btill\b|\buntil\b)\s*")
+FRAGMENT_STRIP = " \t\r\n.,;:()[]"
+
+
+def _on_default_day(year, month, today):
+    # Mirror dateparser's defaults: missing day/month are taken from today
+    return datetime(year, month, min(today.day, calendar.monthrange(year, month)[1]))
+
+
+def _expand_short_year(short_year, today):
+    # Two-digit years never lie in the future: "'98" is 1998, "'19" is 2019
+    century = today.year // 100 * 100
+    return century + short_year if short_year <= today.year % 100 else century - 100 + short_year
+
+
+def _fast_parse(fragment, today):
+    m = MONTH_YEAR.match(fragment)
+    if m and m.group('month') in MONTHS:
+        return _on_default_day(int(m.group('year')), MONTHS[m.group('month')], today)
+    m = MONTH_SHORT_YEAR.match(fragment)
+    if m and m.group('month') in MONTHS:
+        return _on_default_day(_expand_short_year(int(m.group('year')), today), MONTHS[m.group('month')], today)
+    m = YEAR.match(fragment)
+    if m:
+        return _on_default_day(int(m.group('year')), today.month, today)
+    m = NUMERIC_MONTH_YEAR.match(fragment) or NUMERIC_YEAR_MONTH.match(fragment)
+    if m and 1 <= int(m.group('month')) <= 12:
+        return _on_default_day(int(m.group('year')), int(m.group('month')), today)
+    return None
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _normalize_cached(fragment, today):
+    parsed = _fast_parse(fragment, today)
+    if parsed is None:
+        with STAGE_SECONDS.time(stage='dateparser'):
+            parsed = dateparser.parse(fragment)
+        if parsed is not None and parsed.tzinfo is not None:
+            # Keep every entry naive so the sweep can compare them
+            parsed = parsed.replace(tzinfo=None)
+    return parsed
+
+
+def collect_date_cache_metrics():
+    info = _normalize_cached.cache_info()
+    return [
+        ('resume_analyzer_date_cache_hits_total', 'counter', 'Date fragment memo hits', [({}, info.hits)]),
+        ('resume_analyzer_date_cache_misses_total', 'counter', 'Date fragment memo misses', [({}, info.misses)]),
+    ]
+
+
+REGISTRY.register_collector(collect_date_cache_metrics)
+
+
+def normalize_date(fragment):
+    """
+    Parse one date fragment ('Jan 2020', '06/2018', '2019', 'Present', ...).
+    Common resume formats take a compiled fast path; dateparser is only used on misses.
+    Returns:
+        datetime or None
+    """
+    fragment = fragment.strip(FRAGMENT_STRIP).lower()
+    if not fragment:
+        return None
+    if fragment in PRESENT_WORDS:
+        return datetime.now()
+    return _normalize_cached(fragment, date.today())
+
+
+def _split_range(text):
+    for separator in (SPACED_RANGE_SEPARATOR, TIGHT_RANGE_SEPARATOR):
+        parts = [p for p in separator.split(text) if p.strip(FRAGMENT_STRIP)]
+        if len(parts) == 2:
+            return parts
+    return None
+
+
+def parse_date_range(text):
+    """
+    Parse a DATE entity into a (start, end) pair; single dates give start == end.
+    Handles '-', en/em dashes, 'to'/'till'/'until', 'Present' and short end years ('2014-15').
+    Returns:
+        tuple or None
+    """
+    fragment = text.strip(FRAGMENT_STRIP).lower()
+    if not fragment:
+        return None
+    if fragment in PRESENT_WORDS:
+        now = datetime.now()
+        return now, now
+    # Whole-string fast path first so '2018-06' or 'Dec-2019' are not mistaken for ranges
+    single = _fast_parse(fragment, date.today())
+    if single is not None:
+        return single, single
+    parts = _split_range(fragment)
+    if parts is not None:
+        start = normalize_date(parts[0])
+        end_fragment = parts[1].strip(FRAGMENT_STRIP)
+        if start is not None and SHORT_YEAR.match(end_fragment):
+            # End year in the start's century, or the next one across a century boundary ('1999-00')
+            end_year = start.year // 100 * 100 + int(end_fragment)
+            if end_year < start.year:
+                end_year += 100
+            end = _on_default_day(end_year, start.month, date.today())
+        else:
+            end = normalize_date(end_fragment)
+        if start is not None and end is not None:
+            return start, end
+        return None
+    single = normalize_date(fragment)
+    if single is not None:
+        return single, single
+    return None
+
+
+@instrumented('check_timeline_consistency')
+def check_timeline_consistency(dates: list, gap_threshold_months: int = 6):
+    """
+    Analyze a list of date strings for timeline consistency (gaps, overlaps).
+    Args:
+        dates: List of date strings (from NER or manual extraction)
+        gap_threshold_months: Minimum gap (in months) to flag as a gap
+    Returns:
+        dict: { 'gaps': [...], 'overlaps': [...], 'parsed_dates': [...], 'issues': [...] }
+    """
+    parsed = []
+    for d in dates:
+        span = parse_date_range(d)
+        if span is not None:
+            parsed.append((span[0], span[1], d))
+    # One sweep over the entries sorted by start date
+    parsed.sort(key=lambda x: x[0])
+    issues = []
+    gaps = []
+    overlaps = []
+    for prev, curr in zip(parsed, parsed[1:]):
+        prev_end = prev[1]
+        curr_start = curr[0]
+        gap_months = (curr_start.year - prev_end.year) * 12 + (curr_start.month - prev_end.month)
+        if gap_months > gap_threshold_months:
+            gaps.append({
+                'between': (prev[2], curr[2]),
+                'gap_months': gap_months
+            })
+            issues.append(f"Gap of {gap_months} months between '{prev[2]}' and '{curr[2]}'")
+        if curr_start < prev_end:
+            overlaps.append({
+                'between': (prev[2], curr[2]),
+                'overlap': (prev_end - curr_start).days
+            })
+            issues.append(f"Overlap between '{prev[2]}' and '{curr[2]}'")
+    return {
+        'gaps': gaps,
+        'overlaps': overlaps,
+        'parsed_dates': [(str(s), str(e), label) for s, e, label in parsed],
+        'issues': issues
+    }
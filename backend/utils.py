@@ -1,24 +1,56 @@
 import os
+import re
+import copy
+import time
+import hashlib
+import tempfile
+import threading
 import fitz  # PyMuPDF
 import docx
 from fastapi import UploadFile
-import spacy
 from typing import Dict, List
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, ENGLISH_STOP_WORDS
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 import numpy as np
-import dateparser
 from datetime import datetime
-import textstat
+import bisect
+from corpus_store import CorpusStore
+from eda import EDAAccumulator, dataset_fingerprint, load_or_build_eda_snapshot, save_eda_snapshot
+from keyword_matcher import KeywordMatcher
+from analysis_context import AnalysisContext
+from readability import flesch_reading_ease, flesch_kincaid_grade
+from nlp_engine import NLPEngine
+from timeline import check_timeline_consistency
+from model_artifacts import MODEL_ARTIFACT_VERSION, model_artifacts_path, load_model_artifacts, save_model_artifacts
+from model_cache import model_cached
+from resume_index import ResumeIndex, resume_index_path
+from jd_registry import JD_DB, JDRegistry, match_scores
+from result_cache import ResultCache, content_hash
+from neighbors import NeighborIndex, ResumeEncoder, neighbor_index_path, neighbor_settings
+from skill_embeddings import SkillEmbeddingIndex, skill_embeddings_path, vocabulary_fingerprint
+from metrics import MODEL_LOAD_SECONDS, MODEL_LOADS, REGISTRY, instrumented
 
 ALLOWED_EXTENSIONS = {'.pdf', '.docx'}
+# Upload limits: reject anything larger than MAX_UPLOAD_BYTES, spill to disk past SPOOL_MEMORY_BYTES
+MAX_UPLOAD_BYTES = int(os.environ.get('RESUME_ANALYZER_MAX_UPLOAD_MB', '20')) * 1024 * 1024
+SPOOL_MEMORY_BYTES = 1024 * 1024
+UPLOAD_CHUNK_BYTES = 64 * 1024
+# Characters returned by the upload preview endpoints
+PREVIEW_CHARS = 1000
+# Characters of each matching resume returned by /search_resumes/
+SEARCH_PREVIEW_CHARS = 200
 
-# Load spaCy model once
-try:
-    nlp = spacy.load('en_core_web_sm')
-except OSError:
-    nlp = None  # Will raise error if used before download
+# Content-addressed result caches; set RESUME_ANALYZER_RESULT_CACHE_DB to persist them in sqlite
+RESULT_CACHE_DB = os.environ.get('RESUME_ANALYZER_RESULT_CACHE_DB')
+RESULT_CACHE_TTL = int(os.environ.get('RESUME_ANALYZER_RESULT_CACHE_TTL', str(24 * 3600)))
+TEXT_CACHE = ResultCache('extract_text', max_entries=512, ttl_seconds=RESULT_CACHE_TTL, db_path=RESULT_CACHE_DB)
+ENTITY_CACHE = ResultCache('resume_entities', max_entries=2048, ttl_seconds=RESULT_CACHE_TTL, db_path=RESULT_CACHE_DB)
+ANALYSIS_CACHE = ResultCache('analyze_resume', max_entries=2048, ttl_seconds=RESULT_CACHE_TTL, db_path=RESULT_CACHE_DB)
+
+# spaCy is loaded on first use with only the components NER needs
+NLP_ENGINE = NLPEngine()
 
 # Example skill/education/experience keywords (expand as needed)
 SKILL_KEYWORDS = [
@@ -28,7 +60,17 @@ SKILL_KEYWORDS = [
 EDU_KEYWORDS = ['bachelor', 'master', 'phd', 'university', 'college', 'degree', 'b.sc', 'm.sc', 'bachelor of', 'master of']
 EXP_KEYWORDS = ['engineer', 'developer', 'manager', 'analyst', 'consultant', 'intern', 'specialist', 'scientist']
 
-DATASET_PATH = 'UpdatedResumeDataSet.csv'
+DATASET_PATH = os.environ.get('RESUME_ANALYZER_DATASET', 'UpdatedResumeDataSet.csv')
+# Derived artifacts (EDA snapshots, fitted model arrays) are persisted here, keyed by dataset hash
+CACHE_DIR = os.environ.get('RESUME_ANALYZER_CACHE_DIR', 'cache')
+# Vocabulary of the category model: the most frequent terms (n-grams up to RESUME_ANALYZER_NGRAM_MAX words)
+VOCABULARY_SIZE = int(os.environ.get('RESUME_ANALYZER_VOCABULARY_SIZE', '2000'))
+NGRAM_MAX = int(os.environ.get('RESUME_ANALYZER_NGRAM_MAX', '1'))
+TFIDF_PARAMS = {'stop_words': 'english', 'max_features': VOCABULARY_SIZE}
+if NGRAM_MAX > 1:
+    TFIDF_PARAMS['ngram_range'] = (1, NGRAM_MAX)
+# Number of top TF-IDF terms per category kept with the model artifacts
+CATEGORY_TOP_SKILLS_STORED = 50
 
 # Mapping of categories to their top skills
 CATEGORY_SKILLS = {
@@ -103,132 +145,663 @@ BUZZWORDS = [
     'game changer', 'paradigm shift', 'disruptive', 'mission-critical', 'pivot', 'bandwidth', 'streamline'
 ]
 
+# Abbreviations and alternative names the character-trigram skill embeddings cannot infer
+SKILL_ALIASES = {
+    'machine learning': ['ml'],
+    'deep learning': ['dl', 'neural networks'],
+    'nlp': ['natural language processing'],
+    'sql': ['postgres', 'postgresql', 'mssql', 'sql server', 't-sql', 'pl/sql'],
+    'javascript': ['js', 'ecmascript'],
+    'aws': ['amazon web services', 'ec2', 's3'],
+    'azure': ['microsoft azure'],
+    'cloud': ['gcp', 'google cloud'],
+    'excel': ['spreadsheets', 'ms excel'],
+    'statistics': ['statistical analysis'],
+    'data analysis': ['data analytics'],
+    'project management': ['pmp', 'program management'],
+    'net': ['.net', 'dotnet', 'asp.net'],
+    'mongodb': ['mongo'],
+    'html': ['html5'],
+    'css': ['css3'],
+    'devops': ['ci/cd', 'continuous integration'],
+    'teamwork': ['team player', 'team work'],
+}
+
+# Simple passive voice heuristic: 'was|were|is|are|been|being' + past participle
+PASSIVE_VOICE_PATTERN = re.compile(r'\b(was|were|is|are|been|being)\b\s+\w+ed\b', re.IGNORECASE)
+
 # Common resume section headers
 SECTION_HEADERS = [
     'experience', 'education', 'skills', 'projects', 'summary', 'objective', 'certifications',
     'achievements', 'publications', 'interests', 'languages', 'contact', 'profile', 'work history'
 ]
 
+# Every keyword vocabulary compiled into one automaton so a resume is scanned once per request
+KEYWORD_MATCHER = KeywordMatcher(
+    [s.strip() for skills in CATEGORY_SKILLS.values() for s in skills.split(',')]
+    + SKILL_KEYWORDS + EDU_KEYWORDS + EXP_KEYWORDS + SOFT_SKILLS + BUZZWORDS + SECTION_HEADERS
+)
+# Skills compared between resumes and job descriptions
+MATCH_SKILLS = list(dict.fromkeys(
+    [s.lower() for s in SKILL_KEYWORDS]
+    + [s.strip().lower() for skills in CATEGORY_SKILLS.values() for s in skills.split(',') if s.strip()]
+))
+JD_REGISTRY = JDRegistry(MATCH_SKILLS, db_path=JD_DB)
+# Skills covered by the embedding index used for fuzzy matching
+EMBEDDED_SKILLS = list(dict.fromkeys(MATCH_SKILLS + [s.lower() for s in SOFT_SKILLS]))
+# Fuzzy skill matching ('postgres' counts for 'sql', 'ml' for 'machine learning'); off keeps exact keyword hits
+SEMANTIC_SKILL_MATCHING = os.environ.get('RESUME_ANALYZER_SEMANTIC_SKILLS', '0') == '1'
+# Word-boundary matching stops 'sql' matching inside 'mysql' and 'net' inside 'network'
+WORD_BOUNDARY_MATCHING = os.environ.get('RESUME_ANALYZER_WORD_BOUNDARY', '0') == '1'
+
+@instrumented('scan_keywords')
+def scan_keywords(text, word_boundary=None):
+    """
+    Find every known keyword (skills, education, experience, soft skills, buzzwords, headers) in one pass.
+    Args:
+        text: Raw resume text
+        word_boundary: Override WORD_BOUNDARY_MATCHING for this scan
+    Returns:
+        KeywordHits: Per-keyword counts and offsets over the lowercased text
+    """
+    if word_boundary is None:
+        word_boundary = WORD_BOUNDARY_MATCHING
+    return KEYWORD_MATCHER.scan(text.lower(), word_boundary=word_boundary)
+
+def build_analysis_context(text, model=None):
+    """
+    Create the shared per-request context consumed by the analyzers in this module.
+    Args:
+        text: Raw resume text
+        model: ResumeBenchmarkModel whose vectorizer backs ctx.tfidf (optional)
+    Returns:
+        AnalysisContext
+    """
+    return AnalysisContext(
+        text,
+        nlp=NLP_ENGINE,
+        vectorizer=model.vectorizer if model is not None else None,
+        matcher=KEYWORD_MATCHER,
+        word_boundary=WORD_BOUNDARY_MATCHING,
+    )
+
 class ResumeBenchmarkModel:
-    def __init__(self, dataset_path=DATASET_PATH):
-        self.df = pd.read_csv(dataset_path)
-        print('CSV columns:', self.df.columns.tolist())  # Debug print
-        self.categories = self.df['Category'].unique().tolist()
-        self.vectorizer = TfidfVectorizer(stop_words='english', max_features=2000)
-        # Fit on all resumes once
-        all_texts = self.df['Resume'].astype(str).tolist()
-        self.vectorizer.fit(all_texts)
-        self.category_profiles = self._build_category_profiles()
-
-    def _build_category_profiles(self):
-        profiles = {}
-        for cat in self.categories:
-            cat_texts = self.df[self.df['Category'] == cat]['Resume'].astype(str).tolist()
-            if cat_texts:
-                tfidf = self.vectorizer.transform(cat_texts)
-                mean_vec = tfidf.mean(axis=0)
-                mean_vec = np.asarray(mean_vec)
-                profiles[cat] = mean_vec
-        return profiles
+    def __init__(self, dataset_path=DATASET_PATH, cache_dir=CACHE_DIR, refit=False):
+        self.dataset_path = dataset_path
+        self.cache_dir = cache_dir
+        self._store = None
+        self._resume_index = None
+        self._neighbor_index = None
+        self._eda_accumulator = None
+        self.dataset_hash = dataset_fingerprint(dataset_path)
+        # Reuse fitted artifacts from disk when they match this dataset, otherwise fit and persist them
+        self.artifacts_path = model_artifacts_path(cache_dir, self.dataset_hash)
+        start = time.perf_counter()
+        source = 'artifacts'
+        artifacts = None if refit else load_model_artifacts(self.artifacts_path, self.dataset_hash, TFIDF_PARAMS)
+        if artifacts is None:
+            source = 'fit'
+            artifacts = self._fit()
+            self._save_artifacts(artifacts, overwrite=refit)
+        self._set_artifacts(artifacts)
+        # Precomputed EDA aggregates, rebuilt only when the dataset file changes
+        self.eda_snapshot = load_or_build_eda_snapshot(lambda: self.store, lambda: self.resume_index,
+                                                       self.dataset_hash, cache_dir)
+        MODEL_LOAD_SECONDS.set(time.perf_counter() - start, source=source)
+        MODEL_LOADS.inc(source=source)
+
+    def _set_artifacts(self, artifacts):
+        self.vectorizer = artifacts['vectorizer']
+        self.categories = list(artifacts['categories'])
+        # Profiles stacked into one L2-normalized matrix so ranking all categories is a single matmul
+        self.profile_categories = self.categories
+        self.profile_matrix = artifacts['profile_matrix']
+        self.profile_sums = artifacts['profile_sums']
+        self.category_profiles = {cat: self.profile_matrix[i:i + 1] for i, cat in enumerate(self.categories)}
+        self.category_top_skills = artifacts['category_top_skills']
+        self.dataset_stats = artifacts['dataset_stats']
+        # Identifies the fitted model in cache keys of results derived from it. The fit itself is hashed
+        # because a refit of the same dataset file yields a new vocabulary, IDF weights and profiles
+        fit_hash = content_hash('\n'.join(self.vectorizer.get_feature_names_out()),
+                                np.asarray(self.vectorizer.idf_).tobytes(),
+                                np.ascontiguousarray(self.profile_matrix).tobytes(), '\n'.join(self.categories))
+        self.version = f"{MODEL_ARTIFACT_VERSION}-{self.dataset_hash[:16]}-{fit_hash[:16]}"
+
+    def _save_artifacts(self, artifacts, overwrite=False):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            save_model_artifacts(self.artifacts_path, self.dataset_hash, TFIDF_PARAMS, overwrite=overwrite, **artifacts)
+        except OSError:
+            pass  # Read-only deployments keep the in-memory model
+
+    @property
+    def store(self):
+        # The corpus is only needed to (re)fit; models restored from artifacts open it on demand
+        if self._store is None:
+            self._store = CorpusStore.open_or_build(self.dataset_path, self.dataset_hash, self.cache_dir)
+        return self._store
+
+    @property
+    def resume_index(self):
+        # Built from the corpus store on first search and persisted next to the model artifacts
+        if self._resume_index is None:
+            path = resume_index_path(self.cache_dir, self.dataset_hash)
+            index = ResumeIndex.load(path, self.dataset_hash, KEYWORD_MATCHER.patterns)
+            if index is None:
+                index = ResumeIndex.build(self.store.iter_chunks(['Category', 'resume_lower']), KEYWORD_MATCHER.patterns)
+                try:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    index.save(path, self.dataset_hash)
+                except OSError:
+                    pass
+            self._resume_index = index
+        return self._resume_index
+
+    @property
+    def neighbor_index(self):
+        # Built from the corpus on first similarity search and persisted next to the model artifacts
+        if self._neighbor_index is None:
+            settings = neighbor_settings(TFIDF_PARAMS, self.vectorizer)
+            path = neighbor_index_path(self.cache_dir, self.dataset_hash, settings)
+            index = NeighborIndex.load(path, self.dataset_hash, settings, self.vectorizer)
+            if index is None:
+                encoder = ResumeEncoder.create(settings, self.vectorizer)
+                if settings['vectors'] == 'tfidf':
+                    term_vectors = self.corpus_tfidf()
+                else:
+                    term_vectors = encoder.vectorizer.transform(self.store.iter_column('resume_lower'))
+                index = NeighborIndex.build(settings, encoder, term_vectors, self.store.column('Category').tolist())
+                try:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    index.save(path, self.dataset_hash)
+                except OSError:
+                    pass
+            self._neighbor_index = index
+        return self._neighbor_index
+
+    @instrumented('similar_resumes')
+    def similar_resumes(self, resume_text, top_k=10, category=None):
+        """
+        Corpus resumes most similar to a resume (cosine similarity in the neighbour index's vector space).
+        Args:
+            resume_text: Resume text
+            top_k: Number of resumes returned
+            category: Optional category filter
+        Returns:
+            dict: { 'method', 'scored', 'results': [{'id', 'category', 'similarity', 'preview'}] }
+        """
+        index = self.neighbor_index
+        ids, similarities, scored = index.search(resume_text, top_k=top_k, category=category)
+        results = [{"id": int(i), "category": index.category_of(i), "similarity": float(s)}
+                   for i, s in zip(ids, similarities)]
+        if results:
+            rows = self.store.take([r['id'] for r in results], columns=['Resume'])
+            for r, resume in zip(results, rows['Resume']):
+                r['preview'] = (resume or '')[:SEARCH_PREVIEW_CHARS]
+        return {"method": index.method, "scored": int(scored), "results": results}
+
+    @instrumented('search_resumes')
+    def search_resumes(self, query, category=None, top_k=20, ranked=True):
+        """
+        Boolean / ranked skill search over the corpus, e.g. 'python AND django NOT php in Python Developer'.
+        Args:
+            query: Query string (see ResumeIndex.search for the syntax)
+            category: Optional category filter
+            top_k: Number of resumes returned
+            ranked: Order by BM25 relevance instead of corpus order
+        Returns:
+            dict: { 'total', 'category', 'results': [{'id', 'category', 'score', 'preview'}] }
+        """
+        result = self.resume_index.search(query, category=category, top_k=top_k, ranked=ranked)
+        if result['results']:
+            rows = self.store.take([r['id'] for r in result['results']], columns=['Resume'])
+            for r, resume in zip(result['results'], rows['Resume']):
+                r['preview'] = (resume or '')[:SEARCH_PREVIEW_CHARS]
+        return result
+
+    @model_cached
+    def corpus_tfidf(self):
+        """TF-IDF rows of every corpus resume (row i is resume id i), for matching JDs against the corpus."""
+        return self.vectorizer.transform(self.store.iter_column('resume_lower'))
+
+    @model_cached
+    def corpus_skill_matrix(self):
+        """
+        Binary resume x MATCH_SKILLS matrix. Skills are extracted by the same keyword scan, in the same
+        WORD_BOUNDARY_MATCHING mode, as those of request resumes and JDs (the resume index's phrase postings
+        always use substring semantics), so corpus and request resumes score alike.
+        """
+        return JD_REGISTRY.skill_matrix([
+            extract_skill_set(KEYWORD_MATCHER.scan(lower, word_boundary=WORD_BOUNDARY_MATCHING))
+            for lower in self.store.iter_column('resume_lower')
+        ])
+
+    def _fit(self):
+        store = self.store
+        row_categories = store.column('Category')
+        categories = row_categories.unique().tolist()
+        vectorizer = TfidfVectorizer(**TFIDF_PARAMS)
+        # Fit on all resumes once, streamed from the store, and reuse the sparse matrix for every profile
+        tfidf = vectorizer.fit_transform(store.iter_column('resume_lower'))
+        feature_array = vectorizer.get_feature_names_out()
+        profiles = []
+        sums = []
+        category_top_skills = {}
+        for cat in categories:
+            rows = np.flatnonzero((row_categories == cat).to_numpy())
+            sums.append(np.asarray(tfidf[rows].sum(axis=0)).ravel())
+            mean_vec = np.asarray(tfidf[rows].mean(axis=0)).ravel()
+            profiles.append(mean_vec)
+            top_indices = mean_vec.argsort()[::-1][:CATEGORY_TOP_SKILLS_STORED]
+            category_top_skills[cat] = [str(feature_array[i]) for i in top_indices]
+        return {
+            "vectorizer": vectorizer,
+            "categories": categories,
+            "profile_matrix": normalize(np.vstack(profiles)),
+            "profile_sums": np.vstack(sums),
+            "category_top_skills": category_top_skills,
+            "dataset_stats": {
+                "total_resumes": int(store.num_rows),
+                "category_counts": {cat: int(n) for cat, n in row_categories.value_counts().items()},
+                # Appended resumes are folded into the profiles with this fit's vocabulary and IDF
+                "rows_at_fit": int(store.num_rows),
+                "appended_since_fit": 0,
+            },
+        }
+
+    @property
+    def drift(self):
+        """Fraction of the corpus appended since the vocabulary and IDF weights were last fitted."""
+        stats = self.dataset_stats
+        return stats.get('appended_since_fit', 0) / max(stats.get('total_resumes', 0), 1)
+
+    def with_appended(self, records, dataset_hash):
+        """
+        Return a new model with appended resumes folded in, without refitting the vectorizer.
+        The CSV must already contain the records; this model is left untouched so requests in
+        flight keep a consistent view.
+        Args:
+            records: DataFrame with 'Category', 'Resume' and 'Skills' columns
+            dataset_hash: Fingerprint of the dataset file after the append
+        Returns:
+            ResumeBenchmarkModel
+        """
+        model = copy.copy(self)
+        model.__dict__.pop('_model_cache', None)
+        categories = list(self.categories)
+        counts = dict(self.dataset_stats['category_counts'])
+        sums = np.array(self.profile_sums, dtype=np.float64)
+        new_categories = [cat for cat in dict.fromkeys(records['Category']) if cat not in counts]
+        if new_categories:
+            categories.extend(new_categories)
+            sums = np.vstack([sums, np.zeros((len(new_categories), sums.shape[1]))])
+        index = {cat: i for i, cat in enumerate(categories)}
+        tfidf = self.vectorizer.transform(records['Resume'].astype(str).tolist())
+        record_categories = records['Category'].to_numpy()
+        touched = list(dict.fromkeys(record_categories))
+        for cat in touched:
+            rows = np.flatnonzero(record_categories == cat)
+            sums[index[cat]] += np.asarray(tfidf[rows].sum(axis=0)).ravel()
+            counts[cat] = counts.get(cat, 0) + len(rows)
+
+        feature_array = self.vectorizer.get_feature_names_out()
+        category_top_skills = dict(self.category_top_skills)
+        for cat in touched:
+            mean_vec = sums[index[cat]] / counts[cat]
+            top_indices = mean_vec.argsort()[::-1][:CATEGORY_TOP_SKILLS_STORED]
+            category_top_skills[cat] = [str(feature_array[i]) for i in top_indices]
+        total = int(self.dataset_stats['total_resumes']) + len(records)
+        artifacts = {
+            "vectorizer": self.vectorizer,
+            "categories": categories,
+            "profile_matrix": normalize(sums / np.array([[counts[cat]] for cat in categories])),
+            "profile_sums": sums,
+            "category_top_skills": category_top_skills,
+            "dataset_stats": {
+                "total_resumes": total,
+                "category_counts": dict(sorted(counts.items(), key=lambda kv: kv[1], reverse=True)),
+                "rows_at_fit": int(self.dataset_stats.get('rows_at_fit', self.dataset_stats['total_resumes'])),
+                "appended_since_fit": int(self.dataset_stats.get('appended_since_fit', 0)) + len(records),
+            },
+        }
+        model.dataset_hash = dataset_hash
+        model.artifacts_path = model_artifacts_path(self.cache_dir, dataset_hash)
+        model._set_artifacts(artifacts)
+        model._save_artifacts(artifacts)
+
+        # The search index gains postings for the new ids only; unloaded indexes are rebuilt on demand
+        model._resume_index = None
+        if self._resume_index is not None:
+            lower = [r.lower() for r in records['Resume'].astype(str)]
+            model._resume_index = self._resume_index.with_appended(records['Category'].tolist(), lower)
+            try:
+                model._resume_index.save(resume_index_path(self.cache_dir, dataset_hash), dataset_hash)
+            except OSError:
+                pass
+
+        # Appended resumes are encoded with the same vectorizer (and SVD projection); unloaded indexes are rebuilt on demand
+        model._neighbor_index = None
+        if self._neighbor_index is not None:
+            model._neighbor_index = self._neighbor_index.with_appended(records['Resume'].astype(str).tolist(),
+                                                                       records['Category'].tolist())
+            try:
+                model._neighbor_index.save(neighbor_index_path(self.cache_dir, dataset_hash, model._neighbor_index.settings),
+                                           dataset_hash)
+            except OSError:
+                pass
+
+        # Reuse the existing part files when the store is open; otherwise it is built on demand
+        model._store = None
+        if self._store is not None:
+            try:
+                model._store = self._store.with_appended(records, dataset_hash, self.cache_dir)
+            except OSError:
+                pass
+        if self._eda_accumulator is None:
+            # No running aggregates yet: one pass over the updated corpus builds them
+            accumulator = EDAAccumulator.from_store(model.store)
+        else:
+            # Copied so this model's aggregates stay consistent with its own snapshot
+            accumulator = copy.deepcopy(self._eda_accumulator)
+            for cat, resume, skills in zip(records['Category'], records['Resume'], records['Skills']):
+                accumulator.add(cat, resume, skills)
+        model._eda_accumulator = accumulator
+        # Skill coverage is read from the updated index postings; only skills new to the dataset need a corpus pass
+        model.eda_snapshot = accumulator.snapshot(model.resume_index, dataset_hash, lambda: model.store)
+        save_eda_snapshot(model.eda_snapshot, self.cache_dir)
+        return model
+
 
+    @model_cached
     def get_category_skills(self, category, top_n=20):
-        cat_texts = self.df[self.df['Category'] == category]['Resume'].astype(str).tolist()
-        if not cat_texts:
+        top_skills = self.category_top_skills.get(category)
+        if top_skills is None:
             return []
-        tfidf = self.vectorizer.transform(cat_texts)
+        if top_n <= len(top_skills):
+            return top_skills[:top_n]
+        # Beyond the stored terms, rank the full profile row (same ordering as the mean TF-IDF)
         feature_array = self.vectorizer.get_feature_names_out()
-        avg_tfidf = tfidf.mean(axis=0).A1
+        avg_tfidf = np.asarray(self.category_profiles[category]).ravel()
         top_indices = avg_tfidf.argsort()[::-1][:top_n]
-        return [feature_array[i] for i in top_indices]
+        return [str(feature_array[i]) for i in top_indices]
 
-    def compare_resume(self, resume_text, category):
+    @instrumented('compare_resume')
+    def compare_resume(self, resume_text, category, ctx=None):
+        if ctx is None:
+            ctx = build_analysis_context(resume_text, self)
         # Vectorize resume and compare to category profile
-        resume_vec = self.vectorizer.transform([resume_text])
+        resume_vec = ctx.tfidf
         cat_vec = self.category_profiles.get(category)
         if cat_vec is None:
             return {"similarity": 0.0, "skill_match": 0.0, "matched_skills": []}
         # Ensure both are arrays
         sim = cosine_similarity(resume_vec, cat_vec)
         similarity_score = float(sim[0, 0])
+        return {"similarity": similarity_score, **category_skill_match(category, ctx)}
 
-        # Skill match logic
-        skills_str = CATEGORY_SKILLS.get(category, "")
-        skill_list = [s.strip().lower() for s in skills_str.split(",") if s.strip()]
-        resume_text_lower = resume_text.lower()
-        matched_skills = [skill for skill in skill_list if skill in resume_text_lower]
-        skill_match_score = len(matched_skills) / len(skill_list) if skill_list else 0.0
+    @instrumented('rank_categories')
+    def rank_categories(self, resume_texts, top_k=5):
+        """
+        Rank every category for each resume by cosine similarity to the category profiles.
+        Args:
+            resume_texts: List of resume texts
+            top_k: Number of categories returned per resume
+        Returns:
+            list: Per resume, [{'category', 'similarity'}] sorted by descending similarity
+        """
+        if not resume_texts:
+            return []
+        # TF-IDF rows are L2-normalized, so the product with the normalized profiles is cosine similarity
+        scores = np.asarray(self.vectorizer.transform(resume_texts) @ self.profile_matrix.T)
+        top_k = max(1, min(top_k, scores.shape[1]))
+        top = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        rankings = []
+        for row, idx in zip(scores, top):
+            idx = idx[np.argsort(-row[idx])]
+            rankings.append([
+                {"category": self.profile_categories[i], "similarity": float(row[i])} for i in idx
+            ])
+        return rankings
 
-        return {
-            "similarity": similarity_score,
-            "skill_match": skill_match_score,
-            "matched_skills": matched_skills
-        }
+def category_skill_match(category, ctx):
+    """match_category_skills over the resume in ctx, using fuzzy skill matching when enabled."""
+    if not SEMANTIC_SKILL_MATCHING:
+        return match_category_skills(category, ctx.keyword_hits)
+    with ctx.stage('semantic_skills'):
+        return match_category_skills_semantic(category, ctx.lower)
+
+def match_category_skills_semantic(category, lower_text):
+    """
+    Check which curated CATEGORY_SKILLS of a category appear in the resume, tolerating
+    spelling variants and known aliases.
+    Args:
+        category: Resume category
+        lower_text: Lowercased resume text
+    Returns:
+        dict: { 'skill_match', 'matched_skills', 'skill_scores': {skill: {'score', 'matched'}} }
+    """
+    skills_str = CATEGORY_SKILLS.get(category, "")
+    skill_list = [s.strip().lower() for s in skills_str.split(",") if s.strip()]
+    scores = get_skill_index().match(lower_text, skill_list)
+    matched_skills = [skill for skill in skill_list if skill in scores]
+    skill_match_score = len(matched_skills) / len(skill_list) if skill_list else 0.0
+    return {"skill_match": skill_match_score, "matched_skills": matched_skills, "skill_scores": scores}
+
+def match_category_skills(category, hits):
+    """
+    Check which curated CATEGORY_SKILLS of a category appear in a keyword scan.
+    Args:
+        category: Resume category
+        hits: KeywordHits for the resume
+    Returns:
+        dict: { 'skill_match': fraction matched, 'matched_skills': [...] }
+    """
+    skills_str = CATEGORY_SKILLS.get(category, "")
+    skill_list = [s.strip().lower() for s in skills_str.split(",") if s.strip()]
+    matched_skills = [skill for skill in skill_list if skill in hits]
+    skill_match_score = len(matched_skills) / len(skill_list) if skill_list else 0.0
+    return {"skill_match": skill_match_score, "matched_skills": matched_skills}
 
 # Singleton for the model
 benchmark_model = None
+skill_index = None
+# Held while the model (or skill index) loads, so concurrent first callers (e.g. requests during
+# startup warm-up) wait for that one instance instead of each building their own
+_model_lock = threading.Lock()
+_skill_index_lock = threading.Lock()
+
+def get_skill_index():
+    """Skill embedding index, loaded from the cache dir or built (and saved) on first use."""
+    global skill_index
+    if skill_index is None:
+        with _skill_index_lock:
+            if skill_index is None:
+                fingerprint = vocabulary_fingerprint(EMBEDDED_SKILLS, SKILL_ALIASES)
+                path = skill_embeddings_path(CACHE_DIR, fingerprint)
+                index = SkillEmbeddingIndex.load(path, fingerprint)
+                if index is None:
+                    index = SkillEmbeddingIndex.build(EMBEDDED_SKILLS, SKILL_ALIASES)
+                    try:
+                        os.makedirs(CACHE_DIR, exist_ok=True)
+                        index.save(path, fingerprint)
+                    except OSError:
+                        pass
+                skill_index = index
+    return skill_index
 
 def get_benchmark_model():
     global benchmark_model
     if benchmark_model is None:
-        benchmark_model = ResumeBenchmarkModel()
+        with _model_lock:
+            if benchmark_model is None:
+                benchmark_model = ResumeBenchmarkModel()
     return benchmark_model
 
+def set_benchmark_model(model):
+    """Swap in a new model; requests already holding the old one finish against it."""
+    global benchmark_model
+    benchmark_model = model
+
 def allowed_file(filename):
     ext = os.path.splitext(filename)[1].lower()
     return ext in ALLOWED_EXTENSIONS
 
 
-def extract_text_from_pdf(file_bytes):
-    doc = fitz.open(stream=file_bytes, filetype="pdf")
-    text = "\n".join(page.get_text() for page in doc)
-    doc.close()
-    return text
+class UploadTooLargeError(ValueError):
+    pass
 
 
-def extract_text_from_docx(file_bytes):
+def spool_upload(upload_file: UploadFile, max_bytes=None):
+    """
+    Copy an upload in fixed-size chunks, enforcing the size limit as it streams.
+    Small uploads stay in memory; larger ones spill to a temporary file that parsers read lazily.
+    Args:
+        upload_file: Incoming upload
+        max_bytes: Size limit (defaults to MAX_UPLOAD_BYTES)
+    Returns:
+        tuple: (file contents as bytes, or the path of a temporary file the caller must remove;
+                sha256 hex digest of the contents)
+    """
+    if max_bytes is None:
+        max_bytes = MAX_UPLOAD_BYTES
+    # Reject early when the client declared the size up front
+    if getattr(upload_file, 'size', None) and upload_file.size > max_bytes:
+        raise UploadTooLargeError(f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+    buffer = bytearray()
+    spill = None
+    total = 0
+    digest = hashlib.sha256()
+    try:
+        while True:
+            chunk = upload_file.file.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            total += len(chunk)
+            digest.update(chunk)
+            if total > max_bytes:
+                raise UploadTooLargeError(f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+            if spill is None and total > SPOOL_MEMORY_BYTES:
+                spill = tempfile.NamedTemporaryFile(suffix=os.path.splitext(upload_file.filename)[1], delete=False)
+                spill.write(buffer)
+                buffer = None
+            if spill is None:
+                buffer.extend(chunk)
+            else:
+                spill.write(chunk)
+    except BaseException:
+        if spill is not None:
+            spill.close()
+            os.unlink(spill.name)
+        raise
+    if spill is None:
+        return bytes(buffer), digest.hexdigest()
+    spill.close()
+    return spill.name, digest.hexdigest()
+
+
+def iter_pdf_text(source):
+    """Yield the text of each PDF page in order. `source` is the file bytes or a path."""
+    if isinstance(source, (bytes, bytearray)):
+        doc = fitz.open(stream=source, filetype="pdf")
+    else:
+        doc = fitz.open(source, filetype="pdf")
+    try:
+        for page in doc:
+            yield page.get_text()
+    finally:
+        doc.close()
+
+
+def iter_docx_text(source):
+    """Yield the text of each DOCX paragraph in order. `source` is the file bytes or a path."""
     from io import BytesIO
-    doc = docx.Document(BytesIO(file_bytes))
-    text = "\n".join([para.text for para in doc.paragraphs])
-    return text
+    doc = docx.Document(BytesIO(source) if isinstance(source, (bytes, bytearray)) else source)
+    for para in doc.paragraphs:
+        yield para.text
+
+
+def _join_text(pieces, max_chars=None):
+    # Same result as "\n".join(pieces)[:max_chars], but stops pulling pieces once enough text exists
+    parts = []
+    length = -1
+    for piece in pieces:
+        parts.append(piece)
+        length += len(piece) + 1
+        if max_chars is not None and length >= max_chars:
+            break
+    text = "\n".join(parts)
+    return text if max_chars is None else text[:max_chars]
+
+
+def extract_text_from_pdf(file_bytes, max_chars=None):
+    return _join_text(iter_pdf_text(file_bytes), max_chars)
+
 
+def extract_text_from_docx(file_bytes, max_chars=None):
+    return _join_text(iter_docx_text(file_bytes), max_chars)
 
-def extract_text(upload_file: UploadFile):
+
+@instrumented('extract_text')
+def extract_text(upload_file: UploadFile, max_chars=None, max_bytes=None):
+    """
+    Extract text from an uploaded PDF or DOCX.
+    Args:
+        upload_file: Incoming upload
+        max_chars: Stop extracting once this many characters are available (e.g. for previews)
+        max_bytes: Upload size limit (defaults to MAX_UPLOAD_BYTES)
+    Returns:
+        str: Extracted text
+    """
     filename = upload_file.filename
     ext = os.path.splitext(filename)[1].lower()
-    file_bytes = upload_file.file.read()
-    if ext == '.pdf':
-        return extract_text_from_pdf(file_bytes)
-    elif ext == '.docx':
-        return extract_text_from_docx(file_bytes)
-    else:
+    if ext not in ALLOWED_EXTENSIONS:
         raise ValueError("Unsupported file type")
+    source, digest = spool_upload(upload_file, max_bytes)
+    try:
+        key = content_hash('extract_text', digest, ext, max_chars)
+        if ext == '.pdf':
+            return TEXT_CACHE.get_or_compute(key, lambda: extract_text_from_pdf(source, max_chars))
+        return TEXT_CACHE.get_or_compute(key, lambda: extract_text_from_docx(source, max_chars))
+    finally:
+        if isinstance(source, str):
+            os.unlink(source)
 
 
-def extract_resume_entities(text: str) -> Dict[str, List[str]]:
-    if nlp is None:
-        raise RuntimeError("spaCy model not loaded. Run: python -m spacy download en_core_web_sm")
-    doc = nlp(text)
+@instrumented('extract_resume_entities')
+def extract_resume_entities(text: str, ctx: AnalysisContext = None) -> Dict[str, List[str]]:
+    if ctx is None:
+        ctx = build_analysis_context(text)
+    key = content_hash('resume_entities', text, ctx.word_boundary)
+    return ENTITY_CACHE.get_or_compute(
+        key, lambda: {**extract_keyword_entities(ctx), **extract_named_entities(ctx.doc)}
+    )
+
+def extract_keyword_entities(ctx: AnalysisContext) -> Dict[str, List[str]]:
     skills = set()
     education = set()
     experience = set()
     # Simple keyword-based extraction
-    lower_text = text.lower()
+    hits = ctx.keyword_hits
     for skill in SKILL_KEYWORDS:
-        if skill in lower_text:
+        if skill in hits:
             skills.add(skill)
     for edu in EDU_KEYWORDS:
-        if edu in lower_text:
+        if edu in hits:
             education.add(edu)
     for exp in EXP_KEYWORDS:
-        if exp in lower_text:
+        if exp in hits:
             experience.add(exp)
-    # Optionally, use NER for ORG, DATE, etc.
-    orgs = [ent.text for ent in doc.ents if ent.label_ == 'ORG']
-    dates = [ent.text for ent in doc.ents if ent.label_ == 'DATE']
     return {
         'skills': list(skills),
         'education': list(education),
         'experience': list(experience),
+    }
+
+def extract_named_entities(doc) -> Dict[str, List[str]]:
+    # Optionally, use NER for ORG, DATE, etc.
+    orgs = [ent.text for ent in doc.ents if ent.label_ == 'ORG']
+    dates = [ent.text for ent in doc.ents if ent.label_ == 'DATE']
+    return {
         'organizations': orgs,
         'dates': dates
     }
@@ -240,59 +813,7 @@ def add_skills_column_to_dataset(dataset_path=DATASET_PATH):
     df.to_csv(dataset_path, index=False)
     print('Skills column added and dataset overwritten.')
 
-def check_timeline_consistency(dates: list, gap_threshold_months: int = 6):
-    """
-    Analyze a list of date strings for timeline consistency (gaps, overlaps).
-    Args:
-        dates: List of date strings (from NER or manual extraction)
-        gap_threshold_months: Minimum gap (in months) to flag as a gap
-    Returns:
-        dict: { 'gaps': [...], 'overlaps': [...], 'parsed_dates': [...], 'issues': [...] }
-    """
-    # Parse dates and sort
-    parsed = []
-    for d in dates:
-        # Try to parse single dates or ranges (e.g., 'Jan 2020 - Mar 2021')
-        if '-' in d and len(d.split('-')) == 2:
-            start, end = d.split('-')
-            start_dt = dateparser.parse(start.strip())
-            end_dt = dateparser.parse(end.strip())
-            if start_dt and end_dt:
-                parsed.append((start_dt, end_dt, d))
-        else:
-            dt = dateparser.parse(d)
-            if dt:
-                parsed.append((dt, dt, d))
-    # Sort by start date
-    parsed = sorted(parsed, key=lambda x: x[0])
-    issues = []
-    gaps = []
-    overlaps = []
-    for i in range(1, len(parsed)):
-        prev_end = parsed[i-1][1]
-        curr_start = parsed[i][0]
-        # Gap detection
-        gap_months = (curr_start.year - prev_end.year) * 12 + (curr_start.month - prev_end.month)
-        if gap_months > gap_threshold_months:
-            gaps.append({
-                'between': (parsed[i-1][2], parsed[i][2]),
-                'gap_months': gap_months
-            })
-            issues.append(f"Gap of {gap_months} months between '{parsed[i-1][2]}' and '{parsed[i][2]}'")
-        # Overlap detection
-        if curr_start < prev_end:
-            overlaps.append({
-                'between': (parsed[i-1][2], parsed[i][2]),
-                'overlap': (prev_end - curr_start).days
-            })
-            issues.append(f"Overlap between '{parsed[i-1][2]}' and '{parsed[i][2]}'")
-    return {
-        'gaps': gaps,
-        'overlaps': overlaps,
-        'parsed_dates': [(str(s), str(e), label) for s, e, label in parsed],
-        'issues': issues
-    }
-
+@instrumented('suggest_career_path')
 def suggest_career_path_and_upskilling(category, missing_skills):
     """
     Suggest next possible roles/job titles and upskilling suggestions.
@@ -322,58 +843,285 @@ def suggest_career_path_and_upskilling(category, missing_skills):
         'upskilling': upskilling
     }
 
-def detect_soft_skills(text: str):
+@instrumented('detect_soft_skills')
+def detect_soft_skills(text: str, ctx: AnalysisContext = None):
     """
     Detect soft skills mentioned in the resume text.
     Args:
         text: Resume text
+        ctx: Shared AnalysisContext for this text (built on demand if omitted)
     Returns:
         list: Detected soft skills
     """
-    lower_text = text.lower()
-    detected = [skill for skill in SOFT_SKILLS if skill in lower_text]
+    if ctx is None:
+        ctx = build_analysis_context(text)
+    hits = ctx.keyword_hits
+    detected = [skill for skill in SOFT_SKILLS if skill in hits]
     return detected
 
-def analyze_readability_ats(text, category=None, curated_skills=None):
+def passive_sentence_indices(ctx):
+    """
+    Indices into ctx.sentence_spans of the sentences containing passive voice, from one scan of the text.
+    A match cannot span sentence punctuation, so each one falls inside a single sentence.
+    """
+    starts = [start for start, _ in ctx.sentence_spans]
+    return sorted({bisect.bisect_right(starts, m.start()) - 1 for m in PASSIVE_VOICE_PATTERN.finditer(ctx.text)})
+
+@instrumented('analyze_readability_ats')
+def analyze_readability_ats(text, category=None, curated_skills=None, ctx: AnalysisContext = None):
     """
     Analyze resume readability and ATS optimization.
     Returns a dict with readability score, buzzword overuse, passive voice, section headers, keyword frequency, etc.
     """
+    if ctx is None:
+        ctx = build_analysis_context(text)
+    hits = ctx.keyword_hits
     report = {}
-    # Readability
+    # Readability: both Flesch scores come from one set of word/sentence/syllable counts
     try:
-        flesch = textstat.flesch_reading_ease(text)
-        flesch_kincaid = textstat.flesch_kincaid_grade(text)
-        report['flesch_reading_ease'] = flesch
-        report['flesch_kincaid_grade'] = flesch_kincaid
+        stats = ctx.text_stats
+        report['flesch_reading_ease'] = flesch_reading_ease(stats)
+        report['flesch_kincaid_grade'] = flesch_kincaid_grade(stats)
     except Exception as e:
         report['flesch_reading_ease'] = None
         report['flesch_kincaid_grade'] = None
         report['readability_error'] = str(e)
     # Buzzword overuse
-    buzzword_counts = {bw: text.lower().count(bw) for bw in BUZZWORDS if text.lower().count(bw) > 0}
+    buzzword_counts = {bw: hits.count(bw) for bw in BUZZWORDS if bw in hits}
     report['buzzword_counts'] = buzzword_counts
     report['buzzword_flag'] = any(count > 2 for count in buzzword_counts.values())  # flag if any buzzword used >2 times
     # Passive voice (simple heuristic: look for 'was|were|is|are|been|being' + past participle)
-    passive_phrases = []
-    import re
-    sentences = re.split(r'[.!?]', text)
-    for sent in sentences:
-        if re.search(r'\b(was|were|is|are|been|being)\b\s+\w+ed\b', sent, re.IGNORECASE):
-            passive_phrases.append(sent.strip())
+    spans = ctx.sentence_spans
+    passive_phrases = [ctx.text[spans[i][0]:spans[i][1]].strip() for i in passive_sentence_indices(ctx)]
     report['passive_voice_count'] = len(passive_phrases)
     report['passive_voice_examples'] = passive_phrases[:3]  # show up to 3 examples
     # Section headers
-    found_headers = [h for h in SECTION_HEADERS if h in text.lower()]
+    found_headers = [h for h in SECTION_HEADERS if h in hits]
     report['section_headers_found'] = found_headers
     report['section_headers_missing'] = [h for h in SECTION_HEADERS if h not in found_headers]
     # ATS keyword frequency (from curated_skills)
     if curated_skills:
-        keyword_freq = {k: text.lower().count(k.lower()) for k in curated_skills}
+        # Skills outside the compiled vocabulary fall back to a direct count
+        keyword_freq = {
+            k: hits.count(k.lower()) if k.lower() in KEYWORD_MATCHER else ctx.lower.count(k.lower())
+            for k in curated_skills
+        }
         report['ats_keyword_frequency'] = keyword_freq
         # Flag if any important skill is missing
         report['ats_missing_keywords'] = [k for k, v in keyword_freq.items() if v == 0]
     else:
         report['ats_keyword_frequency'] = {}
         report['ats_missing_keywords'] = []
-    return report 
\ No newline at end of file
+    return report
+
+def curated_category_skills(category):
+    """Curated skills for a category, excluding stopwords."""
+    return [s.strip() for s in CATEGORY_SKILLS.get(category, "").split(",") if s.strip() and s.strip().lower() not in ENGLISH_STOP_WORDS]
+
+def build_resume_report(ctx, category, comparison, top_skills, entities):
+    """
+    Run the model-independent analyzers and assemble the /analyze_resume/ payload.
+    Args:
+        ctx: AnalysisContext for the resume
+        category: Target category
+        comparison: compare_resume result (similarity, skill_match, matched_skills)
+        top_skills: Top TF-IDF skills for the category
+        entities: extract_resume_entities result
+    Returns:
+        dict: Full analysis report
+    """
+    curated_skills = curated_category_skills(category)
+    # Timeline & Consistency Check
+    with ctx.stage('timeline'):
+        timeline_report = check_timeline_consistency(entities.get('dates', []))
+    # Career Path Suggestions
+    missing_skills = [s for s in curated_skills if s not in comparison['matched_skills']]
+    career_suggestions = suggest_career_path_and_upskilling(category, missing_skills)
+    # Soft Skills Detection
+    soft_skills = detect_soft_skills(ctx.text, ctx=ctx)
+    # Readability & ATS Optimization
+    with ctx.stage('readability_ats'):
+        readability_ats_report = analyze_readability_ats(ctx.text, category, curated_skills, ctx=ctx)
+    report = {
+        "similarity": comparison["similarity"],
+        "skill_match": comparison["skill_match"],
+        "matched_skills": comparison["matched_skills"],
+        "top_skills": top_skills,
+        "all_skills": curated_skills,
+        "timeline_report": timeline_report,
+        "career_suggestions": career_suggestions,
+        "soft_skills": soft_skills,
+        "readability_ats_report": readability_ats_report,
+        "stage_timings_ms": ctx.timings
+    }
+    if "skill_scores" in comparison:
+        # Semantic matching: which resume phrase matched each skill, and how closely
+        report["skill_scores"] = comparison["skill_scores"]
+    return report
+
+@instrumented('analyze_resume')
+def analyze_resume_text(text, category, model=None):
+    """
+    Full single-resume analysis as served by /analyze_resume/.
+    Args:
+        text: Resume text
+        category: Target category
+        model: ResumeBenchmarkModel (defaults to the shared singleton)
+    Returns:
+        dict: Analysis report (see build_resume_report)
+    """
+    if model is None:
+        model = get_benchmark_model()
+    start = time.perf_counter()
+    key = analysis_cache_key(text, category, model)
+    cached = ANALYSIS_CACHE.get(key)
+    if cached is not None:
+        return {**cached, "stage_timings_ms": {"cache_lookup": (time.perf_counter() - start) * 1000}}
+    # Shared context: text is lowercased, scanned, parsed and vectorized at most once
+    ctx = build_analysis_context(text, model)
+    with ctx.stage('compare_resume'):
+        comparison = model.compare_resume(text, category, ctx=ctx)
+    with ctx.stage('category_skills'):
+        top_skills = model.get_category_skills(category)
+    with ctx.stage('entities'):
+        entities = extract_resume_entities(text, ctx=ctx)
+    report = build_resume_report(ctx, category, comparison, top_skills, entities)
+    ANALYSIS_CACHE.set(key, report)
+    return report
+
+def analysis_cache_key(text, category, model):
+    return content_hash('analyze_resume', text, category, model.version, WORD_BOUNDARY_MATCHING, SEMANTIC_SKILL_MATCHING)
+
+def result_cache_stats():
+    return {cache.name: cache.stats() for cache in (TEXT_CACHE, ENTITY_CACHE, ANALYSIS_CACHE)}
+
+def collect_cache_metrics():
+    """Scrape-time view of the result caches for /metrics (see MetricsRegistry.register_collector)."""
+    stats = result_cache_stats()
+    return [
+        ('resume_analyzer_cache_hits_total', 'counter', 'Result cache hits by tier',
+         [({'cache': name, 'tier': tier}, s[f'{tier}_hits']) for name, s in stats.items() for tier in ('memory', 'disk')]),
+        ('resume_analyzer_cache_misses_total', 'counter', 'Result cache misses',
+         [({'cache': name}, s['misses']) for name, s in stats.items()]),
+        ('resume_analyzer_cache_evictions_total', 'counter', 'Result cache LRU evictions',
+         [({'cache': name}, s['evictions']) for name, s in stats.items()]),
+        ('resume_analyzer_cache_hit_ratio', 'gauge', 'Result cache hits / lookups since start',
+         [({'cache': name}, s['hit_rate']) for name, s in stats.items()]),
+        ('resume_analyzer_cache_entries', 'gauge', 'Entries in the in-process result cache tier',
+         [({'cache': name}, s['entries']) for name, s in stats.items()]),
+        ('resume_analyzer_cache_bytes', 'gauge', 'Approximate size of the in-process result cache tier',
+         [({'cache': name}, s['bytes']) for name, s in stats.items()]),
+    ]
+
+REGISTRY.register_collector(collect_cache_metrics)
+
+def extract_skill_set(hits):
+    """MATCH_SKILLS present in a keyword scan, in vocabulary order."""
+    return [skill for skill in MATCH_SKILLS if skill in hits]
+
+@instrumented('register_jd')
+def register_jd(text, title=None):
+    """
+    Vectorize a job description once and add it to the JD registry.
+    Returns:
+        dict: { 'id', 'title', 'skills', 'created_at' }
+    """
+    if not text or not text.strip():
+        raise ValueError("Empty job description")
+    model = get_benchmark_model()
+    return JD_REGISTRY.add(text, extract_skill_set(scan_keywords(text)), model.vectorizer, title=title)
+
+def _top_k_indices(scores, top_k):
+    # Indices of the top_k scores, highest first
+    top_k = max(1, min(top_k, len(scores)))
+    top = np.argpartition(-scores, top_k - 1)[:top_k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+def _registered_jds(model, jd_ids=None):
+    try:
+        return JD_REGISTRY.matrices(model.vectorizer, jd_ids)
+    except KeyError as e:
+        raise ValueError(str(e.args[0]))
+
+def _match_entry(resume_skills, jd_skills, score, similarity, skill_match):
+    resume_skills = set(resume_skills)
+    return {
+        "score": float(score),
+        "similarity": float(similarity),
+        "skill_match": float(skill_match),
+        "matched_skills": [s for s in jd_skills if s in resume_skills],
+        "missing_skills": [s for s in jd_skills if s not in resume_skills],
+    }
+
+def _resume_features(model, texts):
+    skills = [extract_skill_set(scan_keywords(text)) for text in texts]
+    return model.vectorizer.transform(texts), JD_REGISTRY.skill_matrix(skills), skills
+
+@instrumented('match_resumes_to_jd')
+def match_resumes_to_jd(jd_id, texts):
+    """
+    Score resumes against one registered JD.
+    Returns:
+        list: Per resume (input order), { 'score', 'similarity', 'skill_match', 'matched_skills', 'missing_skills' }
+    """
+    model = get_benchmark_model()
+    _, jd_tfidf, jd_skill_matrix = _registered_jds(model, [jd_id])
+    resume_tfidf, resume_skill_matrix, resume_skills = _resume_features(model, texts)
+    score, similarity, skill_match = match_scores(resume_tfidf, resume_skill_matrix, jd_tfidf, jd_skill_matrix)
+    jd_skills = JD_REGISTRY.skills_of(jd_id)
+    return [
+        _match_entry(resume_skills[i], jd_skills, score[i, 0], similarity[i, 0], skill_match[i, 0])
+        for i in range(len(texts))
+    ]
+
+@instrumented('top_jds_for_resume')
+def top_jds_for_resume(text, top_k=10, jd_ids=None):
+    """
+    Rank registered JDs (all, or jd_ids) for one resume.
+    Returns:
+        list: [{ 'jd_id', 'title', 'score', ... }] best first
+    """
+    model = get_benchmark_model()
+    ids, jd_tfidf, jd_skill_matrix = _registered_jds(model, jd_ids)
+    if not ids:
+        return []
+    resume_tfidf, resume_skill_matrix, resume_skills = _resume_features(model, [text])
+    score, similarity, skill_match = match_scores(resume_tfidf, resume_skill_matrix, jd_tfidf, jd_skill_matrix)
+    return [
+        {"jd_id": ids[j], "title": JD_REGISTRY.describe(ids[j])['title'],
+         **_match_entry(resume_skills[0], JD_REGISTRY.skills_of(ids[j]), score[0, j], similarity[0, j], skill_match[0, j])}
+        for j in _top_k_indices(score[0], top_k)
+    ]
+
+@instrumented('top_resumes_for_jd')
+def top_resumes_for_jd(jd_id, texts=None, top_k=10):
+    """
+    Rank resumes for one registered JD: the given texts, or the whole corpus when texts is None.
+    Returns:
+        list: [{ 'index' (or corpus 'id', 'category', 'preview'), 'score', ... }] best first
+    """
+    model = get_benchmark_model()
+    _, jd_tfidf, jd_skill_matrix = _registered_jds(model, [jd_id])
+    if texts is not None:
+        resume_tfidf, resume_skill_matrix, resume_skills = _resume_features(model, texts)
+    else:
+        resume_tfidf, resume_skill_matrix = model.corpus_tfidf(), model.corpus_skill_matrix()
+        resume_skills = None
+    if resume_tfidf.shape[0] == 0:
+        return []
+    score, similarity, skill_match = match_scores(resume_tfidf, resume_skill_matrix, jd_tfidf, jd_skill_matrix)
+    top = _top_k_indices(score[:, 0], top_k)
+    jd_skills = JD_REGISTRY.skills_of(jd_id)
+    results = []
+    for i in top:
+        skills = resume_skills[i] if resume_skills is not None else [
+            MATCH_SKILLS[c] for c in resume_skill_matrix[i].indices
+        ]
+        results.append({"index": int(i), **_match_entry(skills, jd_skills, score[i, 0], similarity[i, 0], skill_match[i, 0])})
+    if texts is None:
+        rows = model.store.take([r['index'] for r in results], columns=['Category', 'Resume'])
+        for r, category, resume in zip(results, rows['Category'], rows['Resume']):
+            r["id"] = r.pop("index")
+            r["category"] = category
+            r["preview"] = (resume or '')[:SEARCH_PREVIEW_CHARS]
+    return results
@@ -0,0 +1,122 @@
+import re
+from array import array
+from collections import Counter
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# Same words the EDA endpoints always counted: \w+ runs longer than two characters, minus stop words
+CONTENT_WORD_PATTERN = re.compile(r"\b\w{3,}\b")
+
+
+class TermFrequencyMatrix:
+    """
+    Sparse document-term count matrix over the corpus, grown one document at a time.
+    Columns are numbered in order of first appearance and each row stores its terms in the order
+    they first occur in the document. That is exactly the insertion order of a Counter fed the same
+    token stream, so top-k results break ties the way Counter.most_common does while every count
+    comes from vectorized column sums.
+    """
+
+    def __init__(self):
+        self.vocabulary = {}  # term -> column
+        self.terms = []
+        self.indptr = array('q', [0])
+        self.indices = array('i')
+        self.data = array('i')
+        self.row_groups = array('i')  # group code (e.g. category) per row
+        self.group_codes = {}
+        self._grouped = None
+
+    @property
+    def num_rows(self):
+        return len(self.indptr) - 1
+
+    def add_document(self, lower_text, group=None):
+        """Tokenize one lowercased document and append it as a row."""
+        vocabulary = self.vocabulary
+        columns = []
+        counts = []
+        # Stop words are dropped per distinct term rather than per token
+        for term, n in Counter(CONTENT_WORD_PATTERN.findall(lower_text)).items():
+            if term in ENGLISH_STOP_WORDS:
+                continue
+            column = vocabulary.get(term)
+            if column is None:
+                column = vocabulary[term] = len(self.terms)
+                self.terms.append(term)
+            columns.append(column)
+            counts.append(n)
+        self.indices.extend(columns)
+        self.data.extend(counts)
+        self.indptr.append(len(self.indices))
+        self.row_groups.append(self.group_codes.setdefault(group, len(self.group_codes)))
+        self._grouped = None
+
+    @property
+    def matrix(self):
+        """The counts as a scipy CSR matrix (rows are documents, columns are self.terms)."""
+        return csr_matrix(
+            (np.frombuffer(self.data, dtype=np.int32), np.frombuffer(self.indices, dtype=np.int32),
+             np.frombuffer(self.indptr, dtype=np.int64)),
+            shape=(self.num_rows, len(self.terms)),
+        )
+
+    def _group_sums(self):
+        # Per-(group, term) totals and first-occurrence ranks for every group in one pass:
+        # entries are keyed by group * n_terms + column, so each group is a contiguous key range
+        if self._grouped is None:
+            indices = np.frombuffer(self.indices, dtype=np.int32)
+            data = np.frombuffer(self.data, dtype=np.int32)
+            row_lengths = np.diff(np.frombuffer(self.indptr, dtype=np.int64))
+            entry_groups = np.repeat(np.frombuffer(self.row_groups, dtype=np.int32).astype(np.int64), row_lengths)
+            keys = entry_groups * max(len(self.terms), 1) + indices
+            unique_keys, first_seen, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            sums = np.bincount(inverse, weights=data, minlength=len(unique_keys)).astype(np.int64)
+            key_groups = unique_keys // max(len(self.terms), 1)
+            bounds = np.searchsorted(key_groups, np.arange(len(self.group_codes) + 1))
+            self._grouped = (unique_keys % max(len(self.terms), 1), sums, first_seen, bounds)
+        return self._grouped
+
+    def _selection(self, group):
+        # (columns, counts, first-occurrence rank) of the terms present in the selected rows
+        if group is None:
+            indices = np.frombuffer(self.indices, dtype=np.int32)
+            sums = np.bincount(indices, weights=np.frombuffer(self.data, dtype=np.int32),
+                               minlength=len(self.terms)).astype(np.int64)
+            # Columns are numbered by first appearance, so the column itself is the rank
+            present = np.flatnonzero(sums)
+            return present, sums[present], present
+        code = self.group_codes.get(group)
+        columns, sums, first_seen, bounds = self._group_sums()
+        if code is None:
+            return columns[:0], sums[:0], first_seen[:0]
+        start, end = bounds[code], bounds[code + 1]
+        return columns[start:end], sums[start:end], first_seen[start:end]
+
+    def column_sums(self, group=None):
+        """Total count of every term over all rows, or over the rows of one group."""
+        columns, counts, _ = self._selection(group)
+        sums = np.zeros(len(self.terms), dtype=np.int64)
+        sums[columns] = counts
+        return sums
+
+    def top_k(self, k, group=None):
+        """
+        Most frequent terms over all rows or one group, ordered like Counter.most_common(k).
+        Returns:
+            list: [(term, count)]
+        """
+        columns, counts, first_seen = self._selection(group)
+        if not len(columns):
+            return []
+        k = min(k, len(columns))
+        threshold = counts[np.argpartition(-counts, k - 1)[k - 1]]
+        candidates = np.flatnonzero(counts >= threshold)
+        order = candidates[np.lexsort((first_seen[candidates], -counts[candidates]))][:k]
+        return [(self.terms[columns[i]], int(counts[i])) for i in order]
+
+    def counts_of(self, terms, group=None):
+        """Counts of specific terms (0 for unseen ones) over all rows or one group."""
+        sums = self.column_sums(group)
+        return [int(sums[self.vocabulary[t]]) if t in self.vocabulary else 0 for t in terms]